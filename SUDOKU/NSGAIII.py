@@ -1,6 +1,19 @@
 import random
 import numpy as np
-from deap import base, creator, tools, algorithms
+from deap import base, creator
+from cache_fitness import CacheAptitud, TAMANO_CACHE
+from presolver import preparar_tablero, esta_completo, poblacion_aleatoria
+from genoma import individuos_desde_arreglo
+from instrumentacion import NULO
+from geometria import tamano_caja
+from memetica import movibles_por_fila
+from operadores import cruzar_en_bloque, mutar_en_bloque
+from evaluacion import a_arreglo
+from diversidad import (FRACCION_RESIEMBRA, REINICIAR, RESEMBRAR, MonitorDiversidad,
+                        celdas_movibles, peores)
+from seleccion import indices_elite
+from azar import (arreglo_movibles, estados, flujos_desde_random, restaurar,
+                  sortear_cruces, sortear_intercambios)
 
 # ===================================================================
 # 1. CONFIGURACIÓN Y PARÁMETROS
@@ -13,6 +26,12 @@ INTENTOS_MAXIMOS = 100    # Reintentar muchas veces automáticamente
 
 PROB_CRUCE = 0.8          # Alta probabilidad de mezcla (Recombinación)
 PROB_MUTACION = 0.1       # <--- (10%)
+INTENSIDAD_MUTACION = 4   # Número de swaps que hace cada mutación de una sola vez
+CAPACIDAD_CACHE = TAMANO_CACHE  # Genomas recordados por la caché de aptitud (0 = sin caché)
+PROCESOS_EVALUACION = 1       # >1: puntuar en un pool con memoria compartida (evaluacion_compartida.py)
+USAR_PRESOLVER = True         # Fijar por lógica las celdas deducibles antes de evolucionar
+USAR_MONITOR = True           # Resembrar / reiniciar antes de tiempo si la población colapsa (diversidad.py)
+ELITES_ENTRE_REINICIOS = 0    # Mejores genomas (por F + C + B) de un intento fallido que pasan al siguiente
 
 # --- EL TABLERO (TU PROBLEMA) ---
 TABLERO_INICIAL = [
@@ -27,14 +46,23 @@ TABLERO_INICIAL = [
     [0, 4, 0, 5, 0, 8, 0, 7, 0]
 ]
 
-# Pre-calculamos los índices fijos (pistas) para no borrarlos nunca
-INDICES_FIJOS = []
-for r in range(9):
-    fila_fijos = set()
-    for c in range(9):
-        if TABLERO_INICIAL[r][c] != 0:
-            fila_fijos.add(c)
-    INDICES_FIJOS.append(fila_fijos)
+# Lo que sale del tablero cargado lo llena cargar_tablero(): el presolver
+# (singles desnudos y ocultos pasan a ser pistas), la máscara de
+# candidatos del resto, el lado (9, 16, 25...) y las columnas movibles de
+# cada fila. Importar el módulo no lo corre: sin un cargar_tablero previo,
+# el primer intento (o isla) carga TABLERO_INICIAL.
+TABLERO_CARGADO = False
+CANDIDATOS = []
+LADO = len(TABLERO_INICIAL)
+MOVIBLES = []
+MOVIBLES_ARREGLO = NUM_MOVIBLES = None   # Para sortear los swaps en bloque
+
+# Subflujos de numpy (operadores, nicheo de la selección) de la corrida
+# actual; se siembran desde 'random' al empezar cada intento y cada isla
+FLUJOS = []
+
+# Mejores genomas del último intento fallido (ELITES_ENTRE_REINICIOS)
+ELITE_PREVIA = []
 
 # ===================================================================
 # 2. HERRAMIENTAS VISUALES
@@ -42,118 +70,354 @@ for r in range(9):
 def imprimir_tablero_bonito(ind):
     # Convertimos el individuo a array numpy para facilitar impresión
     tablero = np.array(ind)
-    print(" -----------------------")
+    lado = len(tablero)
+    n = tamano_caja(lado)
+    ancho = len(str(lado))
+    separador = "|" + "+".join(["-" * ((ancho + 1) * n + 1)] * n) + "|"
+    print(" " + "-" * (len(separador) - 2))
     for i, fila in enumerate(tablero):
-        if i > 0 and i % 3 == 0:
-            print("|-------+-------+-------|")
+        if i > 0 and i % n == 0:
+            print(separador)
         linea = "| "
         for j, val in enumerate(fila):
-            linea += f"{val} "
-            if (j + 1) % 3 == 0 and j < 8:
+            linea += f"{val:>{ancho}} "
+            if (j + 1) % n == 0 and j < lado - 1:
                 linea += "| "
         linea += "|"
         print(linea)
-    print(" -----------------------")
+    print(" " + "-" * (len(separador) - 2))
 
 # ===================================================================
 # 3. CONFIGURACIÓN DE DEAP (NSGA-III)
 # ===================================================================
 
-# 3 Objetivos: Min(Filas), Min(Cols), Min(Cajas)
-creator.create("FitnessMulti", base.Fitness, weights=(-1.0, -1.0, -1.0))
-creator.create("Individual", list, fitness=creator.FitnessMulti)
-
-toolbox = base.Toolbox()
+# Importar el módulo no toca el creator, no arma el toolbox ni calcula los
+# puntos de referencia (ni importa deap.tools, que es lo caro): lo hace
+# preparar_deap() la primera vez que corre un intento o una isla. Las
+# clases llevan un nombre propio del módulo para que NSGAIII y con_deap
+# convivan en un mismo proceso.
+toolbox = None
+Individual = None   # creator.IndividuoNSGA3 una vez preparado
+ref_points = None
 
-def crear_individuo_sudoku():
+def crear_poblacion(n):
     """
-    Crea un tablero donde las FILAS ya son perfectas (sin repetidos).
+    Crea 'n' tableros donde las FILAS ya son perfectas (sin repetidos).
     Esto reduce el problema a arreglar solo Columnas y Cajas.
     """
-    genes = []
-    for r in range(9):
-        fila_origen = TABLERO_INICIAL[r]
-        presentes = [x for x in fila_origen if x != 0]
-        faltantes = [x for x in range(1, 10) if x not in presentes]
-        random.shuffle(faltantes)
-        
-        fila_nueva = []
-        for val in fila_origen:
-            if val != 0:
-                fila_nueva.append(val)
-            else:
-                fila_nueva.append(faltantes.pop())
-        genes.append(fila_nueva)
-    return creator.Individual(genes)
-
-toolbox.register("individual", crear_individuo_sudoku)
-toolbox.register("population", tools.initRepeat, list, toolbox.individual)
-
-def evaluar_nsga3(individuo):
-    grid = np.array(individuo)
-    
-    # 1. Filas (Siempre será 0 por construcción, pero NSGA-3 lo requiere)
-    row_errors = 0 
-
-    # 2. Columnas
-    col_errors = 0
-    for c in range(9):
-        col_errors += (9 - len(set(grid[:, c])))
-
-    # 3. Cajas 3x3
-    box_errors = 0
-    for i in range(0, 9, 3):
-        for j in range(0, 9, 3):
-            box = grid[i:i+3, j:j+3].flatten()
-            box_errors += (9 - len(set(box)))
-
-    return row_errors, col_errors, box_errors
-
-toolbox.register("evaluate", evaluar_nsga3)
+    # Permutaciones de los faltantes compatibles con los candidatos, todas a la vez
+    genomas = poblacion_aleatoria(FLUJOS[0], TABLERO_INICIAL, CANDIDATOS, n)
+    return [Individual(genes) for genes in genomas.tolist()]
+
+# Caché compartida por todos los intentos (el tablero no cambia)
+CACHE = CacheAptitud(CAPACIDAD_CACHE)
+
+# Tableros puntuados (con o sin caché, o por delta) desde el último reinicio
+EVALUACIONES = 0
+
+def preparar_evaluador():
+    """Con PROCESOS_EVALUACION > 1 crea el pool una sola vez; lo reutilizan todos los intentos."""
+    if PROCESOS_EVALUACION <= 1:
+        return
+    # multiprocessing y shared_memory solo se importan si hacen falta
+    from evaluacion_compartida import EvaluadorCompartido
+    if not isinstance(CACHE.evaluador, EvaluadorCompartido):
+        CACHE.evaluador = EvaluadorCompartido(PROCESOS_EVALUACION, TAMANO_POBLACION, LADO)
+
+def evaluar_en_lote(individuos):
+    """
+    Asigna (filas, columnas, cajas) a todos los individuos con una sola
+    llamada vectorizada sobre el arreglo (N, LADO, LADO).
+    """
+    global EVALUACIONES
+    EVALUACIONES += len(individuos)
+    if not individuos:
+        return
+    columnas, cajas, _ = CACHE.evaluar_poblacion(individuos)
+    for ind, c, b in zip(individuos, columnas.tolist(), cajas.tolist()):
+        ind.fitness.values = (0, c, b)
+
+def evaluar_genomas(genomas, objetivos, indices):
+    """Escribe (0, columnas, cajas) de 'genomas' (M, LADO, LADO) en objetivos[indices]."""
+    global EVALUACIONES
+    EVALUACIONES += len(genomas)
+    if len(genomas) == 0:
+        return
+    columnas, cajas, _ = CACHE.evaluar_poblacion(genomas)
+    objetivos[indices, 0] = 0
+    objetivos[indices, 1] = columnas
+    objetivos[indices, 2] = cajas
 
 # --- OPERADORES GENÉTICOS ---
+# Se aplican en bloque a los genomas de toda la generación (operadores.py).
 
 # CRUCE: Uniforme
 # Mezcla las filas de Padre A y Padre B independientemente.
 # Es mejor que TwoPoint para este tipo de representación.
-toolbox.register("mate", tools.cxUniform, indpb=0.5)
 
 # MUTACIÓN "FUERTE" (Compensada)
-# Esta función se ejecuta solo cuando el algoritmo decide mutar (10% de las veces).
-# Pero cuando entra aquí, hacemos MULTIPLES cambios para aprovechar la oportunidad.
-def mutar_sudoku_fuerte(individual, indpb):
+# Solo muta el 10% de los hijos (PROB_MUTACION), pero cada mutante recibe
+# INTENSIDAD_MUTACION swaps de una vez para aprovechar la oportunidad.
+
+def preparar_deap():
+    """Crea las clases del creator, los puntos de referencia y el toolbox (solo la primera vez)."""
+    global toolbox, Individual, ref_points
+    if toolbox is not None:
+        return toolbox
+    from deap import tools
+    from seleccion_nsga3 import sel_nsga3_enteros
+
+    # 3 Objetivos: Min(Filas), Min(Cols), Min(Cajas)
+    if not hasattr(creator, "IndividuoNSGA3"):
+        creator.create("FitnessNSGA3", base.Fitness, weights=(-1.0, -1.0, -1.0))
+        creator.create("IndividuoNSGA3", list, fitness=creator.FitnessNSGA3)
+    Individual = creator.IndividuoNSGA3
+
+    caja = base.Toolbox()
+    caja.register("population", crear_poblacion)
+    caja.register("mejores", tools.selBest)
+
+    # SELECCIÓN NSGA-III
+    # p=12 es un valor estándar recomendado para 3 objetivos (siguen siendo 3
+    # con cualquier lado de tablero: filas, columnas y cajas)
+    ref_points = tools.uniform_reference_points(nobj=3, p=12)
+    # Mismos frentes y nichos que tools.selNSGA3, pero agrupando los vectores de
+    # faltas (enteros pequeños) antes del ordenamiento no dominado
+    caja.register("select", sel_nsga3_enteros, ref_points=ref_points)
+    toolbox = caja
+    return toolbox
+
+# ===================================================================
+# 4. UNA GENERACIÓN (REUTILIZADA POR EL MAIN Y POR EL MODELO DE ISLAS)
+# ===================================================================
+def nueva_generacion(pop, medidor=NULO):
+    # Lo mismo que algorithms.varAnd, separado en fases para poder medir
+    # cada una y con todas las decisiones de la generación sorteadas en bloque
+    rng, rng_nicheo = FLUJOS
+    # Cada padre deja un hijo: los genomas van como un arreglo (N, LADO, LADO)
+    with medidor.fase("clonacion"):
+        hijos = a_arreglo(pop)
+        objetivos = np.array([ind.fitness.values for ind in pop], dtype=np.int64)
+
+    with medidor.fase("cruce"):
+        cruza, mascaras = sortear_cruces(rng, len(pop) // 2, LADO, PROB_CRUCE)
+        hijos, cambiados = cruzar_en_bloque(hijos, cruza, mascaras)
+
+    with medidor.fase("mutacion"):
+        mutantes = np.flatnonzero(rng.random(len(hijos)) < PROB_MUTACION)
+        mutar_en_bloque(hijos, mutantes, sortear_intercambios(
+            rng, len(mutantes) * INTENSIDAD_MUTACION, MOVIBLES_ARREGLO, NUM_MOVIBLES))
+        cambiados[mutantes] = True
     
-    INTENSIDAD = 4 # Número de swaps que haremos de una sola vez
+    # Evaluar descendencia (los que salieron iguales a su padre conservan F, C, B)
+    with medidor.fase("evaluacion"):
+        pendientes = np.flatnonzero(cambiados)
+        evaluar_genomas(hijos[pendientes], objetivos, pendientes)
+    with medidor.fase("clonacion"):
+        offspring = individuos_desde_arreglo(Individual, hijos, objetivos)
     
-    for _ in range(INTENSIDAD):
-        # Elegimos una fila al azar
-        fila_idx = random.randint(0, 8)
-        fila = individual[fila_idx]
-        
-        # Identificamos qué celdas se pueden mover (no son pistas)
-        indices_prohibidos = INDICES_FIJOS[fila_idx]
-        movibles = [i for i in range(9) if i not in indices_prohibidos]
-        
-        # Si hay al menos 2 números para intercambiar, lo hacemos
-        if len(movibles) >= 2:
-            idx1, idx2 = random.sample(movibles, 2)
-            # Swap (Intercambio)
-            fila[idx1], fila[idx2] = fila[idx2], fila[idx1]
-
-    return (individual,)
+    # Selección NSGA-III (Une padres e hijos y selecciona los mejores)
+    with medidor.fase("seleccion_nsga3"):
+        return toolbox.select(pop + offspring, len(pop), rng=rng_nicheo)
+
+def errores_totales(pop):
+    """F + C + B de cada individuo, como arreglo (lo que miran el monitor y las élites)."""
+    return np.fromiter((sum(ind.fitness.values) for ind in pop), dtype=np.float64, count=len(pop))
+
+def resembrar(pop, errores):
+    """Reemplaza a la peor FRACCION_RESIEMBRA de la población por individuos nuevos."""
+    indices = peores(errores, int(len(pop) * FRACCION_RESIEMBRA)).tolist()
+    for i, nuevo in zip(indices, toolbox.population(n=len(indices))):
+        pop[i] = nuevo
+    evaluar_en_lote([pop[i] for i in indices])
+
+def evolucionar_isla(genomas, generaciones, semilla, generacion_inicial=0):
+    """
+    Punto de entrada del modelo de islas: evoluciona una subpoblación
+    durante 'generaciones' generaciones y devuelve los genomas ordenados
+    por error total (F + C + B), esos errores y las generaciones corridas.
+    Con genomas=None se crea una subpoblación nueva de TAMANO_POBLACION.
+    'generacion_inicial' (generación global al empezar la época) se acepta
+    por compatibilidad con con_deap; aquí nada depende de ella.
+    """
+    preparar_deap()
+    asegurar_tablero()
+    random.seed(semilla)
+    FLUJOS[:] = flujos_desde_random(2)
+    if genomas is None:
+        pop = toolbox.population(n=TAMANO_POBLACION)
+    else:
+        pop = [Individual([fila[:] for fila in g]) for g in genomas]
+    evaluar_en_lote(pop)
 
-# Registramos la mutación. El 'indpb' aquí es simbólico para la función interna,
-# la probabilidad real de llamada la define el main en PROB_MUTACION.
-toolbox.register("mutate", mutar_sudoku_fuerte, indpb=0.1)
+    corridas = 0
+    while corridas < generaciones and min(sum(ind.fitness.values) for ind in pop) != 0:
+        pop = nueva_generacion(pop)
+        corridas += 1
 
-# SELECCIÓN NSGA-III
-# p=12 es un valor estándar recomendado para 3 objetivos
-ref_points = tools.uniform_reference_points(nobj=3, p=12)
-toolbox.register("select", tools.selNSGA3, ref_points=ref_points)
+    pop.sort(key=lambda ind: sum(ind.fitness.values))
+    return ([[fila[:] for fila in ind] for ind in pop],
+            [sum(ind.fitness.values) for ind in pop], corridas)
 
 # ===================================================================
-# 4. LOOP PRINCIPAL CON REINICIOS
+# 5. LOOP PRINCIPAL CON REINICIOS
 # ===================================================================
+def cargar_tablero(tablero):
+    """Cambia el tablero a resolver (LADO listas de LADO, 0 = vacío; 9x9, 16x16...)."""
+    global LADO, MOVIBLES_ARREGLO, NUM_MOVIBLES, TABLERO_CARGADO
+    tablero, candidatos = preparar_tablero(tablero, USAR_PRESOLVER)
+    LADO = len(tablero)
+    TABLERO_INICIAL[:] = tablero
+    CANDIDATOS[:] = candidatos
+    MOVIBLES[:] = movibles_por_fila(tablero)
+    MOVIBLES_ARREGLO, NUM_MOVIBLES = arreglo_movibles(MOVIBLES)
+    ELITE_PREVIA.clear()
+    # Las aptitudes guardadas eran de otro tablero
+    CACHE.limpiar()
+    TABLERO_CARGADO = True
+
+def asegurar_tablero():
+    """Presuelve TABLERO_INICIAL la primera vez si nadie cargó otro tablero."""
+    if not TABLERO_CARGADO:
+        cargar_tablero(TABLERO_INICIAL)
+
+def ejecutar_intento(intento, semilla=None, detener=None, medidor=None, punto_control=None):
+    """
+    Corre un intento (hasta MAX_GENERACIONES o 60 generaciones sin mejora) y
+    devuelve un dict con el resultado. 'detener' es un Event opcional,
+    'medidor' (instrumentacion.MedidorFases) recibe el tiempo de cada fase y
+    'punto_control' (puntos_control.PuntoControl) guarda o reanuda el intento.
+    """
+    global EVALUACIONES
+    preparar_deap()
+    asegurar_tablero()
+    medidor = medidor or NULO
+    if semilla is not None:
+        random.seed(semilla)
+
+    print(f"\n--- Intento #{intento} (Población: {TAMANO_POBLACION}) ---")
+
+    # Tableros fáciles: el presolver ya los completó, no hace falta evolucionar
+    if esta_completo(TABLERO_INICIAL):
+        print(" ¡RESUELTO POR PROPAGACIÓN DE RESTRICCIONES (sin evolución)!")
+        imprimir_tablero_bonito(TABLERO_INICIAL)
+        return {"intento": intento, "resuelto": True, "generacion": 0,
+                "solucion": [fila[:] for fila in TABLERO_INICIAL], "cancelado": False,
+                "cache": CACHE.estadisticas()}
+    
+    FLUJOS[:] = flujos_desde_random(2)
+    preparar_evaluador()
+    monitor = MonitorDiversidad(celdas_movibles(TABLERO_INICIAL)) if USAR_MONITOR else None
+    reanudado = punto_control.reanudar(intento) if punto_control is not None else None
+    if reanudado is None:
+        gen_inicial = 0
+        # 1. Crear población nueva
+        with medidor.fase("inicializacion"):
+            pop = toolbox.population(n=TAMANO_POBLACION)
+            # Los mejores del intento anterior (si se guardaron) entran tal cual
+            for i, genoma in enumerate(ELITE_PREVIA):
+                pop[i] = Individual([fila[:] for fila in genoma])
+        
+        # 2. Evaluar inicial
+        with medidor.fase("evaluacion"):
+            evaluar_en_lote(pop)
+
+        # Variables para control de estancamiento
+        # (cota mayor que cualquier conteo de faltas posible, para cualquier lado)
+        mejor_fitness_historico = (LADO * LADO,) * 3
+        generaciones_sin_mejora = 0
+    else:
+        # Se sigue desde el punto de control: población, estancamiento y azar
+        gen_inicial = reanudado["generacion"]
+        pop = individuos_desde_arreglo(Individual, reanudado["genomas"],
+                                       reanudado["aptitudes"])
+        mejor_fitness_historico = tuple(reanudado["extra"]["mejor_fitness_historico"])
+        generaciones_sin_mejora = reanudado["extra"]["generaciones_sin_mejora"]
+        restaurar(FLUJOS, reanudado["extra"]["flujos"])
+        if monitor is not None and reanudado["extra"].get("monitor"):
+            monitor.restaurar(reanudado["extra"]["monitor"])
+        EVALUACIONES = reanudado["evaluaciones"]
+        print(f"   Reanudado en la generación {gen_inicial}")
+
+    # Ciclo evolutivo
+    generaciones = MAX_GENERACIONES
+    for gen in range(gen_inicial, MAX_GENERACIONES):
+        if detener is not None and detener.is_set():
+            # Se corta antes de correr la generación gen: van gen completas
+            return {"intento": intento, "resuelto": False, "generacion": gen,
+                    "solucion": None, "cancelado": True,
+                    "cache": CACHE.estadisticas()}
+
+        if punto_control is not None and gen > gen_inicial and punto_control.toca(gen):
+            punto_control.guardar(intento, gen, pop, [ind.fitness.values for ind in pop],
+                                  evaluaciones=EVALUACIONES,
+                                  extra={"mejor_fitness_historico": list(mejor_fitness_historico),
+                                         "generaciones_sin_mejora": generaciones_sin_mejora,
+                                         "flujos": estados(FLUJOS),
+                                         "monitor": monitor.estado() if monitor else None})
+
+        pop = nueva_generacion(pop, medidor)
+        
+        # Obtener el mejor de la generación actual
+        with medidor.fase("ordenamiento"):
+            best_ind = toolbox.mejores(pop, 1)[0]
+        current_fit = best_ind.fitness.values
+        medidor.fin_generacion(intento=intento, generacion=gen + 1, mejor=sum(current_fit),
+                               objetivos=current_fit, poblacion=pop)
+        
+        # --- VERIFICAR VICTORIA ---
+        if current_fit == (0.0, 0.0, 0.0):
+            print(f"\n" + "*"*60)
+            print(f" ¡SOLUCIÓN ENCONTRADA! (Intento {intento}, Gen {gen + 1})")
+            print("*"*60)
+            imprimir_tablero_bonito(best_ind)
+            # La generación gen ya corrió: van gen + 1, como en fin_generacion
+            return {"intento": intento, "resuelto": True, "generacion": gen + 1,
+                    "solucion": [list(fila) for fila in best_ind], "cancelado": False,
+                    "cache": CACHE.estadisticas()}
+
+        # --- CONTROL DE ESTANCAMIENTO ---
+        # Sumamos errores para ver si hay mejora general
+        err_actual = sum(current_fit)
+        err_mejor = sum(mejor_fitness_historico)
+
+        if err_actual < err_mejor:
+            mejor_fitness_historico = current_fit
+            generaciones_sin_mejora = 0
+        else:
+            generaciones_sin_mejora += 1
+        
+        # Reporte cada 20 gens
+        if gen % 20 == 0:
+            print(f"   Gen {gen:3d} | Faltas (F, C, B): {current_fit}")
+
+        # Si no mejora en 60 generaciones, abortamos este intento
+        if generaciones_sin_mejora >= 60:
+            print(f"   >> Estancado en {current_fit}. Reiniciando...")
+            generaciones = gen + 1
+            break
+
+        # Antes de eso: si la población colapsó, resembrar la mitad peor o cortar ya
+        if monitor is not None:
+            with medidor.fase("diversidad"):
+                errores = errores_totales(pop)
+                accion = monitor.observar(errores, pop)
+            if accion == RESEMBRAR:
+                with medidor.fase("inicializacion"):
+                    resembrar(pop, errores)
+            elif accion == REINICIAR:
+                print(f"   >> Población colapsada ({monitor.ultimo['unicos']:.0%} genomas "
+                      f"distintos) en {current_fit}. Reiniciando...")
+                generaciones = gen + 1
+                break
+
+    ELITE_PREVIA[:] = [[fila[:] for fila in pop[i]]
+                       for i in indices_elite(errores_totales(pop), ELITES_ENTRE_REINICIOS).tolist()]
+    print(f"Fin del intento {intento}. Fallido.")
+    return {"intento": intento, "resuelto": False, "generacion": generaciones,
+            "solucion": None, "cancelado": False,
+            "cache": CACHE.estadisticas()}
+
 def main():
     random.seed(42) # Semilla fija para consistencia
 
@@ -162,66 +426,8 @@ def main():
     print("="*60)
 
     for intento in range(1, INTENTOS_MAXIMOS + 1):
-        print(f"\n--- Intento #{intento} (Población: {TAMANO_POBLACION}) ---")
-        
-        # 1. Crear población nueva
-        pop = toolbox.population(n=TAMANO_POBLACION)
-        
-        # 2. Evaluar inicial
-        fitnesses = list(map(toolbox.evaluate, pop))
-        for ind, fit in zip(pop, fitnesses):
-            ind.fitness.values = fit
-
-        # Variables para control de estancamiento
-        mejor_fitness_historico = (99, 99, 99)
-        generaciones_sin_mejora = 0
-
-        # Ciclo evolutivo
-        for gen in range(MAX_GENERACIONES):
-            # Algoritmo varAnd aplica Cruce y Mutación según las probabilidades definidas
-            offspring = algorithms.varAnd(pop, toolbox, cxpb=PROB_CRUCE, mutpb=PROB_MUTACION)
-            
-            # Evaluar descendencia
-            fits = toolbox.map(toolbox.evaluate, offspring)
-            for fit, ind in zip(fits, offspring):
-                ind.fitness.values = fit
-            
-            # Selección NSGA-III (Une padres e hijos y selecciona los mejores)
-            pop = toolbox.select(pop + offspring, TAMANO_POBLACION)
-            
-            # Obtener el mejor de la generación actual
-            best_ind = tools.selBest(pop, 1)[0]
-            current_fit = best_ind.fitness.values
-            
-            # --- VERIFICAR VICTORIA ---
-            if current_fit == (0.0, 0.0, 0.0):
-                print(f"\n" + "*"*60)
-                print(f" ¡SOLUCIÓN ENCONTRADA! (Intento {intento}, Gen {gen})")
-                print("*"*60)
-                imprimir_tablero_bonito(best_ind)
-                return # Termina el programa exitosamente
-
-            # --- CONTROL DE ESTANCAMIENTO ---
-            # Sumamos errores para ver si hay mejora general
-            err_actual = sum(current_fit)
-            err_mejor = sum(mejor_fitness_historico)
-
-            if err_actual < err_mejor:
-                mejor_fitness_historico = current_fit
-                generaciones_sin_mejora = 0
-            else:
-                generaciones_sin_mejora += 1
-            
-            # Reporte cada 20 gens
-            if gen % 20 == 0:
-                print(f"   Gen {gen:3d} | Faltas (F, C, B): {current_fit}")
-
-            # Si no mejora en 60 generaciones, abortamos este intento
-            if generaciones_sin_mejora >= 60:
-                print(f"   >> Estancado en {current_fit}. Reiniciando...")
-                break 
-
-        print(f"Fin del intento {intento}. Fallido.")
+        if ejecutar_intento(intento)["resuelto"]:
+            return # Termina el programa exitosamente
 
     print("\n:( Se agotaron todos los intentos.")
 
@@ -0,0 +1,109 @@
+import random
+import numpy as np
+
+# -------------------------------------------------------------------
+# AZAR EN BLOQUE PARA LOS OPERADORES
+# -------------------------------------------------------------------
+# En vez de llamar a random.random()/randint()/sample() por pareja, por
+# fila y por swap, cada generación sortea de una vez, con un Generator de
+# numpy, todas sus decisiones: qué parejas se cruzan, qué filas pasan de
+# un padre al otro, qué hijos mutan y qué celdas intercambia cada swap.
+# Los operadores de operadores.py las aplican a toda la población en bloque.
+#
+# Reproducibilidad: los Generator salen de una SeedSequence sembrada desde
+# 'random', así que random.seed(s) sigue fijando la corrida completa. Cada
+# intento separa subflujos (spawn) para la selección y para los
+# operadores: cambiar cuántos números usa uno no altera al otro. Las
+# semillas de los trabajadores en paralelo (carreras, islas, lote) se
+# derivan con spawn_key = (índice, ...), independientes entre sí y fijas
+# para una misma semilla maestra sin importar el orden en que corran.
+
+
+def secuencia_desde_random():
+    """SeedSequence sembrada desde 'random' (random.seed la fija)."""
+    return np.random.SeedSequence(random.getrandbits(128))
+
+
+def generador_desde_random():
+    """
+    Generator de numpy sembrado desde 'random', para que random.seed(s)
+    siga fijando la corrida completa.
+    """
+    return np.random.default_rng(secuencia_desde_random())
+
+
+def flujos_desde_random(cantidad):
+    """'cantidad' Generators independientes (subflujos de una misma SeedSequence)."""
+    return [np.random.default_rng(hijo) for hijo in secuencia_desde_random().spawn(cantidad)]
+
+
+def estados(flujos):
+    """Estado de cada Generator, serializable a JSON (para los puntos de control)."""
+    return [flujo.bit_generator.state for flujo in flujos]
+
+
+def restaurar(flujos, guardados):
+    for flujo, estado in zip(flujos, guardados):
+        flujo.bit_generator.state = estado
+
+
+def semilla_derivada(semilla, *claves):
+    """
+    Semilla entera del trabajador 'claves' (p. ej. intento, o época e isla)
+    a partir de la semilla maestra. Con semilla=None sale de la entropía del
+    sistema, como antes.
+    """
+    secuencia = np.random.SeedSequence(semilla, spawn_key=tuple(claves))
+    return int(secuencia.generate_state(1, np.uint64)[0])
+
+# -------------------------------------------------------------------
+# ÍNDICES MOVIBLES Y SORTEOS DE UNA GENERACIÓN
+# -------------------------------------------------------------------
+def arreglo_movibles(movibles):
+    """
+    Columnas movibles de cada fila como arreglo (lado, lado) rellenado con 0
+    y cuántas hay en cada fila, para indexarlas en bloque.
+    """
+    lado = len(movibles)
+    indices = np.zeros((lado, lado), dtype=np.intp)
+    largos = np.zeros(lado, dtype=np.intp)
+    for r, columnas in enumerate(movibles):
+        indices[r, :len(columnas)] = columnas
+        largos[r] = len(columnas)
+    return indices, largos
+
+
+def sortear_cruces(rng, pares, lado, prob_cruce, prob_fila=0.5):
+    """
+    Para cada pareja: si se cruza y qué filas intercambia (cruce uniforme
+    por filas con probabilidad 'prob_fila' cada una).
+    """
+    cruza = rng.random(pares) < prob_cruce
+    mascaras = rng.random((pares, lado)) < prob_fila
+    return cruza, mascaras
+
+
+def sortear_intercambios(rng, cantidad, indices, largos, tableros=None):
+    """
+    'cantidad' swaps como arreglos (filas, c1, c2): fila uniforme y dos
+    columnas movibles distintas de esa fila, también uniformes. Si la fila
+    tiene menos de 2 movibles el swap sale con c1 == c2 (no hace nada).
+    Con varios tableros a la vez, 'indices' (B, lado, lado) y 'largos'
+    (B, lado) traen la tabla de cada uno y 'tableros' (cantidad,) dice de
+    cuál es cada swap.
+    """
+    lado = largos.shape[-1]
+    filas = rng.integers(0, lado, size=cantidad)
+    if tableros is None:
+        tabla, m = indices[filas], largos[filas]
+    else:
+        tabla, m = indices[tableros, filas], largos[tableros, filas]
+    u = rng.random((2, cantidad))
+    i = (u[0] * m).astype(np.intp)
+    j = (u[1] * np.maximum(m - 1, 1)).astype(np.intp)
+    j += j >= i
+    validos = m >= 2
+    todos = np.arange(cantidad)
+    c1 = np.where(validos, tabla[todos, np.minimum(i, lado - 1)], 0)
+    c2 = np.where(validos, tabla[todos, np.minimum(j, lado - 1)], 0)
+    return filas, c1, c2
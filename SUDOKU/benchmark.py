@@ -0,0 +1,224 @@
+import argparse
+import contextlib
+import datetime
+import importlib
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+from multiprocessing import Pool
+
+from resolucion import SOLUCIONADORES, parsear_tablero, resolver
+
+# -------------------------------------------------------------------
+# 1. PARÁMETROS DEL BENCHMARK
+# -------------------------------------------------------------------
+# Corpus fijo por niveles de dificultad + semillas fijas: dos corridas
+# del mismo código sobre la misma máquina dan los mismos intentos y
+# generaciones, así que las diferencias de tiempo son de rendimiento.
+# Vale para los cuatro solucionadores porque todo el azar sale de
+# 'random', sembrado con la semilla de la corrida, y de Generators de
+# numpy derivados de él (también el nicheo de NSGAIII): ninguno usa el
+# numpy.random global.
+CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "corpus_benchmark.jsonl")
+SEMILLAS = (1, 2, 3)
+MAX_INTENTOS = 3          # Presupuesto por corrida (un tablero no resuelto cuenta como fallo)
+TOLERANCIA = 0.15         # Empeoramiento relativo permitido antes de marcar regresión
+TOLERANCIA_EXITO = 0.2    # Caída absoluta permitida en la tasa de éxito
+
+# -------------------------------------------------------------------
+# 2. CORPUS
+# -------------------------------------------------------------------
+def cargar_corpus(ruta=CORPUS, niveles=None):
+    """Lista de {"id", "nivel", "tablero"} desde un JSONL."""
+    corpus = []
+    with open(ruta, encoding="utf-8") as archivo:
+        for linea in archivo:
+            linea = linea.strip()
+            if not linea or linea.startswith("#"):
+                continue
+            datos = json.loads(linea)
+            if niveles and datos["nivel"] not in niveles:
+                continue
+            corpus.append({"id": datos["id"], "nivel": datos["nivel"],
+                           "tablero": parsear_tablero(datos["tablero"])})
+    return corpus
+
+# -------------------------------------------------------------------
+# 3. CORRIDAS
+# -------------------------------------------------------------------
+def _correr(args):
+    nombre_modulo, caso, semilla, max_intentos, usar_presolver, usar_memetica, usar_monitor, elites = args
+    modulo = importlib.import_module(nombre_modulo)
+    modulo.USAR_PRESOLVER = usar_presolver
+    if hasattr(modulo, "USAR_MEMETICA"):
+        modulo.USAR_MEMETICA = usar_memetica
+    modulo.USAR_MONITOR = usar_monitor
+    modulo.ELITES_ENTRE_REINICIOS = elites
+    with contextlib.redirect_stdout(io.StringIO()):
+        res = resolver(nombre_modulo, caso["tablero"], semilla=semilla, max_intentos=max_intentos)
+    return {
+        "solucionador": nombre_modulo,
+        "id": caso["id"],
+        "nivel": caso["nivel"],
+        "semilla": semilla,
+        "resuelto": res["resuelto"],
+        "intentos": res["intentos"],
+        "generaciones": res["generaciones"],
+        "evaluaciones": res["evaluaciones"],
+        "tiempo": res["tiempo"],
+    }
+
+
+def ejecutar_benchmark(solucionadores=SOLUCIONADORES, corpus=None, semillas=SEMILLAS,
+                       max_intentos=MAX_INTENTOS, usar_presolver=True, usar_memetica=False,
+                       usar_monitor=True, elites=0):
+    """
+    Corre cada solucionador sobre todo el corpus con cada semilla.
+    Cada solucionador va en su propio proceso, así su tiempo y su memoria no
+    se mezclan con los del anterior, y las corridas son secuenciales para no
+    falsear tiempos.
+    """
+    corpus = corpus if corpus is not None else cargar_corpus()
+    corridas = []
+    for nombre_modulo in solucionadores:
+        tareas = [(nombre_modulo, caso, semilla, max_intentos, usar_presolver, usar_memetica,
+                   usar_monitor, elites)
+                  for caso in corpus for semilla in semillas]
+        with Pool(processes=1) as pool:
+            for corrida in pool.imap(_correr, tareas):
+                print(f"  {corrida['solucionador']:10s} {corrida['id']:12s} semilla {corrida['semilla']:3d} | "
+                      f"{'OK ' if corrida['resuelto'] else 'NO '} | gen {corrida['generaciones']:5d} | "
+                      f"{corrida['tiempo']:7.2f}s", file=sys.stderr)
+                corridas.append(corrida)
+    return corridas
+
+
+def resumir(corridas):
+    """Métricas por solucionador y nivel."""
+    grupos = {}
+    for c in corridas:
+        grupos.setdefault(c["solucionador"], {}).setdefault(c["nivel"], []).append(c)
+
+    resumen = {}
+    for nombre_modulo, niveles in grupos.items():
+        resumen[nombre_modulo] = {}
+        for nivel, lista in niveles.items():
+            resueltas = [c for c in lista if c["resuelto"]]
+            tiempo_total = sum(c["tiempo"] for c in lista)
+            resumen[nombre_modulo][nivel] = {
+                "corridas": len(lista),
+                "tasa_exito": len(resueltas) / len(lista),
+                "tiempo_a_solucion": (statistics.median(c["tiempo"] for c in resueltas)
+                                      if resueltas else None),
+                "generaciones_por_segundo": (sum(c["generaciones"] for c in lista) / tiempo_total
+                                             if tiempo_total else None),
+                "evaluaciones_por_segundo": (sum(c["evaluaciones"] for c in lista) / tiempo_total
+                                             if tiempo_total else None),
+            }
+    return resumen
+
+# -------------------------------------------------------------------
+# 4. COMPARACIÓN CONTRA UNA LÍNEA BASE
+# -------------------------------------------------------------------
+# (métrica, True si "más alto es mejor")
+METRICAS = (("tiempo_a_solucion", False),
+            ("generaciones_por_segundo", True),
+            ("evaluaciones_por_segundo", True))
+
+
+def comparar(resumen, base, tolerancia=TOLERANCIA, tolerancia_exito=TOLERANCIA_EXITO):
+    """Devuelve una lista de regresiones (texto) de 'resumen' respecto de 'base'."""
+    regresiones = []
+    for nombre_modulo, niveles in base.items():
+        for nivel, metricas_base in niveles.items():
+            actual = resumen.get(nombre_modulo, {}).get(nivel)
+            if actual is None:
+                continue
+            caida = metricas_base["tasa_exito"] - actual["tasa_exito"]
+            if caida > tolerancia_exito:
+                regresiones.append(f"{nombre_modulo}/{nivel}: tasa_exito "
+                                   f"{metricas_base['tasa_exito']:.2f} -> {actual['tasa_exito']:.2f}")
+            for metrica, mas_es_mejor in METRICAS:
+                antes = metricas_base.get(metrica)
+                ahora = actual.get(metrica)
+                if not antes or ahora is None:
+                    continue
+                cambio = (antes - ahora) / antes if mas_es_mejor else (ahora - antes) / antes
+                if cambio > tolerancia:
+                    regresiones.append(f"{nombre_modulo}/{nivel}: {metrica} "
+                                       f"{antes:.3f} -> {ahora:.3f} ({cambio:+.0%} peor)")
+    return regresiones
+
+
+def _metadatos(semillas, max_intentos, usar_presolver, usar_memetica, usar_monitor, elites):
+    versiones = {}
+    for paquete in ("numpy", "deap"):
+        try:
+            versiones[paquete] = __import__(paquete).__version__
+        except (ImportError, AttributeError):
+            versiones[paquete] = None
+    return {
+        "fecha": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "procesador": platform.processor(),
+        "versiones": versiones,
+        "semillas": list(semillas),
+        "max_intentos": max_intentos,
+        "usar_presolver": usar_presolver,
+        "usar_memetica": usar_memetica,
+        "usar_monitor": usar_monitor,
+        "elites_entre_reinicios": elites,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark reproducible de los tres solucionadores")
+    parser.add_argument("-s", "--solucionadores", nargs="+", choices=SOLUCIONADORES, default=list(SOLUCIONADORES))
+    parser.add_argument("--corpus", default=CORPUS)
+    parser.add_argument("--niveles", nargs="+", default=None, help="p. ej. facil medio dificil")
+    parser.add_argument("--semillas", nargs="+", type=int, default=list(SEMILLAS))
+    parser.add_argument("--intentos", type=int, default=MAX_INTENTOS)
+    parser.add_argument("--sin-presolver", action="store_true")
+    parser.add_argument("--memetica", action="store_true", help="Búsqueda local sobre la élite (desde_cero y con_deap)")
+    parser.add_argument("--sin-monitor", action="store_true",
+                        help="Sin monitor de diversidad (solo el límite de generaciones corta un intento)")
+    parser.add_argument("--elites", type=int, default=0,
+                        help="Mejores individuos que pasan de un intento fallido al siguiente")
+    parser.add_argument("-o", "--salida", default=None, help="Archivo JSON de resultados")
+    parser.add_argument("--comparar", default=None, help="JSON de una corrida anterior (línea base)")
+    parser.add_argument("--tolerancia", type=float, default=TOLERANCIA)
+    args = parser.parse_args()
+
+    usar_presolver = not args.sin_presolver
+    usar_monitor = not args.sin_monitor
+    corridas = ejecutar_benchmark(args.solucionadores, cargar_corpus(args.corpus, args.niveles),
+                                  args.semillas, args.intentos, usar_presolver, args.memetica,
+                                  usar_monitor, args.elites)
+    informe = {"meta": _metadatos(args.semillas, args.intentos, usar_presolver, args.memetica,
+                                  usar_monitor, args.elites),
+               "resumen": resumir(corridas), "corridas": corridas}
+
+    texto = json.dumps(informe, indent=2, ensure_ascii=False)
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as archivo:
+            archivo.write(texto + "\n")
+    else:
+        print(texto)
+
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as archivo:
+            base = json.load(archivo)["resumen"]
+        regresiones = comparar(informe["resumen"], base, args.tolerancia)
+        if regresiones:
+            print("\nREGRESIONES DE RENDIMIENTO:", file=sys.stderr)
+            for r in regresiones:
+                print(f"  - {r}", file=sys.stderr)
+            sys.exit(1)
+        print("\nSin regresiones respecto de la línea base.", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+from collections import OrderedDict
+
+import numpy as np
+from evaluacion import a_arreglo, evaluar_poblacion
+
+# -------------------------------------------------------------------
+# CACHÉ DE APTITUD POR GENOMA (LRU ACOTADA)
+# -------------------------------------------------------------------
+# Muchos hijos son copias exactas de sus padres o de individuos que ya
+# se evaluaron antes (clones sin cruce, hijos que varAnd no tocó,
+# poblaciones convergidas). La clave es el genoma de lado² bytes: su hash
+# es rápido y, a diferencia de un hash numérico, no tiene colisiones.
+
+TAMANO_CACHE = 50_000   # Entradas máximas (0 = caché desactivada)
+
+
+class CacheAptitud:
+    """
+    Guarda (errores_columnas, errores_cajas) por genoma con expulsión LRU.
+    'evaluador' puntúa los que faltan; por defecto evaluacion.evaluar_poblacion
+    (p. ej. un evaluacion_compartida.EvaluadorCompartido para usar un pool).
+    """
+
+    def __init__(self, capacidad=TAMANO_CACHE, evaluador=evaluar_poblacion):
+        self.capacidad = capacidad
+        self.evaluador = evaluador
+        self._datos = OrderedDict()
+        self.aciertos = 0
+        self.fallos = 0
+
+    def __len__(self):
+        return len(self._datos)
+
+    def buscar(self, clave):
+        valor = self._datos.get(clave)
+        if valor is None:
+            self.fallos += 1
+            return None
+        self._datos.move_to_end(clave)
+        self.aciertos += 1
+        return valor
+
+    def guardar(self, clave, valor):
+        if self.capacidad <= 0:
+            return
+        self._datos[clave] = valor
+        self._datos.move_to_end(clave)
+        if len(self._datos) > self.capacidad:
+            self._datos.popitem(last=False)
+
+    def limpiar(self):
+        """Vacía la caché (p. ej. al cambiar de tablero) y reinicia los contadores."""
+        self._datos.clear()
+        self.aciertos = 0
+        self.fallos = 0
+
+    def estadisticas(self):
+        consultas = self.aciertos + self.fallos
+        return {"aciertos": self.aciertos, "fallos": self.fallos,
+                "tasa_aciertos": self.aciertos / consultas if consultas else 0.0,
+                "entradas": len(self._datos), "capacidad": self.capacidad}
+
+    def evaluar_poblacion(self, poblacion):
+        """
+        Igual que evaluacion.evaluar_poblacion, pero solo puntúa los genomas
+        que no están en la caché (en un único lote, con self.evaluador) y
+        guarda sus resultados. Con capacidad <= 0 va directo a self.evaluador.
+        """
+        grids = poblacion if isinstance(poblacion, np.ndarray) else a_arreglo(poblacion)
+        n = grids.shape[0]
+        if self.capacidad <= 0:
+            # Sin caché no hay nada que buscar: ni claves ni consultas
+            self.fallos += n
+            return self.evaluador(grids)
+        planos = np.ascontiguousarray(grids).reshape(n, -1)
+        columnas = np.empty(n, dtype=np.int64)
+        cajas = np.empty(n, dtype=np.int64)
+
+        claves = [plano.tobytes() for plano in planos]
+        faltan = {}   # Clave que no está -> posiciones del lote con ese genoma
+        for i, clave in enumerate(claves):
+            valor = self.buscar(clave)
+            if valor is None:
+                faltan.setdefault(clave, []).append(i)
+            else:
+                columnas[i], cajas[i] = valor
+
+        if faltan:
+            # Cada genoma distinto se puntúa una vez (clones de la élite e
+            # hijos repetidos) y el resultado se copia a todas sus posiciones
+            posiciones = list(faltan.values())
+            col, caja, _ = self.evaluador(grids[[pos[0] for pos in posiciones]])
+            destino = [i for pos in posiciones for i in pos]
+            origen = [k for k, pos in enumerate(posiciones) for _ in pos]
+            columnas[destino] = col[origen]
+            cajas[destino] = caja[origen]
+            for clave, c, b in zip(faltan, col.tolist(), caja.tolist()):
+                self.guardar(clave, (c, b))
+
+        return columnas, cajas, columnas + cajas
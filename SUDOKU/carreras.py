@@ -0,0 +1,132 @@
+import argparse
+import contextlib
+import importlib
+import io
+import os
+import time
+from multiprocessing import Event, Pool
+
+from azar import semilla_derivada
+from resolucion import parsear_tablero
+
+# -------------------------------------------------------------------
+# 1. PARÁMETROS DEL PORTAFOLIO
+# -------------------------------------------------------------------
+# Los intentos son independientes: en vez de reiniciar uno tras otro,
+# se lanzan N a la vez (cada uno con su semilla) y el primero que llega
+# a 0 faltas cancela a todos los demás.
+NUM_PROCESOS = os.cpu_count() or 1
+MAX_INTENTOS = 100
+
+SOLUCIONADORES = ("desde_cero", "con_deap", "NSGAIII", "por_filas")
+
+# Evento compartido por todos los trabajadores del pool
+_DETENER = None
+
+# -------------------------------------------------------------------
+# 2. TRABAJADOR (UN INTENTO)
+# -------------------------------------------------------------------
+def _inicializar(evento, nombre_modulo, tablero):
+    global _DETENER
+    _DETENER = evento
+    # Cada trabajador carga el tablero una vez (presolver incluido), no por intento
+    if tablero is not None:
+        importlib.import_module(nombre_modulo).cargar_tablero(tablero)
+
+
+def _correr_intento(args):
+    nombre_modulo, intento, semilla = args
+    inicio_cpu = time.process_time()
+
+    if _DETENER.is_set():
+        # Alguien ya ganó antes de que este intento arrancara
+        resultado = {"intento": intento, "resuelto": False, "generacion": 0,
+                     "solucion": None, "cancelado": True}
+    else:
+        modulo = importlib.import_module(nombre_modulo)
+        # Cada intento imprime su propio progreso; en paralelo solo estorba
+        with contextlib.redirect_stdout(io.StringIO()):
+            resultado = modulo.ejecutar_intento(intento, semilla=semilla, detener=_DETENER)
+
+    resultado["semilla"] = semilla
+    resultado["tiempo_cpu"] = time.process_time() - inicio_cpu
+    return resultado
+
+# -------------------------------------------------------------------
+# 3. CARRERA
+# -------------------------------------------------------------------
+def correr_carrera(nombre_modulo="con_deap", num_intentos=MAX_INTENTOS,
+                   num_procesos=NUM_PROCESOS, semilla=None, tablero=None):
+    """
+    Lanza hasta 'num_intentos' intentos repartidos en 'num_procesos' procesos
+    y se detiene en cuanto uno resuelve 'tablero' (lado listas de lado; None
+    = el del módulo). Devuelve un dict con el
+    intento ganador (o None), su generación, la solución, el tiempo de CPU
+    total gastado por todos los intentos y el tiempo de pared.
+    """
+    if nombre_modulo not in SOLUCIONADORES:
+        raise ValueError(f"Solucionador desconocido: {nombre_modulo!r}")
+
+    # Semilla independiente por intento (subflujo 'intento' de la maestra)
+    tareas = [(nombre_modulo, intento, semilla_derivada(semilla, intento))
+              for intento in range(1, num_intentos + 1)]
+
+    detener = Event()
+    ganador = None
+    tiempo_cpu = 0.0
+    terminados = 0
+    inicio = time.time()
+
+    with Pool(processes=num_procesos, initializer=_inicializar,
+              initargs=(detener, nombre_modulo, tablero)) as pool:
+        for resultado in pool.imap_unordered(_correr_intento, tareas):
+            tiempo_cpu += resultado["tiempo_cpu"]
+            terminados += 1
+            if resultado["resuelto"] and ganador is None:
+                ganador = resultado
+                detener.set()
+        # Al salir del for, todos los intentos ya regresaron (cancelados o no)
+
+    return {
+        "solucionador": nombre_modulo,
+        "resuelto": ganador is not None,
+        "intento": ganador["intento"] if ganador else None,
+        "generacion": ganador["generacion"] if ganador else None,
+        "semilla": ganador["semilla"] if ganador else None,
+        "solucion": ganador["solucion"] if ganador else None,
+        "intentos_terminados": terminados,
+        "tiempo_cpu": tiempo_cpu,
+        "tiempo_pared": time.time() - inicio,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Reinicios en paralelo: gana el primer intento que resuelve")
+    parser.add_argument("solucionador", choices=SOLUCIONADORES, nargs="?", default="con_deap")
+    parser.add_argument("-t", "--tablero", default=None, help="Tablero n²×n²: un carácter por celda ('0' o '.' = vacía, A = 10, B = 11...) o enteros separados; por defecto el del módulo")
+    parser.add_argument("--intentos", type=int, default=MAX_INTENTOS)
+    parser.add_argument("--procesos", type=int, default=NUM_PROCESOS)
+    parser.add_argument("--semilla", type=int, default=None)
+    args = parser.parse_args()
+    tablero = parsear_tablero(args.tablero) if args.tablero else None
+
+    print(f"\n" + "="*60)
+    print(f" >>> SUDOKU - CARRERA DE INTENTOS ({args.solucionador}, {args.procesos} procesos) <<<")
+    print("="*60)
+
+    res = correr_carrera(args.solucionador, args.intentos, args.procesos, args.semilla, tablero)
+
+    if not res["resuelto"]:
+        print(f"\n:( Ningún intento resolvió el tablero ({res['intentos_terminados']} intentos).")
+    else:
+        print(f"\n" + "*"*60)
+        print(f" ¡SOLUCIÓN ENCONTRADA! (Intento {res['intento']}, Gen {res['generacion']}, "
+              f"semilla {res['semilla']})")
+        print("*"*60)
+        for fila in res["solucion"]:
+            print(" ".join(str(v) for v in fila))
+    print(f"\nTiempo de pared: {res['tiempo_pared']:.1f}s | "
+          f"CPU total: {res['tiempo_cpu']:.1f}s | Intentos corridos: {res['intentos_terminados']}")
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,20 @@
 import random
 import numpy as np
-import copy
-from deap import base, creator, tools
+from deap import base, creator
+from cache_fitness import CacheAptitud, TAMANO_CACHE
+from presolver import preparar_tablero, esta_completo, poblacion_aleatoria
+from fitness_incremental import TablaConflictos
+from genoma import clonar_rapido, individuos_desde_arreglo
+from instrumentacion import NULO
+from seleccion import aptitudes_deap, sel_elite, sel_torneo_vectorizado
+from memetica import busqueda_local, movibles_por_fila
+from operadores import cruzar_en_bloque, mutar_en_bloque
+from evaluacion import a_arreglo
+from azar import (arreglo_movibles, estados, flujos_desde_random, restaurar,
+                  sortear_cruces, sortear_intercambios)
+from geometria import tamano_caja
+from diversidad import (FRACCION_RESIEMBRA, REINICIAR, RESEMBRAR, MonitorDiversidad,
+                        celdas_movibles, peores)
 
 # -------------------------------------------------------------------
 # 1. PARÁMETROS DEL ALGORITMO (CONFIGURACIÓN RÁPIDA)
@@ -12,6 +25,15 @@ PROB_CRUCE = 0.9
 PROB_MUTACION = 0.1
 PORCENTAJE_ELITISMO = 0.1 
 TAMANO_TORNEO = 5
+CAPACIDAD_CACHE = TAMANO_CACHE  # Genomas recordados por la caché de aptitud (0 = sin caché)
+USAR_PRESOLVER = True         # Fijar por lógica las celdas deducibles antes de evolucionar
+USAR_MEMETICA = False         # Búsqueda local por swaps sobre los mejores cada CADA_MEMETICA generaciones
+CADA_MEMETICA = 25            # Generaciones entre búsquedas locales (1 = en todas)
+K_MEMETICA = 10               # Individuos mejorados por búsqueda
+PASOS_MEMETICA = 100          # Swaps como máximo por individuo
+TENENCIA_TABU = 7             # Pasos que un swap deshecho queda prohibido (0 = escalada simple)
+USAR_MONITOR = True           # Resembrar / reiniciar antes de tiempo si la población colapsa (diversidad.py)
+ELITES_ENTRE_REINICIOS = 0    # Mejores genomas de un intento fallido que pasan al siguiente
 
 # -------------------------------------------------------------------
 # TABLERO A RESOLVER
@@ -28,150 +50,327 @@ TABLERO_INICIAL = [
     [0, 4, 0, 5, 0, 8, 0, 7, 0]
 ]
 
+# Lo que sale del tablero cargado lo llena cargar_tablero(): el presolver
+# (singles desnudos y ocultos pasan a ser pistas), la máscara de
+# candidatos del resto, el lado (9, 16, 25...) y las columnas movibles de
+# cada fila. Importar el módulo no lo corre: sin un cargar_tablero previo,
+# el primer intento (o isla) carga TABLERO_INICIAL.
+TABLERO_CARGADO = False
+CANDIDATOS = []
+LADO = len(TABLERO_INICIAL)
+MOVIBLES = []
+MOVIBLES_ARREGLO = NUM_MOVIBLES = None   # Para sortear los swaps en bloque
+
+# Subflujos de numpy (selección, operadores) de la corrida actual; se
+# siembran desde 'random' al empezar cada intento y cada isla
+FLUJOS = []
+
+# Mejores genomas del último intento fallido (ELITES_ENTRE_REINICIOS)
+ELITE_PREVIA = []
+
 # -------------------------------------------------------------------
 # 2. FUNCIÓN PARA IMPRIMIR BONITO
 # -------------------------------------------------------------------
 def imprimir_tablero_bonito(tablero):
-    print(" -----------------------")
+    lado = len(tablero)
+    n = tamano_caja(lado)
+    ancho = len(str(lado))
+    separador = "|" + "+".join(["-" * ((ancho + 1) * n + 1)] * n) + "|"
+    print(" " + "-" * (len(separador) - 2))
     for i, fila in enumerate(tablero):
-        if i > 0 and i % 3 == 0:
-            print("|-------+-------+-------|")
+        if i > 0 and i % n == 0:
+            print(separador)
         
         linea = "| "
         for j, val in enumerate(fila):
-            linea += f"{val} "
-            if (j + 1) % 3 == 0 and j < 8:
+            linea += f"{val:>{ancho}} "
+            if (j + 1) % n == 0 and j < lado - 1:
                 linea += "| "
         linea += "|"
         print(linea)
-    print(" -----------------------")
+    print(" " + "-" * (len(separador) - 2))
 
 # -------------------------------------------------------------------
-# 3. CONFIGURACIÓN DE DEAP
+# 3. CONFIGURACIÓN DE DEAP (SE ARMA EN EL PRIMER USO)
 # -------------------------------------------------------------------
-creator.create("FitnessMin", base.Fitness, weights=(-1.0,))
-creator.create("Individual", list, fitness=creator.FitnessMin)
-
-toolbox = base.Toolbox()
-
-def crear_individuo_sudoku():
-    genes = []
-    for r in range(9):
-        fila_origen = TABLERO_INICIAL[r]
-        presentes = [x for x in fila_origen if x != 0]
-        faltantes = [x for x in range(1, 10) if x not in presentes]
-        random.shuffle(faltantes)
-        
-        fila_nueva = []
-        for val in fila_origen:
-            if val != 0:
-                fila_nueva.append(val)
-            else:
-                fila_nueva.append(faltantes.pop())
-        genes.append(fila_nueva)
-    return creator.Individual(genes)
-
-toolbox.register("individual", crear_individuo_sudoku)
-toolbox.register("population", tools.initRepeat, list, toolbox.individual)
-
-def evaluar_sudoku(individuo):
-    num_faltas = 0
-    # Columnas
-    for c in range(9):
-        columna = [individuo[r][c] for r in range(9)]
-        num_faltas += (9 - len(set(columna)))
-    # Subcuadrículas
-    for i_sub in range(0, 9, 3):
-        for j_sub in range(0, 9, 3):
-            subcuadricula = []
-            for r in range(i_sub, i_sub + 3):
-                for c in range(j_sub, j_sub + 3):
-                    subcuadricula.append(individuo[r][c])
-            num_faltas += (9 - len(set(subcuadricula)))
-    return (num_faltas,)
-
-toolbox.register("evaluate", evaluar_sudoku)
-toolbox.register("mate", tools.cxUniform, indpb=0.5)
-
-def mutar_sudoku(individuo, indpb):
-    fila_idx = random.randint(0, 8)
-    fila = individuo[fila_idx]
-    indices_movibles = [i for i, val in enumerate(TABLERO_INICIAL[fila_idx]) if val == 0]
-    if len(indices_movibles) >= 2:
-        idx1, idx2 = random.sample(indices_movibles, 2)
-        fila[idx1], fila[idx2] = fila[idx2], fila[idx1]
-    return (individuo,)
-
-toolbox.register("mutate", mutar_sudoku, indpb=PROB_MUTACION)
-toolbox.register("select", tools.selTournament, tournsize=TAMANO_TORNEO)
+# Importar el módulo no toca el creator ni arma el toolbox: lo hace
+# preparar_deap() la primera vez que corre un intento o una isla
+# (deap.tools, que es lo caro de importar, aquí no se usa). Las clases
+# llevan un nombre propio del módulo para que con_deap y NSGAIII convivan
+# en un mismo proceso.
+toolbox = None
+Individual = None   # creator.IndividuoConDeap una vez preparado
+
+def crear_poblacion(n):
+    # Permutaciones de los faltantes compatibles con los candidatos, todas a la vez
+    genomas = poblacion_aleatoria(FLUJOS[1], TABLERO_INICIAL, CANDIDATOS, n)
+    return [Individual(genes) for genes in genomas.tolist()]
+
+# Caché compartida por todos los intentos (el tablero no cambia)
+CACHE = CacheAptitud(CAPACIDAD_CACHE)
+
+# Tableros puntuados (con o sin caché, o por delta) desde el último reinicio
+EVALUACIONES = 0
+
+def evaluar_en_lote(individuos):
+    """Asigna la aptitud a todos los individuos con una sola llamada vectorizada."""
+    global EVALUACIONES
+    if not individuos:
+        return
+    EVALUACIONES += len(individuos)
+    _, _, totales = CACHE.evaluar_poblacion(individuos)
+    for ind, total in zip(individuos, totales.tolist()):
+        ind.fitness.values = (total,)
+
+def preparar_deap():
+    """Crea las clases del creator y registra el toolbox (solo la primera vez)."""
+    global toolbox, Individual
+    if toolbox is not None:
+        return toolbox
+    if not hasattr(creator, "IndividuoConDeap"):
+        creator.create("FitnessConDeap", base.Fitness, weights=(-1.0,))
+        creator.create("IndividuoConDeap", list, fitness=creator.FitnessConDeap, tabla=None)
+    Individual = creator.IndividuoConDeap
+
+    caja = base.Toolbox()
+    # Copia directa de filas + aptitud en lugar del deepcopy genérico
+    caja.register("clone", clonar_rapido)
+    caja.register("population", crear_poblacion)
+    # Selección parcial (élite) y torneos vectorizados: la población no se ordena
+    caja.register("select", sel_torneo_vectorizado, tournsize=TAMANO_TORNEO)
+    caja.register("elite", sel_elite)
+    toolbox = caja
+    return toolbox
 
 # -------------------------------------------------------------------
-# 4. FUNCIÓN PRINCIPAL
+# 4. UNA GENERACIÓN (REUTILIZADA POR EL MAIN Y POR EL MODELO DE ISLAS)
 # -------------------------------------------------------------------
-def main():
-    intento = 1
-    encontrado = False
+def mejorar_elite(poblacion):
+    """Modo memético: búsqueda local en el lugar sobre los K_MEMETICA mejores."""
+    global EVALUACIONES
+    for ind in toolbox.elite(poblacion, K_MEMETICA):
+        if ind.tabla is None:
+            ind.tabla = TablaConflictos.desde_tablero(ind)
+        EVALUACIONES += busqueda_local(ind, ind.tabla, MOVIBLES, PASOS_MEMETICA, TENENCIA_TABU)
+        ind.fitness.values = (ind.tabla.errores,)
+
+def nueva_generacion(poblacion, medidor=NULO, generacion=0):
+    """
+    Elitismo + torneo + cruce + mutación. La élite queda al principio.
+    'generacion' decide si toca la búsqueda local (CADA_MEMETICA).
+    """
+    global EVALUACIONES
+    num_elite = int(len(poblacion) * PORCENTAJE_ELITISMO)
+    if USAR_MEMETICA and generacion % CADA_MEMETICA == 0:
+        with medidor.fase("memetica"):
+            mejorar_elite(poblacion)
+    with medidor.fase("elitismo"):
+        elite = [toolbox.clone(ind) for ind in toolbox.elite(poblacion, num_elite)]
     
-    while not encontrado:
-        print(f"\n" + "="*45)
-        print(f" >>> INICIANDO INTENTO #{intento} (Pop: {TAMANO_POBLACION}) <<<")
-        print("="*45)
-        
+    rng_seleccion, rng_operadores = FLUJOS
+    with medidor.fase("seleccion"):
+        offspring = toolbox.select(poblacion, len(poblacion) - num_elite, rng=rng_seleccion)
+    # Los hijos se arman como un arreglo (N, LADO, LADO): cruce y mutación
+    # en bloque (operadores.py) y un solo lote de evaluación
+    with medidor.fase("clonacion"):
+        padres = a_arreglo(offspring)
+        aptitudes = aptitudes_deap(offspring).astype(np.int64)
+
+    with medidor.fase("cruce"):
+        cruza, mascaras = sortear_cruces(rng_operadores, len(offspring) // 2, LADO, PROB_CRUCE)
+        hijos, cambiados = cruzar_en_bloque(padres, cruza, mascaras)
+
+    with medidor.fase("mutacion"):
+        mutantes = np.flatnonzero(rng_operadores.random(len(hijos)) < PROB_MUTACION)
+        mutar_en_bloque(hijos, mutantes, sortear_intercambios(
+            rng_operadores, len(mutantes), MOVIBLES_ARREGLO, NUM_MOVIBLES))
+        cambiados[mutantes] = True
+
+    # Los que salieron iguales a su padre conservan su aptitud
+    with medidor.fase("evaluacion"):
+        pendientes = np.flatnonzero(cambiados)
+        EVALUACIONES += len(pendientes)
+        if len(pendientes):
+            aptitudes[pendientes] = CACHE.evaluar_poblacion(hijos[pendientes])[2]
+
+    with medidor.fase("clonacion"):
+        offspring = individuos_desde_arreglo(Individual, hijos, aptitudes[:, None])
+
+    return elite + offspring
+
+def resembrar(poblacion, aptitudes):
+    """Reemplaza a la peor FRACCION_RESIEMBRA de la población por individuos nuevos."""
+    indices = peores(aptitudes, int(len(poblacion) * FRACCION_RESIEMBRA)).tolist()
+    for i, nuevo in zip(indices, toolbox.population(n=len(indices))):
+        poblacion[i] = nuevo
+    evaluar_en_lote([poblacion[i] for i in indices])
+
+def evolucionar_isla(genomas, generaciones, semilla, generacion_inicial=0):
+    """
+    Punto de entrada del modelo de islas: evoluciona una subpoblación
+    durante 'generaciones' generaciones y devuelve los genomas ordenados
+    de mejor a peor, sus errores y cuántas generaciones se corrieron.
+    Con genomas=None se crea una subpoblación nueva de TAMANO_POBLACION.
+    'generacion_inicial' es la generación global de la isla al empezar la
+    época: CADA_MEMETICA cuenta sobre toda la corrida, no por época.
+    """
+    preparar_deap()
+    asegurar_tablero()
+    random.seed(semilla)
+    FLUJOS[:] = flujos_desde_random(2)
+    if genomas is None:
         poblacion = toolbox.population(n=TAMANO_POBLACION)
-        
-        fitnesses = list(map(toolbox.evaluate, poblacion))
-        for ind, fit in zip(poblacion, fitnesses):
-            ind.fitness.values = fit
-            
-        mejor_ind = tools.selBest(poblacion, 1)[0]
-        print(f"Mejor adaptación inicial: {mejor_ind.fitness.values[0]}")
-        
-        for gen in range(MAX_GENERACIONES_POR_INTENTO):
-            poblacion.sort(key=lambda x: x.fitness.values[0])
-            
-            if poblacion[0].fitness.values[0] == 0:
-                encontrado = True
-                break
-            
-            num_elite = int(TAMANO_POBLACION * PORCENTAJE_ELITISMO)
-            elite = [toolbox.clone(ind) for ind in poblacion[:num_elite]]
-            
-            offspring = toolbox.select(poblacion, len(poblacion) - num_elite)
-            offspring = list(map(toolbox.clone, offspring))
-            
-            for child1, child2 in zip(offspring[::2], offspring[1::2]):
-                if random.random() < PROB_CRUCE:
-                    toolbox.mate(child1, child2)
-                    del child1.fitness.values
-                    del child2.fitness.values
-
-            for mutant in offspring:
-                if random.random() < PROB_MUTACION:
-                    toolbox.mutate(mutant)
-                    del mutant.fitness.values
-
-            invalid_ind = [ind for ind in offspring if not ind.fitness.valid]
-            fitnesses = map(toolbox.evaluate, invalid_ind)
-            for ind, fit in zip(invalid_ind, fitnesses):
-                ind.fitness.values = fit
-            
-            poblacion[:] = elite + offspring
-            
-            if (gen + 1) % 25 == 0:
-                print(f"  Gen {gen+1}/{MAX_GENERACIONES_POR_INTENTO} | Faltas: {poblacion[0].fitness.values[0]}")
+    else:
+        poblacion = [Individual([fila[:] for fila in g]) for g in genomas]
+    evaluar_en_lote(poblacion)
+
+    corridas = 0
+    while corridas < generaciones and toolbox.elite(poblacion, 1)[0].fitness.values[0] != 0:
+        poblacion = nueva_generacion(poblacion, generacion=generacion_inicial + corridas)
+        corridas += 1
+    # Las islas esperan los genomas de mejor a peor
+    poblacion.sort(key=lambda x: x.fitness.values[0])
+
+    return ([[fila[:] for fila in ind] for ind in poblacion],
+            [ind.fitness.values[0] for ind in poblacion], corridas)
 
-        if encontrado:
+# -------------------------------------------------------------------
+# 5. FUNCIÓN PRINCIPAL
+# -------------------------------------------------------------------
+def cargar_tablero(tablero):
+    """Cambia el tablero a resolver (LADO listas de LADO, 0 = vacío; 9x9, 16x16...)."""
+    global LADO, MOVIBLES_ARREGLO, NUM_MOVIBLES, TABLERO_CARGADO
+    tablero, candidatos = preparar_tablero(tablero, USAR_PRESOLVER)
+    LADO = len(tablero)
+    TABLERO_INICIAL[:] = tablero
+    CANDIDATOS[:] = candidatos
+    MOVIBLES[:] = movibles_por_fila(tablero)
+    MOVIBLES_ARREGLO, NUM_MOVIBLES = arreglo_movibles(MOVIBLES)
+    ELITE_PREVIA.clear()
+    # Las aptitudes guardadas eran de otro tablero
+    CACHE.limpiar()
+    TABLERO_CARGADO = True
+
+def asegurar_tablero():
+    """Presuelve TABLERO_INICIAL la primera vez si nadie cargó otro tablero."""
+    if not TABLERO_CARGADO:
+        cargar_tablero(TABLERO_INICIAL)
+
+def ejecutar_intento(intento, semilla=None, detener=None, medidor=None, punto_control=None):
+    """
+    Corre un intento completo (hasta MAX_GENERACIONES_POR_INTENTO) y devuelve
+    un dict con el resultado. 'detener' es un Event opcional para cancelarlo.
+    'medidor' (instrumentacion.MedidorFases) recibe el tiempo de cada fase y
+    'punto_control' (puntos_control.PuntoControl) guarda o reanuda el intento.
+    """
+    global EVALUACIONES
+    preparar_deap()
+    asegurar_tablero()
+    medidor = medidor or NULO
+    if semilla is not None:
+        random.seed(semilla)
+
+    print(f"\n" + "="*45)
+    print(f" >>> INICIANDO INTENTO #{intento} (Pop: {TAMANO_POBLACION}) <<<")
+    print("="*45)
+
+    # Tableros fáciles: el presolver ya los completó, no hace falta evolucionar
+    if esta_completo(TABLERO_INICIAL):
+        print("¡RESUELTO POR PROPAGACIÓN DE RESTRICCIONES (sin evolución)!")
+        imprimir_tablero_bonito(TABLERO_INICIAL)
+        return {"intento": intento, "resuelto": True, "generacion": 0,
+                "solucion": [fila[:] for fila in TABLERO_INICIAL], "cancelado": False,
+                "cache": CACHE.estadisticas()}
+    
+    FLUJOS[:] = flujos_desde_random(2)
+    monitor = MonitorDiversidad(celdas_movibles(TABLERO_INICIAL)) if USAR_MONITOR else None
+    reanudado = punto_control.reanudar(intento) if punto_control is not None else None
+    if reanudado is None:
+        gen_inicial = 0
+        with medidor.fase("inicializacion"):
+            poblacion = toolbox.population(n=TAMANO_POBLACION)
+            # Los mejores del intento anterior (si se guardaron) entran tal cual
+            for i, genoma in enumerate(ELITE_PREVIA):
+                poblacion[i] = Individual([fila[:] for fila in genoma])
+        with medidor.fase("evaluacion"):
+            evaluar_en_lote(poblacion)
+    else:
+        # Se sigue desde el punto de control: mismos genomas, aptitudes y azar
+        gen_inicial = reanudado["generacion"]
+        poblacion = individuos_desde_arreglo(Individual, reanudado["genomas"],
+                                             reanudado["aptitudes"])
+        restaurar(FLUJOS, reanudado["extra"]["flujos"])
+        if monitor is not None and reanudado["extra"].get("monitor"):
+            monitor.restaurar(reanudado["extra"]["monitor"])
+        EVALUACIONES = reanudado["evaluaciones"]
+        print(f"Reanudado en la generación {gen_inicial}")
+    with medidor.fase("ordenamiento"):
+        mejor = toolbox.elite(poblacion, 1)[0]
+    print(f"Mejor adaptación inicial: {mejor.fitness.values[0]}")
+    
+    generaciones = MAX_GENERACIONES_POR_INTENTO
+    for gen in range(gen_inicial, MAX_GENERACIONES_POR_INTENTO):
+        if mejor.fitness.values[0] == 0:
             print(f"\n" + "*"*50)
             print(f"¡SOLUCIÓN ENCONTRADA EN EL INTENTO {intento}, GEN {gen}!")
             print("*"*50)
             
-            mejor_final = tools.selBest(poblacion, 1)[0]
-            imprimir_tablero_bonito(mejor_final)
+            imprimir_tablero_bonito(mejor)
             
             print("\nEl tablero es una solución válida.")
-        else:
-            print(f"  -> Intento {intento} fallido. Reiniciando...\n")
-            intento += 1
+            return {"intento": intento, "resuelto": True, "generacion": gen,
+                    "solucion": [list(fila) for fila in mejor], "cancelado": False,
+                    "cache": CACHE.estadisticas()}
+
+        if detener is not None and detener.is_set():
+            return {"intento": intento, "resuelto": False, "generacion": gen,
+                    "solucion": None, "cancelado": True,
+                    "cache": CACHE.estadisticas()}
+
+        if punto_control is not None and gen > gen_inicial and punto_control.toca(gen):
+            punto_control.guardar(intento, gen, poblacion,
+                                  [ind.fitness.values for ind in poblacion],
+                                  evaluaciones=EVALUACIONES,
+                                  extra={"flujos": estados(FLUJOS),
+                                         "monitor": monitor.estado() if monitor else None})
+        
+        poblacion[:] = nueva_generacion(poblacion, medidor, gen)
+        with medidor.fase("ordenamiento"):
+            mejor = toolbox.elite(poblacion, 1)[0]
+        medidor.fin_generacion(intento=intento, generacion=gen + 1, mejor=mejor.fitness.values[0],
+                               poblacion=poblacion)
+        
+        if (gen + 1) % 25 == 0:
+            print(f"  Gen {gen+1}/{MAX_GENERACIONES_POR_INTENTO} | Faltas: {mejor.fitness.values[0]}")
+
+        # Población colapsada y sin mejora: resembrar la mitad peor o cortar el intento
+        if monitor is not None:
+            with medidor.fase("diversidad"):
+                aptitudes = aptitudes_deap(poblacion)
+                accion = monitor.observar(aptitudes, poblacion)
+            if accion == RESEMBRAR:
+                with medidor.fase("inicializacion"):
+                    resembrar(poblacion, aptitudes)
+                    mejor = toolbox.elite(poblacion, 1)[0]
+            elif accion == REINICIAR:
+                print(f"  Gen {gen+1} | Población colapsada "
+                      f"({monitor.ultimo['unicos']:.0%} genomas distintos). Reinicio anticipado.")
+                generaciones = gen + 1
+                break
+
+    ELITE_PREVIA[:] = [[fila[:] for fila in ind] for ind in toolbox.elite(poblacion, ELITES_ENTRE_REINICIOS)]
+    print(f"  -> Intento {intento} fallido. Reiniciando...\n")
+    return {"intento": intento, "resuelto": False, "generacion": generaciones,
+            "solucion": None, "cancelado": False,
+            "cache": CACHE.estadisticas()}
+
+def main():
+    intento = 1
+    encontrado = False
+    
+    while not encontrado:
+        encontrado = ejecutar_intento(intento)["resuelto"]
+        intento += 1
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
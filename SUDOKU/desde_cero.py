@@ -1,4 +1,13 @@
 import random
+import numpy as np
+from fitness_incremental import TablaConflictos
+from cache_fitness import CacheAptitud, TAMANO_CACHE
+from presolver import preparar_tablero, esta_completo, poblacion_aleatoria
+from azar import arreglo_movibles, sortear_intercambios
+from memetica import busqueda_local, movibles_por_fila
+from operadores import mutar_en_bloque
+from geometria import tamano_caja
+from evolucion import Codificacion, evolucionar, resultado
 
 # -------------------------------------------------------------------
 # 1. PARÁMETROS (IGUALADOS A DEAP Y NSGA-III)
@@ -9,6 +18,16 @@ PROB_CRUCE = 0.9
 PROB_MUTACION = 0.1      # 10% 
 PORCENTAJE_ELITISMO = 0.1
 TAMANO_TORNEO = 3        
+CAMBIOS_MUTACION = 3     # Swaps por mutación (igual de agresivo que DEAP/NSGA-III)
+CAPACIDAD_CACHE = TAMANO_CACHE  # Genomas recordados por la caché de aptitud (0 = sin caché)
+USAR_PRESOLVER = True    # Fijar por lógica las celdas deducibles antes de evolucionar
+USAR_MEMETICA = False    # Búsqueda local por swaps sobre los mejores cada CADA_MEMETICA generaciones
+CADA_MEMETICA = 25       # Generaciones entre búsquedas locales (1 = en todas)
+K_MEMETICA = 10          # Individuos mejorados por búsqueda
+PASOS_MEMETICA = 100     # Swaps como máximo por individuo
+TENENCIA_TABU = 7        # Pasos que un swap deshecho queda prohibido (0 = escalada simple)
+USAR_MONITOR = True      # Resembrar / reiniciar antes de tiempo si la población colapsa (diversidad.py)
+ELITES_ENTRE_REINICIOS = 0  # Mejores genomas de un intento fallido que pasan al siguiente
 
 # -------------------------------------------------------------------
 # TABLERO INICIAL
@@ -25,173 +44,141 @@ TABLERO_PROBLEM = [
     [0, 4, 0, 5, 0, 8, 0, 7, 0]
 ]
 
-# PRE-CALCULO: Índices fijos
-INDICES_FIJOS = [set() for _ in range(9)]
-for r in range(9):
-    for c in range(9):
-        if TABLERO_PROBLEM[r][c] != 0:
-            INDICES_FIJOS[r].add(c)
+# Mejores genomas del último intento fallido (ELITES_ENTRE_REINICIOS)
+ELITE_PREVIA = []
 
 # -------------------------------------------------------------------
-# 2. CLASE INDIVIDUO
+# 2. GENOMA POR CELDAS
 # -------------------------------------------------------------------
-class Individuo:
-    def __init__(self, genes=None):
-        self.genes = genes
-        self.adaptacion = 0.0
-
-    def inicializar_aleatorio(self):
-        self.genes = []
-        for r in range(9):
-            fila_origen = TABLERO_PROBLEM[r]
-            presentes = {x for x in fila_origen if x != 0}
-            faltantes = [x for x in range(1, 10) if x not in presentes]
-            random.shuffle(faltantes)
-            
-            nueva_fila = []
-            for c in range(9):
-                val = fila_origen[c]
-                if val != 0:
-                    nueva_fila.append(val)
-                else:
-                    nueva_fila.append(faltantes.pop())
-            self.genes.append(nueva_fila)
+# Tableros puntuados (con o sin caché, o por delta) desde el último reinicio
+EVALUACIONES = 0
 
-# -------------------------------------------------------------------
-# 3. FUNCIÓN DE ADAPTACIÓN
-# -------------------------------------------------------------------
-def calcular_adaptacion(individuo):
-    errores = 0
-    grid = individuo.genes
-    
-    # 1. Columnas
-    for c in range(9):
-        columna = {grid[r][c] for r in range(9)}
-        errores += (9 - len(columna))
-
-    # 2. Cuadrantes 3x3
-    for r_bloque in (0, 3, 6):
-        for c_bloque in (0, 3, 6):
-            bloque = set()
-            for r in range(r_bloque, r_bloque + 3):
-                row = grid[r]
-                for c in range(c_bloque, c_bloque + 3):
-                    bloque.add(row[c])
-            errores += (9 - len(bloque))
-            
-    individuo.adaptacion = errores
-    return errores
+class PorCeldas(Codificacion):
+    """
+    El genoma es el tablero: (N, LADO, LADO) uint8 con cada fila una
+    permutación de sus faltantes. Aptitud por la caché, mutación por swaps
+    entre columnas movibles y, en modo memético, búsqueda local por swaps.
+    """
 
-# -------------------------------------------------------------------
-# 4. OPERADORES GENÉTICOS
-# -------------------------------------------------------------------
-def cruce(padre1, padre2):
-    genes_h1 = []
-    genes_h2 = []
-    for r in range(9):
-        if random.random() < 0.5:
-            genes_h1.append(padre1.genes[r][:])
-            genes_h2.append(padre2.genes[r][:])
-        else:
-            genes_h1.append(padre2.genes[r][:])
-            genes_h2.append(padre1.genes[r][:])
-    return Individuo(genes_h1), Individuo(genes_h2)
-
-def mutar(ind):
-    # --- CAMBIO IMPORTANTE PARA LA COMPARATIVA ---
-    # Hacemos 3 cambios para igualar la agresividad de DEAP/NSGA-III
-    # bajo la misma regla del 10% de probabilidad de evento.
-    CAMBIOS = 3 
-    
-    for _ in range(CAMBIOS):
-        r = random.randint(0, 8)
-        fila = ind.genes[r]
-        movibles = [c for c in range(9) if c not in INDICES_FIJOS[r]]
-        
-        if len(movibles) >= 2:
-            idx1, idx2 = random.sample(movibles, 2)
-            fila[idx1], fila[idx2] = fila[idx2], fila[idx1]
+    def __init__(self, capacidad_cache=CAPACIDAD_CACHE):
+        # Caché compartida por todos los intentos sobre el mismo tablero
+        self.cache = CacheAptitud(capacidad_cache)
+        self.movibles = []
+        self.movibles_arreglo = self.num_movibles = None
+
+    def cargar(self, tablero, usar_presolver=True):
+        """
+        Además del presolver y los candidatos, las columnas movibles de cada
+        fila (las que usan las mutaciones).
+        """
+        super().cargar(tablero, usar_presolver)
+        self.movibles = movibles_por_fila(self.tablero)
+        self.movibles_arreglo, self.num_movibles = arreglo_movibles(self.movibles)
+        # Las aptitudes guardadas eran de otro tablero
+        self.cache.limpiar()
+
+    def aleatorios(self, rng, n):
+        # Filas compatibles con los candidatos, armadas para todos a la vez
+        return poblacion_aleatoria(rng, self.tablero, self.candidatos, n)
+
+    def evaluar(self, genomas):
+        """Errores totales de un arreglo (N, LADO, LADO) con una sola llamada vectorizada."""
+        self.evaluaciones += len(genomas)
+        if len(genomas) == 0:
+            return np.empty(0, dtype=np.int64)
+        return self.cache.evaluar_poblacion(genomas)[2]
+
+    def mutar(self, rng, hijos, mutantes):
+        mutar_en_bloque(hijos, mutantes, sortear_intercambios(
+            rng, len(mutantes) * CAMBIOS_MUTACION, self.movibles_arreglo, self.num_movibles))
+
+    def toca_mejorar(self, generacion):
+        return USAR_MEMETICA and generacion % CADA_MEMETICA == 0
+
+    def mejorar(self, genomas, aptitudes, elite):
+        """Búsqueda local en el lugar sobre los K_MEMETICA mejores."""
+        for j in elite[:K_MEMETICA].tolist():
+            tabla = TablaConflictos.desde_tablero(genomas[j])
+            grid = genomas[j].tolist()
+            self.evaluaciones += busqueda_local(grid, tabla, self.movibles, PASOS_MEMETICA, TENENCIA_TABU)
+            genomas[j] = grid
+            aptitudes[j] = tabla.errores
+
+    def estadisticas_cache(self):
+        return self.cache.estadisticas()
+
+# El tablero lo carga cargar_tablero(); importar el módulo no corre el
+# presolver: sin un cargar_tablero previo, el primer intento carga
+# TABLERO_PROBLEM.
+POR_CELDAS = PorCeldas()
 
 # -------------------------------------------------------------------
-# 5. BLOQUE PRINCIPAL
+# 3. BLOQUE PRINCIPAL
 # -------------------------------------------------------------------
+def cargar_tablero(tablero):
+    """Cambia el tablero a resolver (LADO listas de LADO, 0 = vacío; 9x9, 16x16...)."""
+    POR_CELDAS.cargar(tablero, USAR_PRESOLVER)
+    ELITE_PREVIA.clear()
+
+def asegurar_tablero():
+    """Presuelve TABLERO_PROBLEM la primera vez si nadie cargó otro tablero."""
+    if POR_CELDAS.tablero is None:
+        cargar_tablero(TABLERO_PROBLEM)
+
+def ejecutar_intento(intento, semilla=None, detener=None, medidor=None, punto_control=None):
+    """
+    Corre un intento completo (hasta MAX_GENERACIONES) y devuelve un dict con
+    el resultado. 'detener' es un Event opcional para cancelarlo desde fuera.
+    'medidor' (instrumentacion.MedidorFases) recibe el tiempo de cada fase y
+    'punto_control' (puntos_control.PuntoControl) guarda o reanuda el intento.
+    """
+    global EVALUACIONES
+    asegurar_tablero()
+    tablero = POR_CELDAS.tablero
+    if semilla is not None:
+        random.seed(semilla)
+
+    print(f"\n{'='*40}")
+    print(f" >>> INICIANDO INTENTO #{intento} (Manual) <<<")
+    print(f"{'='*40}")
+
+    # Tableros fáciles: el presolver ya los completó, no hace falta evolucionar
+    if esta_completo(tablero):
+        print("¡RESUELTO POR PROPAGACIÓN DE RESTRICCIONES (sin evolución)!")
+        imprimir_tablero(tablero)
+        return resultado(intento, True, 0, [fila[:] for fila in tablero],
+                         cache=POR_CELDAS.estadisticas_cache())
+
+    POR_CELDAS.evaluaciones = EVALUACIONES
+    res = evolucionar(intento, POR_CELDAS, tablero, TAMANO_POBLACION, MAX_GENERACIONES,
+                      PROB_CRUCE, PROB_MUTACION, PORCENTAJE_ELITISMO, TAMANO_TORNEO,
+                      usar_monitor=USAR_MONITOR, elite_previa=ELITE_PREVIA,
+                      elites_entre_reinicios=ELITES_ENTRE_REINICIOS, detener=detener,
+                      medidor=medidor, punto_control=punto_control)
+    EVALUACIONES = POR_CELDAS.evaluaciones
+    if res["resuelto"]:
+        imprimir_tablero(res["solucion"])
+    return res
+
 def main():
     intento = 1
     
     while True: 
-        print(f"\n{'='*40}")
-        print(f" >>> INICIANDO INTENTO #{intento} (Manual) <<<")
-        print(f"{'='*40}")
-        
-        # 1. Crear Población
-        poblacion = []
-        for _ in range(TAMANO_POBLACION):
-            nuevo = Individuo()
-            nuevo.inicializar_aleatorio()
-            calcular_adaptacion(nuevo)
-            poblacion.append(nuevo)
-            
-        poblacion.sort(key=lambda x: x.adaptacion)
-        
-        # 2. Ciclo Evolutivo
-        for gen in range(MAX_GENERACIONES):
-            
-            if poblacion[0].adaptacion == 0:
-                print(f"\n{'*'*50}")
-                print(f"¡SOLUCIÓN ENCONTRADA EN INTENTO {intento}, GEN {gen}!")
-                print(f"{'*'*50}")
-                imprimir_tablero(poblacion[0])
-                return 
-
-            # Elitismo
-            num_elite = int(TAMANO_POBLACION * PORCENTAJE_ELITISMO)
-            nueva_poblacion = []
-            
-            for i in range(num_elite):
-                elite_genes = [fila[:] for fila in poblacion[i].genes]
-                elite_ind = Individuo(elite_genes)
-                elite_ind.adaptacion = poblacion[i].adaptacion
-                nueva_poblacion.append(elite_ind)
-            
-            # Cruce y Mutación
-            while len(nueva_poblacion) < TAMANO_POBLACION:
-                sample = random.sample(poblacion, TAMANO_TORNEO * 2)
-                p1 = min(sample[:TAMANO_TORNEO], key=lambda x: x.adaptacion)
-                p2 = min(sample[TAMANO_TORNEO:], key=lambda x: x.adaptacion)
-                
-                if random.random() < PROB_CRUCE:
-                    h1, h2 = cruce(p1, p2)
-                else:
-                    h1 = Individuo([f[:] for f in p1.genes])
-                    h2 = Individuo([f[:] for f in p2.genes])
-                
-                if random.random() < PROB_MUTACION: mutar(h1)
-                if random.random() < PROB_MUTACION: mutar(h2)
-                
-                calcular_adaptacion(h1)
-                calcular_adaptacion(h2)
-                
-                nueva_poblacion.append(h1)
-                if len(nueva_poblacion) < TAMANO_POBLACION:
-                    nueva_poblacion.append(h2)
-            
-            poblacion = nueva_poblacion
-            poblacion.sort(key=lambda x: x.adaptacion)
-            
-            if (gen + 1) % 50 == 0:
-                print(f" Gen {gen+1:3d} | Faltas: {poblacion[0].adaptacion}")
-
-        print(f" -> Intento {intento} fallido. Reiniciando...")
+        if ejecutar_intento(intento)["resuelto"]:
+            return
         intento += 1
 
-def imprimir_tablero(ind):
+def imprimir_tablero(tablero):
     print("Tablero Solución:")
-    for r in range(9):
-        if r % 3 == 0 and r > 0: print("-" * 21)
+    lado = len(tablero)
+    n = tamano_caja(lado)
+    ancho = len(str(lado))
+    for r in range(lado):
+        if r % n == 0 and r > 0: print("-" * ((ancho + 1) * (lado + n - 1) - 1))
         row_str = []
-        for c in range(9):
-            row_str.append(str(ind.genes[r][c]))
-            if (c + 1) % 3 == 0 and c < 8: row_str.append("|")
+        for c in range(lado):
+            row_str.append(str(tablero[r][c]).rjust(ancho))
+            if (c + 1) % n == 0 and c < lado - 1: row_str.append("|".rjust(ancho))
         print(" ".join(row_str))
 
 if __name__ == "__main__":
@@ -0,0 +1,148 @@
+import numpy as np
+
+# -------------------------------------------------------------------
+# DIVERSIDAD DE LA POBLACIÓN
+# -------------------------------------------------------------------
+# Medidas baratas de cuánto se parecen los individuos entre sí. Aceptan
+# un arreglo (N, lado, lado) o una lista de individuos (listas de filas).
+#   - únicos: genomas distintos (hash de sus bytes) / N;
+#   - entropía: entropía de Shannon del dígito de cada celda en la
+#     población, normalizada a [0, 1] y promediada sobre las celdas movibles;
+#   - dispersión: desviación estándar y rango de las aptitudes.
+#
+# MonitorDiversidad usa esas señales para cortar intentos atascados: solo
+# mide los genomas cuando el mejor lleva PACIENCIA generaciones sin mejorar
+# y, si la población colapsó, primero la resiembra en parte (se quedan los
+# mejores) y, agotadas las resiembras, pide reiniciar el intento.
+
+PACIENCIA = 20              # Generaciones sin mejorar el mejor antes de mirar la diversidad
+UMBRAL_UNICOS = 0.15        # Colapso: menos de este 15% de genomas distintos...
+UMBRAL_ENTROPIA = 0.10      # ...o entropía media por celda por debajo de esto
+FRACCION_RESIEMBRA = 0.5    # Peores individuos reemplazados por nuevos al resembrar
+MAX_RESIEMBRAS = 2          # Resiembras por intento antes de reiniciarlo
+
+SEGUIR = "seguir"
+RESEMBRAR = "resembrar"
+REINICIAR = "reiniciar"
+
+
+def como_planos(poblacion):
+    """Genomas como arreglo (N, lado²) uint8 contiguo."""
+    genomas = np.ascontiguousarray(np.asarray(poblacion, dtype=np.uint8))
+    return genomas.reshape(len(genomas), -1)
+
+
+def fraccion_unicos(poblacion):
+    """Genomas distintos / tamaño de la población (1.0 = todos distintos)."""
+    planos = como_planos(poblacion)
+    if len(planos) == 0:
+        return 0.0
+    return len({fila.tobytes() for fila in planos}) / len(planos)
+
+
+def entropia_por_celda(poblacion, celdas=None):
+    """
+    Entropía del dígito de cada celda sobre la población, dividida por
+    log(lado) (0 = todos iguales, 1 = uniforme). 'celdas' es una máscara
+    (lado²,) de las que cuentan (las movibles); devuelve el promedio.
+    """
+    planos = como_planos(poblacion)
+    n, num_celdas = planos.shape
+    lado = int(round(num_celdas ** 0.5))
+    # Conteo de cada dígito en cada celda con un solo bincount
+    desplazados = planos.astype(np.intp) + (lado + 1) * np.arange(num_celdas)
+    conteos = np.bincount(desplazados.ravel(), minlength=(lado + 1) * num_celdas)
+    p = conteos.reshape(num_celdas, lado + 1) / n
+    with np.errstate(divide="ignore", invalid="ignore"):
+        h = -np.where(p > 0, p * np.log(p), 0.0).sum(axis=1) / np.log(lado)
+    if celdas is not None:
+        h = h[celdas]
+    return float(h.mean()) if len(h) else 0.0
+
+
+def dispersion(aptitudes):
+    """(desviación estándar, máximo - mínimo) de las aptitudes."""
+    aptitudes = np.asarray(aptitudes, dtype=np.float64)
+    return float(aptitudes.std()), float(aptitudes.max() - aptitudes.min())
+
+
+def medir(poblacion, aptitudes, celdas=None):
+    """Todas las señales en un dict (para registrar o decidir)."""
+    desviacion, rango = dispersion(aptitudes)
+    return {"unicos": fraccion_unicos(poblacion),
+            "entropia": entropia_por_celda(poblacion, celdas),
+            "desviacion": desviacion, "rango": rango}
+
+
+def celdas_movibles(tablero):
+    """Máscara (lado²,) de las celdas vacías del tablero inicial."""
+    return np.asarray(tablero).reshape(-1) == 0
+
+
+def peores(aptitudes, cantidad):
+    """Índices de los 'cantidad' individuos con mayor error."""
+    aptitudes = np.asarray(aptitudes)
+    cantidad = min(cantidad, len(aptitudes))
+    if cantidad <= 0:
+        return np.empty(0, dtype=np.intp)
+    return np.argpartition(-aptitudes, cantidad - 1)[:cantidad]
+
+
+class MonitorDiversidad:
+    """
+    Lleva la cuenta de generaciones sin mejora y, cuando toca, mide la
+    diversidad. observar() devuelve SEGUIR, RESEMBRAR o REINICIAR;
+    'ultimo' guarda la última medición (vacía si aún no se midió).
+    """
+
+    def __init__(self, celdas=None, paciencia=PACIENCIA, umbral_unicos=UMBRAL_UNICOS,
+                 umbral_entropia=UMBRAL_ENTROPIA, max_resiembras=MAX_RESIEMBRAS):
+        self.celdas = celdas
+        self.paciencia = paciencia
+        self.umbral_unicos = umbral_unicos
+        self.umbral_entropia = umbral_entropia
+        self.max_resiembras = max_resiembras
+        self.mejor = None
+        self.sin_mejora = 0
+        self.resiembras = 0
+        self.ultimo = {}
+
+    def colapsada(self, medidas):
+        return (medidas["unicos"] <= self.umbral_unicos
+                or medidas["entropia"] <= self.umbral_entropia
+                or medidas["rango"] == 0)
+
+    def observar(self, aptitudes, poblacion):
+        """
+        'aptitudes': error total de cada individuo (a minimizar). 'poblacion'
+        puede ser una función sin argumentos que la devuelve: solo se llama
+        cuando toca medir (p. ej. para decodificar genomas de índices).
+        """
+        mejor = float(np.min(aptitudes))
+        if self.mejor is None or mejor < self.mejor:
+            self.mejor = mejor
+            self.sin_mejora = 0
+            return SEGUIR
+        self.sin_mejora += 1
+        if self.paciencia <= 0 or self.sin_mejora % self.paciencia:
+            return SEGUIR
+
+        if callable(poblacion):
+            poblacion = poblacion()
+        self.ultimo = medir(poblacion, aptitudes, self.celdas)
+        if not self.colapsada(self.ultimo):
+            return SEGUIR
+        if self.resiembras < self.max_resiembras:
+            self.resiembras += 1
+            self.sin_mejora = 0
+            return RESEMBRAR
+        return REINICIAR
+
+    def estado(self):
+        """Lo necesario para reanudar igual desde un punto de control (JSON)."""
+        return {"mejor": self.mejor, "sin_mejora": self.sin_mejora, "resiembras": self.resiembras}
+
+    def restaurar(self, estado):
+        self.mejor = estado["mejor"]
+        self.sin_mejora = estado["sin_mejora"]
+        self.resiembras = estado["resiembras"]
@@ -0,0 +1,65 @@
+from itertools import chain
+
+import numpy as np
+from geometria import popcount, tamano_caja
+
+# -------------------------------------------------------------------
+# EVALUADOR VECTORIZADO (COMPARTIDO POR LOS TRES SOLUCIONADORES)
+# -------------------------------------------------------------------
+# En lugar de puntuar un tablero a la vez con sets de Python, se recibe
+# la población completa como un arreglo (N, lado, lado) y se calculan los
+# errores de columnas y cajas de los N tableros en una sola llamada.
+# Cada unidad se resume en una máscara de bits (OR de 1 << dígito) y sus
+# errores son lado - popcount(máscara): vale igual para 9x9, 16x16 o 25x25.
+
+
+def a_arreglo(poblacion):
+    """Convierte una lista de tableros (listas de filas) a un arreglo (N, lado, lado) uint8."""
+    if len(poblacion) and isinstance(poblacion[0], list):
+        # Listas de listas de enteros (individuos DEAP): volcarlas a un
+        # bytearray es ~3 veces más rápido que recorrerlas con np.asarray
+        lado = len(poblacion[0])
+        planos = bytearray(chain.from_iterable(chain.from_iterable(poblacion)))
+        return np.frombuffer(planos, dtype=np.uint8).reshape(-1, lado, lado)
+    grids = np.asarray(poblacion, dtype=np.uint8)
+    lado = grids.shape[-1]
+    return grids.reshape(-1, lado, lado)
+
+
+def como_cajas(grids):
+    """Reordena (N, lado, lado) para que el eje 1 recorra las cajas y el eje 2 sus celdas."""
+    n_tableros, lado = grids.shape[0], grids.shape[-1]
+    n = tamano_caja(lado)
+    # (N, fila_caja, fila_int, col_caja, col_int) -> (N, caja, celda)
+    return grids.reshape(n_tableros, n, n, n, n).transpose(0, 1, 3, 2, 4).reshape(n_tableros, lado, lado)
+
+
+def _errores_por_unidad(unidades):
+    """
+    Recibe un arreglo (N, lado, lado) donde el último eje recorre las celdas
+    de cada unidad (columna o caja) y devuelve los errores (lado - distintos)
+    de cada tablero sumados sobre sus unidades.
+    """
+    lado = unidades.shape[-1]
+    bits = np.left_shift(np.uint64(1), unidades.astype(np.uint64))
+    mascaras = np.bitwise_or.reduce(bits, axis=2)
+    distintos = popcount(mascaras).sum(axis=1, dtype=np.int64)
+    return lado * lado - distintos
+
+
+def evaluar_poblacion(poblacion):
+    """
+    Evalúa N tableros de una vez.
+    Devuelve (errores_columnas, errores_cajas, total), cada uno de forma (N,).
+    """
+    grids = poblacion if isinstance(poblacion, np.ndarray) else a_arreglo(poblacion)
+
+    # 1. Columnas: trasponemos para que cada columna quede en el último eje
+    columnas = grids.transpose(0, 2, 1)
+
+    # 2. Cajas n x n
+    cajas = como_cajas(grids)
+
+    errores_columnas = _errores_por_unidad(columnas)
+    errores_cajas = _errores_por_unidad(cajas)
+    return errores_columnas, errores_cajas, errores_columnas + errores_cajas
@@ -0,0 +1,142 @@
+import atexit
+import os
+from multiprocessing import Pool, current_process, resource_tracker, shared_memory
+
+import numpy as np
+from evaluacion import evaluar_poblacion
+
+# -------------------------------------------------------------------
+# EVALUACIÓN EN UN POOL DE PROCESOS CON MEMORIA COMPARTIDA
+# -------------------------------------------------------------------
+# Un pool.map sobre los individuos serializa con pickle cada lista de
+# listas de ida y cada tupla de aptitud de vuelta, y para una evaluación tan
+# barata eso cuesta más que lo que se gana en paralelo. Aquí los genomas y
+# sus errores viven en dos bloques de multiprocessing.shared_memory:
+#   genomas    (capacidad, lado, lado) uint8
+#   aptitudes  (capacidad, 2) int64  (errores de columnas y de cajas)
+# El proceso principal copia el lote en 'genomas' y a cada trabajador solo
+# le llega (nombre del bloque, forma, inicio, fin): puntúa ese rango con
+# evaluacion.evaluar_poblacion y escribe en 'aptitudes' en el mismo lugar.
+# El pool se crea una vez y se reutiliza durante toda la corrida; si un lote
+# no cabe (o cambia el lado) se crean bloques nuevos y los trabajadores se
+# conectan a ellos por nombre en su siguiente tarea, sin reiniciar el pool.
+
+PROCESOS = os.cpu_count() or 1
+MIN_POR_TAREA = 64     # Genomas mínimos por rango; lotes menores se evalúan aquí mismo
+
+# -------------------------------------------------------------------
+# 1. LADO DEL TRABAJADOR
+# -------------------------------------------------------------------
+_CONECTADOS = {}   # Bloques abiertos en este trabajador: nombre -> SharedMemory
+
+
+def _vista(nombre, forma, tipo):
+    """Arreglo sobre el bloque 'nombre' (se conecta la primera vez que se usa)."""
+    bloque = _CONECTADOS.get(nombre)
+    if bloque is None:
+        bloque = _CONECTADOS[nombre] = shared_memory.SharedMemory(name=nombre)
+    return np.ndarray(forma, dtype=tipo, buffer=bloque.buf)
+
+
+def _evaluar_rango(tarea):
+    """Puntúa genomas[inicio:fin] y escribe sus errores en aptitudes[inicio:fin]."""
+    nombre_genomas, nombre_aptitudes, capacidad, lado, inicio, fin = tarea
+    _olvidar((nombre_genomas, nombre_aptitudes))
+    genomas = _vista(nombre_genomas, (capacidad, lado, lado), np.uint8)
+    aptitudes = _vista(nombre_aptitudes, (capacidad, 2), np.int64)
+    columnas, cajas, _ = evaluar_poblacion(genomas[inicio:fin])
+    aptitudes[inicio:fin, 0] = columnas
+    aptitudes[inicio:fin, 1] = cajas
+    return fin - inicio
+
+
+def _olvidar(vigentes):
+    """Cierra en el trabajador los bloques que el principal ya reemplazó."""
+    for nombre in list(_CONECTADOS):
+        if nombre not in vigentes:
+            _CONECTADOS.pop(nombre).close()
+
+# -------------------------------------------------------------------
+# 2. LADO DEL PROCESO PRINCIPAL
+# -------------------------------------------------------------------
+class EvaluadorCompartido:
+    """
+    Se usa como evaluacion.evaluar_poblacion: recibe (N, lado, lado) y
+    devuelve (errores_columnas, errores_cajas, total). Con 'procesos' <= 1,
+    o dentro de un trabajador de otro pool (lote, carreras, islas: no puede
+    tener hijos), no crea pool y evalúa en el mismo proceso. Cerrarlo (cerrar() o el
+    'with') termina el pool y libera la memoria; si no, se cierra al salir.
+    """
+
+    def __init__(self, procesos=PROCESOS, capacidad=0, lado=9):
+        self.procesos = procesos
+        # El rastreador de recursos debe existir antes del pool: así los
+        # trabajadores lo heredan y no creen, al terminar, que los bloques
+        # a los que se conectaron quedaron huérfanos
+        resource_tracker.ensure_running()
+        self.pool = Pool(processes=procesos) if procesos > 1 and not current_process().daemon else None
+        self._genomas = self._aptitudes = None
+        self.genomas = self.aptitudes = None
+        self.capacidad = 0
+        self.lado = lado
+        if capacidad and self.pool is not None:
+            self._reservar(capacidad, lado)
+        atexit.register(self.cerrar)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+    def _liberar_bloques(self):
+        # Las vistas numpy deben soltarse antes de cerrar los bloques
+        self.genomas = self.aptitudes = None
+        for bloque in (self._genomas, self._aptitudes):
+            if bloque is not None:
+                bloque.close()
+                bloque.unlink()
+        self._genomas = self._aptitudes = None
+        self.capacidad = 0
+
+    def _reservar(self, capacidad, lado):
+        """Bloques nuevos para 'capacidad' genomas de lado x lado."""
+        self._liberar_bloques()
+        self._genomas = shared_memory.SharedMemory(create=True, size=capacidad * lado * lado)
+        self._aptitudes = shared_memory.SharedMemory(create=True, size=capacidad * 2 * 8)
+        self.capacidad, self.lado = capacidad, lado
+        self.genomas = np.ndarray((capacidad, lado, lado), dtype=np.uint8, buffer=self._genomas.buf)
+        self.aptitudes = np.ndarray((capacidad, 2), dtype=np.int64, buffer=self._aptitudes.buf)
+
+    def rangos(self, n):
+        """(inicio, fin) contiguos, uno por proceso y de al menos MIN_POR_TAREA genomas."""
+        partes = max(1, min(self.procesos, n // MIN_POR_TAREA))
+        cortes = np.linspace(0, n, partes + 1).astype(int).tolist()
+        return list(zip(cortes[:-1], cortes[1:]))
+
+    def __call__(self, grids):
+        grids = np.asarray(grids, dtype=np.uint8)
+        n, lado = grids.shape[0], grids.shape[-1]
+        rangos = self.rangos(n)
+        if self.pool is None or len(rangos) == 1:
+            return evaluar_poblacion(grids)
+
+        if lado != self.lado:
+            self._reservar(n, lado)
+        elif n > self.capacidad:
+            self._reservar(max(n, 2 * self.capacidad), lado)
+        self.genomas[:n] = grids
+        tareas = [(self._genomas.name, self._aptitudes.name, self.capacidad, lado, inicio, fin)
+                  for inicio, fin in rangos]
+        self.pool.map(_evaluar_rango, tareas, chunksize=1)
+        columnas = self.aptitudes[:n, 0].copy()
+        cajas = self.aptitudes[:n, 1].copy()
+        return columnas, cajas, columnas + cajas
+
+    def cerrar(self):
+        if self.pool is not None:
+            self.pool.close()
+            self.pool.join()
+            self.pool = None
+        self._liberar_bloques()
+        atexit.unregister(self.cerrar)
@@ -0,0 +1,216 @@
+import numpy as np
+from azar import estados, flujos_desde_random, restaurar, sortear_cruces
+from cache_fitness import CacheAptitud
+from diversidad import (FRACCION_RESIEMBRA, REINICIAR, RESEMBRAR, MonitorDiversidad,
+                        celdas_movibles, peores)
+from genoma import PoblacionContigua
+from instrumentacion import NULO
+from operadores import cruzar_en_bloque
+from presolver import preparar_tablero
+from seleccion import indices_elite, torneos
+
+# -------------------------------------------------------------------
+# CICLO GENERACIONAL DE desde_cero Y por_filas
+# -------------------------------------------------------------------
+# Los dos corren el mismo algoritmo (elitismo, torneo, cruce uniforme por
+# filas, mutación, monitor de diversidad y puntos de control) y solo
+# cambia el genoma: desde_cero guarda el tablero (N, lado, lado) y
+# por_filas un índice por fila (N, lado) en las tablas de
+# filas_admisibles.py. Lo que depende del genoma vive en una Codificacion
+# y evolucionar() corre un intento con ella. El cruce es el mismo para
+# ambos: cruzar_en_bloque intercambia filas enteras, sean celdas o índices.
+#
+# La población va en un PoblacionContigua (doble búfer) y las aptitudes en
+# un arreglo aparte. Los puntos de control guardan tableros decodificados,
+# como los demás solucionadores.
+
+# Para los genomas sin caché de aptitud: mismas claves que una de capacidad 0
+SIN_CACHE = CacheAptitud(0).estadisticas()
+
+
+class Codificacion:
+    """
+    Lo que depende del genoma. Las subclases implementan aleatorios, evaluar
+    y mutar; por defecto el genoma es el propio tablero, no hay búsqueda
+    local ni caché. evaluar() suma a 'evaluaciones' los tableros puntuados.
+    Cada instancia guarda su tablero: cargar() lo presuelve (o no, según
+    'usar_presolver') y las subclases arman ahí lo que derivan de él.
+    """
+
+    evaluaciones = 0
+    tablero = None       # Tablero cargado (pre-resuelto); None = sin cargar
+    candidatos = None    # Máscaras de candidatos de sus celdas vacías
+
+    def cargar(self, tablero, usar_presolver=True):
+        """Cambia el tablero a resolver (LADO listas de LADO, 0 = vacío)."""
+        self.tablero, self.candidatos = preparar_tablero(tablero, usar_presolver)
+
+    def aleatorios(self, rng, n):
+        """'n' genomas nuevos sacados de 'rng'."""
+        raise NotImplementedError
+
+    def evaluar(self, genomas):
+        """Errores totales (int64) de los genomas."""
+        raise NotImplementedError
+
+    def mutar(self, rng, hijos, mutantes):
+        """En el lugar, sobre hijos[mutantes]."""
+        raise NotImplementedError
+
+    def decodificar(self, genomas):
+        """Tableros (N, lado, lado) de los genomas."""
+        return genomas
+
+    def codificar(self, tableros):
+        """Inversa de decodificar (para reanudar desde tableros guardados)."""
+        return tableros
+
+    def toca_mejorar(self, generacion):
+        return False
+
+    def mejorar(self, genomas, aptitudes, elite):
+        """Modo memético: búsqueda local en el lugar sobre la élite."""
+
+    def estadisticas_cache(self):
+        return SIN_CACHE
+
+
+def resultado(intento, resuelto, generacion, solucion=None, cancelado=False, cache=SIN_CACHE):
+    """Dict que devuelve ejecutar_intento en todos los solucionadores."""
+    return {"intento": intento, "resuelto": resuelto, "generacion": generacion,
+            "solucion": solucion, "cancelado": cancelado, "cache": cache}
+
+
+def evolucionar(intento, codificacion, tablero, tamano, max_generaciones, prob_cruce,
+                prob_mutacion, porcentaje_elitismo, tamano_torneo, usar_monitor=True,
+                elite_previa=None, elites_entre_reinicios=0, detener=None, medidor=None,
+                punto_control=None):
+    """
+    Corre un intento sobre 'tablero' (ya pre-resuelto y sin completar) y
+    devuelve el dict de resultado(). 'elite_previa' es la lista de genomas
+    que entran tal cual al empezar y donde quedan los mejores al fallar.
+    'detener', 'medidor' y 'punto_control' como en ejecutar_intento.
+    """
+    medidor = medidor or NULO
+    elite_previa = elite_previa if elite_previa is not None else []
+    # Subflujos independientes para la selección y para los operadores
+    rng_seleccion, rng_operadores = flujos = flujos_desde_random(2)
+    num_elite = max(1, int(tamano * porcentaje_elitismo))
+    num_hijos = tamano - num_elite
+    lado = len(tablero)
+    reanudado = punto_control.reanudar(intento) if punto_control is not None else None
+    with medidor.fase("inicializacion"):
+        if reanudado is None:
+            genomas = codificacion.aleatorios(rng_operadores, tamano)
+            # Los mejores del intento anterior (si se guardaron) entran tal cual
+            for i, genoma in enumerate(elite_previa[:tamano]):
+                genomas[i] = genoma
+        else:
+            genomas = codificacion.codificar(reanudado["genomas"])
+        poblacion = PoblacionContigua(tamano, genomas.shape[1:], genomas.dtype)
+        poblacion.actual[...] = genomas
+    monitor = MonitorDiversidad(celdas_movibles(tablero)) if usar_monitor else None
+    if reanudado is None:
+        gen_inicial = 0
+        with medidor.fase("evaluacion"):
+            aptitudes = codificacion.evaluar(poblacion.actual)
+    else:
+        # Se sigue desde el punto de control: mismos genomas, aptitudes y azar
+        gen_inicial = reanudado["generacion"]
+        aptitudes = reanudado["aptitudes"][:, 0].astype(np.int64)
+        restaurar(flujos, reanudado["extra"]["flujos"])
+        if monitor is not None and reanudado["extra"].get("monitor"):
+            monitor.restaurar(reanudado["extra"]["monitor"])
+        codificacion.evaluaciones = reanudado["evaluaciones"]
+        print(f" Reanudado en la generación {gen_inicial}")
+    with medidor.fase("ordenamiento"):
+        elite = indices_elite(aptitudes, num_elite)
+
+    generaciones = max_generaciones
+    for gen in range(gen_inicial, max_generaciones):
+        genomas = poblacion.actual
+        if aptitudes[elite[0]] == 0:
+            print(f"\n{'*'*50}")
+            print(f"¡SOLUCIÓN ENCONTRADA EN INTENTO {intento}, GEN {gen}!")
+            print(f"{'*'*50}")
+            solucion = codificacion.decodificar(genomas[elite[:1]])[0]
+            return resultado(intento, True, gen, solucion.tolist(),
+                             cache=codificacion.estadisticas_cache())
+
+        if detener is not None and detener.is_set():
+            return resultado(intento, False, gen, cancelado=True,
+                             cache=codificacion.estadisticas_cache())
+
+        if punto_control is not None and gen > gen_inicial and punto_control.toca(gen):
+            punto_control.guardar(intento, gen, codificacion.decodificar(genomas), aptitudes[:, None],
+                                  evaluaciones=codificacion.evaluaciones,
+                                  extra={"flujos": estados(flujos),
+                                         "monitor": monitor.estado() if monitor else None})
+
+        # Modo memético: la élite mejora antes de pasar a la siguiente generación
+        if codificacion.toca_mejorar(gen):
+            with medidor.fase("memetica"):
+                codificacion.mejorar(genomas, aptitudes, elite)
+                elite = indices_elite(aptitudes, num_elite)
+
+        # La nueva generación se escribe en el otro búfer
+        siguiente = poblacion.siguiente
+        aptitudes_siguiente = np.empty_like(aptitudes)
+        with medidor.fase("elitismo"):
+            siguiente[:num_elite] = genomas[elite]
+            aptitudes_siguiente[:num_elite] = aptitudes[elite]
+
+        # Todos los torneos de la generación en un solo sorteo (número par de padres)
+        with medidor.fase("seleccion"):
+            ganadores = torneos(aptitudes, num_hijos + num_hijos % 2, tamano_torneo, rng_seleccion)
+
+        # Cruce y mutación de toda la generación sobre el arreglo de genomas
+        # (el hijo sobrante de un número impar de hijos se descarta)
+        with medidor.fase("cruce"):
+            cruza, mascaras = sortear_cruces(rng_operadores, len(ganadores) // 2, lado, prob_cruce)
+            hijos, cambiados = cruzar_en_bloque(genomas[ganadores], cruza, mascaras)
+            hijos, cambiados = hijos[:num_hijos], cambiados[:num_hijos]
+        with medidor.fase("mutacion"):
+            mutantes = np.flatnonzero(rng_operadores.random(num_hijos) < prob_mutacion)
+            codificacion.mutar(rng_operadores, hijos, mutantes)
+            cambiados[mutantes] = True
+
+        # Los hijos que salieron iguales a su padre heredan su aptitud; el
+        # resto se evalúa en un solo lote
+        with medidor.fase("evaluacion"):
+            aptitudes_hijos = aptitudes[ganadores[:num_hijos]]
+            pendientes = np.flatnonzero(cambiados)
+            aptitudes_hijos[pendientes] = codificacion.evaluar(hijos[pendientes])
+            siguiente[num_elite:] = hijos
+            aptitudes_siguiente[num_elite:] = aptitudes_hijos
+        poblacion.intercambiar()
+        genomas, aptitudes = poblacion.actual, aptitudes_siguiente
+        with medidor.fase("ordenamiento"):
+            elite = indices_elite(aptitudes, num_elite)
+        medidor.fin_generacion(intento=intento, generacion=gen + 1, mejor=int(aptitudes[elite[0]]),
+                               poblacion=genomas)
+
+        if (gen + 1) % 50 == 0:
+            print(f" Gen {gen+1:3d} | Faltas: {aptitudes[elite[0]]}")
+
+        # Población colapsada y sin mejora: resembrar la mitad peor o cortar el intento
+        if monitor is not None:
+            with medidor.fase("diversidad"):
+                # Los tableros solo se decodifican si el monitor mide de verdad
+                accion = monitor.observar(aptitudes, lambda: codificacion.decodificar(genomas))
+            if accion == RESEMBRAR:
+                with medidor.fase("inicializacion"):
+                    nuevos = peores(aptitudes, int(tamano * FRACCION_RESIEMBRA))
+                    genomas[nuevos] = codificacion.aleatorios(rng_operadores, len(nuevos))
+                    aptitudes[nuevos] = codificacion.evaluar(genomas[nuevos])
+                    elite = indices_elite(aptitudes, num_elite)
+            elif accion == REINICIAR:
+                print(f" Gen {gen+1:3d} | Población colapsada "
+                      f"({monitor.ultimo['unicos']:.0%} genomas distintos). Reinicio anticipado.")
+                generaciones = gen + 1
+                break
+
+    genomas = poblacion.actual
+    elite_previa[:] = list(genomas[indices_elite(aptitudes, elites_entre_reinicios)])
+    print(f" -> Intento {intento} fallido. Reiniciando...")
+    return resultado(intento, False, generaciones, cache=codificacion.estadisticas_cache())
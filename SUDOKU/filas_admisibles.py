@@ -0,0 +1,192 @@
+import math
+
+import numpy as np
+from geometria import popcount, tamano_caja
+
+# -------------------------------------------------------------------
+# TABLAS DE FILAS ADMISIBLES (UN ÍNDICE POR FILA COMO GENOMA)
+# -------------------------------------------------------------------
+# Cada fila de una solución es una permutación de 1..lado que respeta sus
+# pistas y, celda por celda, los candidatos que dejan las pistas de su
+# columna y de su caja. Para el tablero cargado se enumeran una sola vez
+# todas esas filas (TablaFilas) y después se podan entre sí: si en todas
+# las opciones de una fila el dígito d cae en la misma columna (o en la
+# misma caja), ninguna otra fila puede ponerlo ahí, y así hasta que no
+# cambie nada.
+#
+# Un individuo pasa a ser un vector de 'lado' enteros: el índice de la
+# opción elegida en cada fila. Cada opción trae precalculada su máscara de
+# pares (columna, dígito) y (caja, dígito) en bits de uint64; el OR de las
+# máscaras de las 'lado' filas dice qué pares aparecen y los que faltan
+# son justo las faltas de columnas y de cajas (cada columna y cada caja
+# tiene 'lado' celdas: un dígito ausente es un repetido). Puntuar es
+# indexar, hacer un OR y un popcount.
+
+LIMITE_OPCIONES = 200_000   # Opciones (o filas parciales) por fila antes de rendirse
+
+
+class DemasiadasOpciones(ValueError):
+    """Una fila pasa de LIMITE_OPCIONES: el tablero es demasiado abierto para tablas."""
+
+
+def opciones_fila(fila, candidatos_fila):
+    """
+    Todas las permutaciones admisibles de 'fila' (0 = vacía) como arreglo
+    (K, lado) uint8, en orden lexicográfico: pistas en su lugar y cada
+    celda vacía con uno de sus candidatos.
+    """
+    lado = len(fila)
+    digitos = np.arange(1, lado + 1)
+    vacias = [c for c in range(lado) if fila[c] == 0]
+    parciales = np.zeros((1, len(vacias)), dtype=np.uint8)
+    libres = np.array([sum(1 << d for d in range(1, lado + 1) if d not in fila)], dtype=np.int64)
+    for i, c in enumerate(vacias):
+        # Cada fila parcial se abre en una por dígito libre y candidato
+        permitidos = (((libres & candidatos_fila[c])[:, None] >> digitos) & 1).astype(bool)
+        origen, posicion = np.nonzero(permitidos)
+        if len(origen) > LIMITE_OPCIONES:
+            raise DemasiadasOpciones(f"Más de {LIMITE_OPCIONES} filas admisibles: tablero demasiado abierto")
+        parciales = parciales[origen]
+        parciales[:, i] = digitos[posicion]
+        libres = libres[origen] & ~np.left_shift(1, digitos[posicion])
+    opciones = np.tile(np.asarray(fila, dtype=np.uint8), (len(parciales), 1))
+    opciones[:, vacias] = parciales
+    return opciones
+
+
+def podar(opciones):
+    """
+    Quita de cada fila las opciones que chocan con lo que otra fila ya fija
+    en todas sus opciones: un dígito siempre en la misma columna (nadie más
+    lo pone en esa columna ni en su caja) o siempre en la misma caja (nadie
+    más de la banda lo pone en esa caja). Repite hasta que no cambie nada;
+    una fila sin opciones significa que el tablero no tiene solución.
+    """
+    lado = len(opciones)
+    n = tamano_caja(lado)
+    cajas_columna = np.arange(lado) // n
+    opciones = list(opciones)
+    cambio = True
+    while cambio:
+        cambio = False
+        for r in range(lado):
+            for d in range(1, lado + 1):
+                columnas = np.flatnonzero((opciones[r] == d).any(axis=0))
+                cajas = np.unique(cajas_columna[columnas])
+                if len(cajas) != 1:
+                    continue
+                caja = slice(cajas[0] * n, cajas[0] * n + n)
+                for otra in range(lado):
+                    if otra == r:
+                        continue
+                    if otra // n == r // n:
+                        choca = (opciones[otra][:, caja] == d).any(axis=1)
+                    elif len(columnas) == 1:
+                        choca = opciones[otra][:, columnas[0]] == d
+                    else:
+                        continue
+                    if choca.any():
+                        opciones[otra] = opciones[otra][~choca]
+                        cambio = True
+                        if len(opciones[otra]) == 0:
+                            raise ValueError(f"La fila {otra} se quedó sin opciones: el tablero no tiene solución")
+    return opciones
+
+
+def _mascaras(filas, numero_fila, lado):
+    """Bits (columna, dígito) y (caja, dígito) de cada opción, en palabras uint64."""
+    n = tamano_caja(lado)
+    palabras = -(-2 * lado * lado // 64)
+    mascaras = np.zeros((len(filas), palabras), dtype=np.uint64)
+    todas = np.arange(len(filas))
+    digito = filas.astype(np.int64) - 1
+    for c in range(lado):
+        caja = (numero_fila // n) * n + c // n
+        for bit in (c * lado + digito[:, c], lado * lado + caja * lado + digito[:, c]):
+            mascaras[todas, bit // 64] |= np.left_shift(np.uint64(1), (bit % 64).astype(np.uint64))
+    return mascaras
+
+
+def _bits_rango(inicio, fin, palabras):
+    """Máscara con los bits [inicio, fin) encendidos, repartida en 'palabras' uint64."""
+    bits = ((1 << fin) - 1) ^ ((1 << inicio) - 1)
+    return np.array([(bits >> (64 * i)) & 0xFFFFFFFFFFFFFFFF for i in range(palabras)], dtype=np.uint64)
+
+
+class TablaFilas:
+    """
+    Opciones admisibles de cada fila de un tablero y sus máscaras. Un
+    genoma (N, lado) guarda en la columna r un índice en [0, tamanos[r]).
+    """
+
+    def __init__(self, tablero, candidatos, podar_filas=True):
+        lado = self.lado = len(tablero)
+        opciones = [opciones_fila(tablero[r], candidatos[r]) for r in range(lado)]
+        if any(len(o) == 0 for o in opciones):
+            raise ValueError("Hay una fila sin opciones: el tablero no tiene solución")
+        if podar_filas:
+            opciones = podar(opciones)
+        self.tamanos = np.array([len(o) for o in opciones], dtype=np.int64)
+        self.desplazamientos = np.concatenate([[0], np.cumsum(self.tamanos)[:-1]])
+        self.filas = np.concatenate(opciones)                       # (total, lado) uint8
+        numero_fila = np.repeat(np.arange(lado), self.tamanos)
+        self.mascaras = _mascaras(self.filas, numero_fila, lado)   # (total, palabras) uint64
+        palabras = self.mascaras.shape[1]
+        self.bits_columnas = _bits_rango(0, lado * lado, palabras)
+        self.bits_cajas = _bits_rango(lado * lado, 2 * lado * lado, palabras)
+        self.tipo = np.uint8 if self.tamanos.max() <= 256 else (
+            np.uint16 if self.tamanos.max() <= 65536 else np.int32)
+        self.variables = np.flatnonzero(self.tamanos > 1)           # Filas con más de una opción
+        self._por_fila = None
+
+    def espacio(self):
+        """log10 del número de genomas posibles (producto de los tamaños)."""
+        return float(np.log10(self.tamanos.astype(np.float64)).sum())
+
+    # --- genomas ---
+    def _globales(self, genomas):
+        return np.asarray(genomas, dtype=np.intp) + self.desplazamientos
+
+    def aleatorios(self, rng, n):
+        """'n' genomas (n, lado) con una opción uniforme por fila."""
+        return (rng.random((n, self.lado)) * self.tamanos).astype(self.tipo)
+
+    def decodificar(self, genomas):
+        """Tableros (N, lado, lado) uint8 de genomas (N, lado) de índices."""
+        return self.filas[self._globales(genomas)]
+
+    def codificar(self, tableros):
+        """Inversa de decodificar (para reanudar desde tableros guardados)."""
+        if self._por_fila is None:
+            self._por_fila = [{fila.tobytes(): i for i, fila in enumerate(self.filas[inicio:inicio + k])}
+                              for inicio, k in zip(self.desplazamientos.tolist(), self.tamanos.tolist())]
+        tableros = np.asarray(tableros, dtype=np.uint8)
+        return np.array([[self._por_fila[r][t[r].tobytes()] for r in range(self.lado)] for t in tableros],
+                        dtype=self.tipo).reshape(len(tableros), self.lado)
+
+    # --- aptitud ---
+    def faltas(self, genomas):
+        """(errores_columnas, errores_cajas, total) de genomas (N, lado), por tabla."""
+        presentes = np.bitwise_or.reduce(self.mascaras[self._globales(genomas)], axis=1)
+        pares = self.lado * self.lado
+        columnas = pares - popcount(presentes & self.bits_columnas).sum(axis=1, dtype=np.int64)
+        cajas = pares - popcount(presentes & self.bits_cajas).sum(axis=1, dtype=np.int64)
+        return columnas, cajas, columnas + cajas
+
+    # --- mutación ---
+    def redibujar(self, rng, genomas, mutantes, cambios=1):
+        """
+        En el lugar: cada genomas[mutantes[i]] recibe 'cambios' filas al azar
+        (de las que tienen más de una opción) con una opción nueva uniforme.
+        """
+        if len(mutantes) == 0 or len(self.variables) == 0:
+            return
+        cantidad = len(mutantes) * cambios
+        filas = self.variables[(rng.random(cantidad) * len(self.variables)).astype(np.intp)]
+        nuevos = (rng.random(cantidad) * self.tamanos[filas]).astype(self.tipo)
+        genomas[np.repeat(mutantes, cambios), filas] = nuevos
+
+
+def espacio_permutaciones(tablero):
+    """log10 de las combinaciones con el genoma de permutaciones (sin tablas)."""
+    return sum(math.log10(math.factorial(sum(1 for v in fila if v == 0))) for fila in tablero)
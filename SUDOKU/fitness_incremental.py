@@ -0,0 +1,115 @@
+import numpy as np
+from geometria import caja_de
+
+# -------------------------------------------------------------------
+# APTITUD INCREMENTAL (DELTA) PARA MUTACIONES POR INTERCAMBIO
+# -------------------------------------------------------------------
+# Todas las mutaciones intercambian dos celdas movibles de una misma fila,
+# así que las filas nunca se rompen y solo cambian 2 columnas y, como
+# mucho, 2 cajas. Con el conteo de dígitos por unidad basta mirar 4
+# contadores para saber cómo cambia el número de errores: O(1) por swap,
+# sea cual sea el lado del tablero.
+
+
+class TablaConflictos:
+    """Conteo de dígitos por columna y por caja de un tablero, con sus errores."""
+
+    __slots__ = ("columnas", "cajas", "errores_columnas", "errores_cajas", "caja_de")
+
+    def __init__(self, columnas, cajas, errores_columnas, errores_cajas, caja_de_celda):
+        self.columnas = columnas    # columnas[c][d] = veces que aparece d en la columna c
+        self.cajas = cajas          # cajas[b][d] = veces que aparece d en la caja b
+        self.errores_columnas = errores_columnas
+        self.errores_cajas = errores_cajas
+        self.caja_de = caja_de_celda  # caja_de(lado) del tablero (ver geometria.caja_de)
+
+    @classmethod
+    def desde_tablero(cls, grid):
+        if isinstance(grid, np.ndarray):
+            grid = grid.tolist()
+        lado = len(grid)
+        cajas_de = caja_de(lado)
+        columnas = [[0] * (lado + 1) for _ in range(lado)]
+        cajas = [[0] * (lado + 1) for _ in range(lado)]
+        for r in range(lado):
+            fila = grid[r]
+            cajas_fila = cajas_de[r]
+            for c in range(lado):
+                v = fila[c]
+                columnas[c][v] += 1
+                cajas[cajas_fila[c]][v] += 1
+        return cls(columnas, cajas, _errores(columnas), _errores(cajas), cajas_de)
+
+    @property
+    def errores(self):
+        return self.errores_columnas + self.errores_cajas
+
+    def copiar(self):
+        return TablaConflictos([c[:] for c in self.columnas], [b[:] for b in self.cajas],
+                               self.errores_columnas, self.errores_cajas, self.caja_de)
+
+    def __deepcopy__(self, memo):
+        return self.copiar()
+
+    def delta_intercambio(self, grid, r, c1, c2):
+        """
+        ¿Qué pasaría si intercambiamos grid[r][c1] y grid[r][c2]?
+        Devuelve (delta_columnas, delta_cajas) sin modificar nada.
+        """
+        fila = grid[r]
+        a = fila[c1]
+        b = fila[c2]
+        if a == b:
+            return 0, 0
+
+        # En c1 sale 'a' y entra 'b'; en c2 al revés.
+        # Salir deja un hueco si era el único; entrar lo tapa si no estaba.
+        col1 = self.columnas[c1]
+        col2 = self.columnas[c2]
+        delta_col = (col1[a] == 1) - (col1[b] == 0) + (col2[b] == 1) - (col2[a] == 0)
+
+        b1 = self.caja_de[r][c1]
+        b2 = self.caja_de[r][c2]
+        if b1 == b2:
+            return delta_col, 0
+        caja1 = self.cajas[b1]
+        caja2 = self.cajas[b2]
+        delta_caja = (caja1[a] == 1) - (caja1[b] == 0) + (caja2[b] == 1) - (caja2[a] == 0)
+        return delta_col, delta_caja
+
+    def aplicar_intercambio(self, grid, r, c1, c2):
+        """Hace el swap en grid, actualiza los conteos y devuelve el delta del total."""
+        delta_col, delta_caja = self.delta_intercambio(grid, r, c1, c2)
+        fila = grid[r]
+        a = fila[c1]
+        b = fila[c2]
+        fila[c1], fila[c2] = b, a
+        if a == b:
+            return 0
+
+        col1 = self.columnas[c1]
+        col2 = self.columnas[c2]
+        col1[a] -= 1
+        col1[b] += 1
+        col2[b] -= 1
+        col2[a] += 1
+
+        b1 = self.caja_de[r][c1]
+        b2 = self.caja_de[r][c2]
+        if b1 != b2:
+            caja1 = self.cajas[b1]
+            caja2 = self.cajas[b2]
+            caja1[a] -= 1
+            caja1[b] += 1
+            caja2[b] -= 1
+            caja2[a] += 1
+
+        self.errores_columnas += delta_col
+        self.errores_cajas += delta_caja
+        return delta_col + delta_caja
+
+
+def _errores(conteos):
+    # Errores de una unidad = lado - distintos = dígitos que no aparecen
+    return sum(conteo[1:].count(0) for conteo in conteos)
+
@@ -0,0 +1,64 @@
+import numpy as np
+
+# -------------------------------------------------------------------
+# ALMACENAMIENTO COMPACTO Y CONTIGUO DE LA POBLACIÓN
+# -------------------------------------------------------------------
+# Cada genoma ocupa lado² bytes (uint8; 81 en un 9x9) dentro de un único bloque
+# preasignado para toda la población. Hay dos búferes: la generación
+# actual se lee de uno y la siguiente se escribe en el otro; al terminar
+# la generación solo se intercambia el índice. Así no se crean ~10k
+# listas pequeñas por generación ni se hace deepcopy de cada hijo.
+
+
+class PoblacionContigua:
+    """
+    Población de 'tamano' genomas de forma 'forma' en un bloque (2, tamano, *forma):
+    (lado, lado) uint8 para el genoma por celdas, (lado,) para el de índices
+    de fila (por_filas).
+    """
+
+    def __init__(self, tamano, forma=(9, 9), dtype=np.uint8):
+        self.tamano = tamano
+        self.buffers = np.zeros((2, tamano, *forma), dtype=dtype)
+        self.indice = 0
+
+    @property
+    def actual(self):
+        """Genomas de la generación actual, forma (tamano, *forma)."""
+        return self.buffers[self.indice]
+
+    @property
+    def siguiente(self):
+        """Búfer donde se escribe la próxima generación, forma (tamano, *forma)."""
+        return self.buffers[1 - self.indice]
+
+    def intercambiar(self):
+        """La generación recién escrita pasa a ser la actual."""
+        self.indice = 1 - self.indice
+
+
+def clonar_rapido(ind):
+    """
+    Sustituto de toolbox.clone (deepcopy) para individuos DEAP (listas de filas):
+    copia las filas, los valores de aptitud y la tabla de conflictos.
+    """
+    copia = type(ind)(fila[:] for fila in ind)
+    copia.fitness.wvalues = ind.fitness.wvalues
+    if ind.tabla is not None:
+        copia.tabla = ind.tabla.copiar()
+    return copia
+
+
+def individuos_desde_arreglo(clase_individuo, genomas, aptitudes):
+    """
+    Reconstruye individuos DEAP desde un arreglo (N, lado, lado) y sus aptitudes
+    (N, objetivos), p. ej. al reanudar desde un punto de control.
+    """
+    # wvalues (aptitud por pesos) se calcula en bloque en vez de individuo a individuo
+    pesos = np.asarray(clase_individuo.fitness.weights)
+    individuos = []
+    for genoma, valores in zip(genomas.tolist(), (np.asarray(aptitudes) * pesos).tolist()):
+        ind = clase_individuo(genoma)
+        ind.fitness.wvalues = tuple(valores)
+        individuos.append(ind)
+    return individuos
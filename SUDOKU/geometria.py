@@ -0,0 +1,64 @@
+import math
+from functools import lru_cache
+
+import numpy as np
+
+# -------------------------------------------------------------------
+# GEOMETRÍA DE UN TABLERO n² x n²
+# -------------------------------------------------------------------
+# Todo lo que antes era 9 (lado), 3 (caja) o (0, 3, 6) sale de aquí a
+# partir del lado del tablero: 9x9 (n=3), 16x16 (n=4), 25x25 (n=5)...
+# Las tablas se calculan una vez por lado y se reutilizan.
+#
+# Los conflictos se cuentan con máscaras de ocupación: cada unidad (fila,
+# columna o caja) acumula con OR el bit 1 << dígito de sus celdas y sus
+# errores son lado - popcount(máscara). Sin sets ni ordenamientos, el costo
+# crece linealmente con el número de celdas.
+
+
+def tamano_caja(lado):
+    """n tal que lado = n²; error si el lado no es un cuadrado perfecto."""
+    n = math.isqrt(lado)
+    if n < 2 or n * n != lado:
+        raise ValueError(f"El lado {lado} no es n² con n >= 2")
+    return n
+
+
+def digitos(lado):
+    """Máscara con los bits 1..lado encendidos (todos los dígitos posibles)."""
+    return ((1 << lado) - 1) << 1
+
+
+@lru_cache(maxsize=None)
+def caja_de(lado):
+    """caja_de(lado)[r][c] = índice de la caja de la celda (r, c)."""
+    n = tamano_caja(lado)
+    return tuple(tuple((r // n) * n + c // n for c in range(lado)) for r in range(lado))
+
+
+@lru_cache(maxsize=None)
+def unidades(lado):
+    """Las 3·lado unidades (filas, columnas, cajas) como tuplas de (r, c)."""
+    n = tamano_caja(lado)
+    filas = [tuple((r, c) for c in range(lado)) for r in range(lado)]
+    columnas = [tuple((r, c) for r in range(lado)) for c in range(lado)]
+    cajas = [tuple((br + i, bc + j) for i in range(n) for j in range(n))
+             for br in range(0, lado, n) for bc in range(0, lado, n)]
+    return tuple(filas + columnas + cajas)
+
+
+# -------------------------------------------------------------------
+# POPCOUNT VECTORIZADO
+# -------------------------------------------------------------------
+if hasattr(np, "bitwise_count"):
+    popcount = np.bitwise_count
+else:
+    # numpy < 2.0: tabla de 16 bits
+    _BITS16 = np.array([bin(i).count("1") for i in range(1 << 16)], dtype=np.uint8)
+
+    def popcount(mascaras):
+        mascaras = np.asarray(mascaras, dtype=np.uint64)
+        total = np.zeros(mascaras.shape, dtype=np.uint8)
+        for desplazamiento in (0, 16, 32, 48):
+            total += _BITS16[(mascaras >> np.uint64(desplazamiento)) & np.uint64(0xFFFF)]
+        return total
@@ -0,0 +1,157 @@
+import argparse
+import contextlib
+import csv
+import json
+import sys
+import time
+
+# -------------------------------------------------------------------
+# INSTRUMENTACIÓN POR FASES DEL CICLO EVOLUTIVO
+# -------------------------------------------------------------------
+# Los bucles generacionales reciben un 'medidor'. Con MedidorFases se
+# acumulan los segundos de cada fase (por generación y en total), se
+# avisa a un callback y se exporta una fila por generación en JSON lines
+# o CSV. Con NULO (el valor por defecto) las fases no miden nada: el
+# costo es un 'with' sobre un contexto vacío o un 'if' por operación.
+#
+# fin_generacion recibe además la población recién creada ('poblacion':
+# arreglo (N, lado, lado) o lista de individuos). Aquí no se usa ni se
+# exporta; la aprovechan otros medidores (p. ej. progreso.py para medir
+# la diversidad) y pasar la referencia no cuesta nada.
+
+FASES = ("inicializacion", "elitismo", "seleccion", "clonacion", "cruce",
+         "mutacion", "evaluacion", "ordenamiento", "seleccion_nsga3", "memetica", "diversidad")
+
+reloj = time.perf_counter
+
+
+class _Cronometro:
+    __slots__ = ("medidor", "nombre", "inicio")
+
+    def __init__(self, medidor, nombre):
+        self.medidor = medidor
+        self.nombre = nombre
+
+    def __enter__(self):
+        self.inicio = reloj()
+        return self
+
+    def __exit__(self, *exc):
+        self.medidor.sumar(self.nombre, reloj() - self.inicio)
+        return False
+
+
+class MedidorFases:
+    """
+    Tiempos por fase. 'callback(fila)' recibe un dict por generación;
+    'salida' (archivo abierto) recibe la misma fila en 'jsonl' o 'csv'.
+    'etiquetas' se copian en cada fila (p. ej. {"solucionador": "con_deap"}).
+    """
+
+    activo = True
+
+    def __init__(self, callback=None, salida=None, formato="jsonl", etiquetas=None):
+        if formato not in ("jsonl", "csv"):
+            raise ValueError(f"Formato desconocido: {formato!r}")
+        self.callback = callback
+        self.salida = salida
+        self.formato = formato
+        self.etiquetas = dict(etiquetas or {})
+        self.totales = dict.fromkeys(FASES, 0.0)
+        self.generaciones = 0
+        self._actual = dict.fromkeys(FASES, 0.0)
+        self._escritor_csv = None
+
+    def fase(self, nombre):
+        return _Cronometro(self, nombre)
+
+    def sumar(self, nombre, segundos):
+        self._actual[nombre] = self._actual.get(nombre, 0.0) + segundos
+
+    def fin_generacion(self, poblacion=None, **contexto):
+        """Cierra la generación: acumula, avisa al callback y exporta la fila."""
+        fila = dict(self.etiquetas)
+        fila.update(contexto)
+        fila.update(self._actual)
+        fila["total"] = sum(self._actual.values())
+
+        for nombre, segundos in self._actual.items():
+            self.totales[nombre] = self.totales.get(nombre, 0.0) + segundos
+        self._actual = dict.fromkeys(FASES, 0.0)
+        self.generaciones += 1
+
+        if self.callback is not None:
+            self.callback(fila)
+        if self.salida is not None:
+            self._exportar(fila)
+
+    def _exportar(self, fila):
+        if self.formato == "jsonl":
+            self.salida.write(json.dumps(fila, ensure_ascii=False) + "\n")
+            return
+        if self._escritor_csv is None:
+            self._escritor_csv = csv.DictWriter(self.salida, fieldnames=list(fila),
+                                                restval="", extrasaction="ignore")
+            self._escritor_csv.writeheader()
+        self._escritor_csv.writerow(fila)
+
+    def resumen(self):
+        """Totales acumulados por fase, más el total y las generaciones medidas."""
+        return {"generaciones": self.generaciones, "fases": dict(self.totales),
+                "total": sum(self.totales.values())}
+
+
+class MedidorNulo:
+    """Medidor apagado: misma interfaz, ningún trabajo."""
+
+    activo = False
+    _nada = contextlib.nullcontext()
+
+    def fase(self, nombre):
+        return self._nada
+
+    def sumar(self, nombre, segundos):
+        pass
+
+    def fin_generacion(self, poblacion=None, **contexto):
+        pass
+
+    def resumen(self):
+        return None
+
+
+NULO = MedidorNulo()
+
+
+def main():
+    from resolucion import SOLUCIONADORES, parsear_tablero, resolver
+
+    parser = argparse.ArgumentParser(description="Corre un solucionador midiendo el tiempo de cada fase")
+    parser.add_argument("solucionador", choices=SOLUCIONADORES)
+    parser.add_argument("-t", "--tablero", default=None, help="Tablero n²×n²: un carácter por celda ('0' o '.' = vacía, A = 10, B = 11...) o enteros separados; por defecto el del módulo")
+    parser.add_argument("-o", "--salida", default="-", help="Archivo de filas por generación ('-' = stdout)")
+    parser.add_argument("-f", "--formato", choices=("jsonl", "csv"), default="jsonl")
+    parser.add_argument("--intentos", type=int, default=1)
+    parser.add_argument("--semilla", type=int, default=None)
+    args = parser.parse_args()
+
+    salida = sys.stdout if args.salida == "-" else open(args.salida, "w", encoding="utf-8", newline="")
+    medidor = MedidorFases(salida=salida, formato=args.formato,
+                           etiquetas={"solucionador": args.solucionador})
+    try:
+        # Los avisos del solucionador van a stderr: stdout puede ser el flujo de filas
+        with contextlib.redirect_stdout(sys.stderr):
+            tablero = parsear_tablero(args.tablero) if args.tablero else None
+            resolver(args.solucionador, tablero, semilla=args.semilla, max_intentos=args.intentos, medidor=medidor)
+    finally:
+        if salida is not sys.stdout:
+            salida.close()
+
+    resumen = medidor.resumen()
+    print(f"\nTiempo por fase ({resumen['generaciones']} generaciones):", file=sys.stderr)
+    for nombre, segundos in sorted(resumen["fases"].items(), key=lambda x: -x[1]):
+        if segundos:
+            print(f"  {nombre:16s} {segundos:8.3f}s  {segundos / resumen['total']:6.1%}", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+import argparse
+import importlib
+import os
+import random
+import time
+from multiprocessing import Pool
+
+from azar import semilla_derivada
+from resolucion import parsear_tablero
+
+# -------------------------------------------------------------------
+# 1. PARÁMETROS DEL MODELO DE ISLAS
+# -------------------------------------------------------------------
+NUM_ISLAS = os.cpu_count() or 1   # Una subpoblación por núcleo
+INTERVALO_MIGRACION = 10          # Generaciones entre migraciones (M)
+NUM_MIGRANTES = 5                 # Mejores individuos que viajan en cada migración
+TOPOLOGIA = "anillo"              # "anillo" o "aleatoria"
+MAX_EPOCAS = 60                   # Épocas de M generaciones antes de rendirse
+
+# Solucionadores que exponen evolucionar_isla(genomas, generaciones, semilla, generacion_inicial)
+SOLUCIONADORES = ("con_deap", "NSGAIII")
+
+# -------------------------------------------------------------------
+# 2. TRABAJADOR (UNA ISLA DURANTE UNA ÉPOCA)
+# -------------------------------------------------------------------
+def _inicializar(nombre_modulo, tablero):
+    # Cada trabajador carga el tablero una vez (presolver incluido), no por época
+    if tablero is not None:
+        importlib.import_module(nombre_modulo).cargar_tablero(tablero)
+
+
+def _correr_epoca(args):
+    nombre_modulo, genomas, generaciones, semilla, generacion_inicial = args
+    modulo = importlib.import_module(nombre_modulo)
+    return modulo.evolucionar_isla(genomas, generaciones, semilla, generacion_inicial)
+
+# -------------------------------------------------------------------
+# 3. MIGRACIÓN
+# -------------------------------------------------------------------
+def destinos_migracion(num_islas, topologia, rng):
+    """Para cada isla origen i devuelve la isla destino de sus migrantes."""
+    if num_islas < 2:
+        return []
+    if topologia == "anillo":
+        return [(i + 1) % num_islas for i in range(num_islas)]
+    if topologia == "aleatoria":
+        destinos = []
+        for i in range(num_islas):
+            otras = [j for j in range(num_islas) if j != i]
+            destinos.append(rng.choice(otras))
+        return destinos
+    raise ValueError(f"Topología desconocida: {topologia!r}")
+
+
+def migrar(islas, num_migrantes, topologia, rng):
+    """
+    'islas' es una lista de (genomas, errores) ordenados de mejor a peor.
+    Los mejores de cada origen reemplazan a los peores de su destino.
+    """
+    destinos = destinos_migracion(len(islas), topologia, rng)
+    # Se copian antes de tocar nada para que la migración sea simultánea
+    migrantes = [[[fila[:] for fila in g] for g in genomas[:num_migrantes]]
+                 for genomas, _ in islas]
+    for origen, destino in enumerate(destinos):
+        genomas, _ = islas[destino]
+        genomas[len(genomas) - len(migrantes[origen]):] = migrantes[origen]
+
+# -------------------------------------------------------------------
+# 4. BUCLE PRINCIPAL
+# -------------------------------------------------------------------
+def ejecutar_islas(nombre_modulo="con_deap", num_islas=NUM_ISLAS,
+                   intervalo_migracion=INTERVALO_MIGRACION, num_migrantes=NUM_MIGRANTES,
+                   topologia=TOPOLOGIA, max_epocas=MAX_EPOCAS, semilla=None, tablero=None):
+    """
+    Corre K islas en un pool de procesos (uno por núcleo) sobre 'tablero'
+    (lado listas de lado; None = el del módulo) y migra cada
+    'intervalo_migracion' generaciones. Devuelve (solucion, generaciones)
+    o (None, generaciones) si se agotan las épocas.
+    """
+    if nombre_modulo not in SOLUCIONADORES:
+        raise ValueError(f"Solucionador sin modo islas: {nombre_modulo!r}")
+
+    rng = random.Random(semilla)
+    islas = [(None, None)] * num_islas
+    generaciones = 0
+    inicio = time.time()
+
+    with Pool(processes=num_islas, initializer=_inicializar, initargs=(nombre_modulo, tablero)) as pool:
+        for epoca in range(max_epocas):
+            # Semilla de cada isla en cada época: subflujo (época, isla) de la maestra
+            # y generación global al empezar la época (la cadencia memética no se reinicia)
+            tareas = [(nombre_modulo, genomas, intervalo_migracion, semilla_derivada(semilla, epoca, i),
+                       epoca * intervalo_migracion)
+                      for i, (genomas, _) in enumerate(islas)]
+            resultados = pool.map(_correr_epoca, tareas)
+
+            islas = [(genomas, errores) for genomas, errores, _ in resultados]
+            generaciones += max(corridas for _, _, corridas in resultados)
+
+            mejor_isla = min(range(num_islas), key=lambda i: islas[i][1][0])
+            mejor_error = islas[mejor_isla][1][0]
+            print(f"  Época {epoca + 1:3d} | Gen {generaciones:4d} | "
+                  f"Mejor isla #{mejor_isla} | Faltas: {mejor_error} | {time.time() - inicio:.1f}s")
+
+            if mejor_error == 0:
+                return islas[mejor_isla][0][0], generaciones
+
+            migrar(islas, num_migrantes, topologia, rng)
+
+    return None, generaciones
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sudoku con modelo de islas multinúcleo")
+    parser.add_argument("solucionador", choices=SOLUCIONADORES, nargs="?", default="con_deap")
+    parser.add_argument("-t", "--tablero", default=None, help="Tablero n²×n²: un carácter por celda ('0' o '.' = vacía, A = 10, B = 11...) o enteros separados; por defecto el del módulo")
+    parser.add_argument("--islas", type=int, default=NUM_ISLAS)
+    parser.add_argument("--intervalo", type=int, default=INTERVALO_MIGRACION)
+    parser.add_argument("--migrantes", type=int, default=NUM_MIGRANTES)
+    parser.add_argument("--topologia", choices=("anillo", "aleatoria"), default=TOPOLOGIA)
+    parser.add_argument("--epocas", type=int, default=MAX_EPOCAS)
+    parser.add_argument("--semilla", type=int, default=None)
+    args = parser.parse_args()
+    tablero = parsear_tablero(args.tablero) if args.tablero else None
+
+    print(f"\n" + "="*60)
+    print(f" >>> SUDOKU - MODELO DE ISLAS ({args.solucionador}, {args.islas} islas) <<<")
+    print("="*60)
+
+    solucion, generaciones = ejecutar_islas(args.solucionador, args.islas, args.intervalo,
+                                            args.migrantes, args.topologia, args.epocas,
+                                            args.semilla, tablero)
+    if solucion is None:
+        print("\n:( Se agotaron todas las épocas.")
+        return
+
+    print(f"\n" + "*"*60)
+    print(f" ¡SOLUCIÓN ENCONTRADA! (Gen {generaciones})")
+    print("*"*60)
+    importlib.import_module(args.solucionador).imprimir_tablero_bonito(solucion)
+
+if __name__ == "__main__":
+    main()
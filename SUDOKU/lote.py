@@ -0,0 +1,176 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import queue
+import sys
+from multiprocessing import Pool
+
+from azar import semilla_derivada
+from puntos_control import CADA_GENERACIONES, PuntoControl
+from resolucion import SOLUCIONADORES, parsear_tablero, resolver, tablero_a_texto
+
+# -------------------------------------------------------------------
+# 1. PARÁMETROS DEL MODO POR LOTES
+# -------------------------------------------------------------------
+NUM_PROCESOS = os.cpu_count() or 1
+MAX_INTENTOS_POR_TABLERO = 20      # Para que un tablero imposible no bloquee el lote
+PENDIENTES_POR_PROCESO = 2         # Tableros leídos pero aún no emitidos, por proceso
+
+# -------------------------------------------------------------------
+# 2. LECTURA EN STREAMING
+# -------------------------------------------------------------------
+def leer_tableros(archivo):
+    """
+    Genera (id, tablero) línea a línea sin cargar el archivo completo.
+    Acepta un tablero por línea en el formato de resolucion.parsear_tablero
+    (81, 256, 625... celdas; '0' o '.' = vacía) o JSONL con
+    {"id": ..., "tablero": "<texto>" | [[...lado x lado...]]}.
+    Las líneas vacías o que empiezan con '#' se ignoran. Una línea que no
+    se puede leer no corta el lote: sale como (id, ValueError) y quien
+    consume la convierte en un resultado con "error".
+    """
+    for num_linea, linea in enumerate(archivo, start=1):
+        linea = linea.strip()
+        if not linea or linea.startswith("#"):
+            continue
+        ident = num_linea
+        try:
+            if linea.startswith("{"):
+                datos = json.loads(linea)
+                if not isinstance(datos, dict):
+                    raise ValueError("Se esperaba un objeto JSON")
+                ident = datos.get("id", num_linea)
+                tablero = datos.get("tablero", datos.get("puzzle"))
+                if tablero is None:
+                    raise ValueError("Falta la clave 'tablero' o 'puzzle'")
+                if isinstance(tablero, str):
+                    tablero = parsear_tablero(tablero)
+            else:
+                tablero = parsear_tablero(linea)
+        except (ValueError, json.JSONDecodeError) as exc:
+            yield ident, exc
+            continue
+        yield ident, tablero
+
+
+def resultado_error(indice, ident, exc):
+    """Resultado de un tablero que no se pudo resolver (entrada inválida o fallo del trabajador)."""
+    return {"indice": indice, "id": ident, "resuelto": False, "error": repr(exc)}
+
+# -------------------------------------------------------------------
+# 3. TRABAJADOR
+# -------------------------------------------------------------------
+def _resolver_uno(args):
+    indice, ident, tablero, nombre_modulo, semilla, max_intentos, control = args
+    # Un punto de control por tablero, identificado por su posición en la entrada
+    punto_control = None
+    if control is not None:
+        directorio, cada, reanudar = control
+        punto_control = PuntoControl(os.path.join(directorio, f"{indice:06d}"), cada)
+    # El progreso de cada intento no sirve en modo lote
+    with contextlib.redirect_stdout(io.StringIO()):
+        res = resolver(nombre_modulo, tablero, semilla=semilla, max_intentos=max_intentos,
+                       punto_control=punto_control, reanudar=control is not None and reanudar)
+    return {
+        "indice": indice,
+        "id": ident,
+        "resuelto": res["resuelto"],
+        "solucion": tablero_a_texto(res["solucion"]) if res["solucion"] else None,
+        "intentos": res["intentos"],
+        "generaciones": res["generaciones"],
+        "evaluaciones": res["evaluaciones"],
+        "tiempo": round(res["tiempo"], 4),
+    }
+
+# -------------------------------------------------------------------
+# 4. POOL ACOTADO
+# -------------------------------------------------------------------
+def resolver_lote(tableros, nombre_modulo="con_deap", num_procesos=NUM_PROCESOS,
+                  ordenado=True, max_intentos=MAX_INTENTOS_POR_TABLERO, semilla=None,
+                  puntos_control=None, cada=CADA_GENERACIONES, reanudar=False):
+    """
+    Resuelve los (id, tablero) de un iterable con un pool de procesos y va
+    generando los resultados: en el orden de entrada (ordenado=True) o según
+    terminan. Nunca hay más de PENDIENTES_POR_PROCESO * num_procesos tableros
+    leídos sin emitir, así que la memoria no crece con el tamaño del archivo.
+    Con 'puntos_control' (un directorio) cada tablero guarda su estado cada
+    'cada' generaciones y, con reanudar=True, sigue desde ahí.
+    """
+    control = (puntos_control, cada, reanudar) if puntos_control else None
+    limite = max(1, PENDIENTES_POR_PROCESO * num_procesos)
+    terminados = queue.Queue()
+    listos = {}            # Resultados que esperan su turno (modo ordenado)
+    siguiente = 0          # Próximo índice a emitir (modo ordenado)
+    enviados = 0
+    emitidos = 0
+
+    def _error(indice, ident):
+        return lambda exc: terminados.put(resultado_error(indice, ident, exc))
+
+    def _esperar_uno():
+        nonlocal siguiente, emitidos
+        res = terminados.get()
+        if not ordenado:
+            emitidos += 1
+            yield res
+            return
+        listos[res["indice"]] = res
+        while siguiente in listos:
+            emitidos += 1
+            yield listos.pop(siguiente)
+            siguiente += 1
+
+    with Pool(processes=num_procesos) as pool:
+        for indice, (ident, tablero) in enumerate(tableros):
+            if isinstance(tablero, Exception):
+                # Línea inválida: su resultado sale en su turno, sin pasar por el pool
+                terminados.put(resultado_error(indice, ident, tablero))
+            else:
+                semilla_i = None if semilla is None else semilla_derivada(semilla, indice)
+                pool.apply_async(_resolver_uno,
+                                 ((indice, ident, tablero, nombre_modulo, semilla_i, max_intentos, control),),
+                                 callback=terminados.put, error_callback=_error(indice, ident))
+            enviados += 1
+            while enviados - emitidos >= limite:
+                yield from _esperar_uno()
+
+        while emitidos < enviados:
+            yield from _esperar_uno()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Resuelve un archivo de tableros en streaming")
+    parser.add_argument("entrada", help="Archivo de tableros (un tablero por línea, 9x9, 16x16..., o JSONL); '-' = stdin")
+    parser.add_argument("-o", "--salida", default="-", help="Archivo JSONL de resultados ('-' = stdout)")
+    parser.add_argument("-s", "--solucionador", choices=SOLUCIONADORES, default="con_deap")
+    parser.add_argument("-p", "--procesos", type=int, default=NUM_PROCESOS)
+    parser.add_argument("--intentos", type=int, default=MAX_INTENTOS_POR_TABLERO)
+    parser.add_argument("--desordenado", action="store_true",
+                        help="Emitir cada resultado en cuanto termina, sin respetar el orden de entrada")
+    parser.add_argument("--semilla", type=int, default=None)
+    parser.add_argument("--puntos-control", default=None,
+                        help="Directorio donde cada tablero guarda su estado para poder reanudar")
+    parser.add_argument("--cada", type=int, default=CADA_GENERACIONES,
+                        help="Generaciones entre puntos de control")
+    parser.add_argument("--reanudar", action="store_true",
+                        help="Seguir desde los puntos de control de una corrida interrumpida")
+    args = parser.parse_args()
+
+    entrada = sys.stdin if args.entrada == "-" else open(args.entrada, encoding="utf-8")
+    salida = sys.stdout if args.salida == "-" else open(args.salida, "w", encoding="utf-8")
+    try:
+        for res in resolver_lote(leer_tableros(entrada), args.solucionador, args.procesos,
+                                 not args.desordenado, args.intentos, args.semilla,
+                                 args.puntos_control, args.cada, args.reanudar):
+            salida.write(json.dumps(res, ensure_ascii=False) + "\n")
+            salida.flush()
+    finally:
+        if entrada is not sys.stdin:
+            entrada.close()
+        if salida is not sys.stdout:
+            salida.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,328 @@
+import argparse
+import contextlib
+import gc
+import io
+import json
+import platform
+import sys
+import threading
+import tracemalloc
+
+from instrumentacion import MedidorFases, reloj
+
+try:
+    import resource
+except ImportError:          # Windows: sin getrusage, el pico de RSS queda en None
+    resource = None
+
+# -------------------------------------------------------------------
+# PERFIL DE MEMORIA Y ASIGNACIONES POR FASE
+# -------------------------------------------------------------------
+# MedidorMemoria es un MedidorFases (mismas fases y filas por generación)
+# que además, mientras está activo ('with'), mide con tracemalloc:
+#   - bytes: lo más que subió la memoria trazada por encima de la que había
+#     al entrar en la fase (memoria transitoria que la fase necesita);
+#   - neto: bytes que la fase dejó vivos al salir (negativo si liberó);
+#   - bloques_nuevos / nuevos: bloques y bytes que la fase asignó y
+#     siguen vivos al salir, comparando snapshots de tracemalloc tomados al
+#     entrar y al salir y sumando por línea de código solo los aumentos
+#     (lo que libera una línea no tapa lo que asigna otra). Lo que se
+#     asigna y se libera dentro de la misma fase no queda en ningún
+#     snapshot: ese tráfico transitorio se ve en 'bytes'. Los snapshots
+#     solo se toman una de cada CADA_SNAPSHOT generaciones (las filas de
+#     las demás no llevan estas claves);
+# y con gc.callbacks las colecciones del recolector por generación y sus
+# pausas. Las fases que corren dentro de otra (resembrar dentro de
+# diversidad) cuentan en ambas. El pico de RSS del proceso se toma de
+# getrusage al cerrar.
+#
+# resumen_memoria() es un dict pequeño con claves ordenadas y valores
+# redondeados (KiB, ms) pensado para guardarse como JSON y compararse con
+# diff entre versiones. Con tracemalloc encendido todo corre varias veces
+# más lento (~50 ms por generación de desde_cero y ~70 ms de con_deap en
+# dificil-02), y una generación con snapshots muchísimo más, porque
+# compare_to agrupa en Python todos los bloques vivos dos veces por fase
+# (~7 s en desde_cero y ~12 s en con_deap): por eso CADA_SNAPSHOT y
+# --generaciones. Los tiempos sirven para comparar fases entre sí, no con
+# una corrida normal.
+
+PROFUNDIDAD_TRAZA = 1     # Cuadros guardados por asignación (más = más lento)
+AGRUPAR_POR = "lineno"    # Clave de Snapshot.compare_to ("lineno" o "traceback")
+CADA_SNAPSHOT = 10        # Generaciones entre las que miden bloques nuevos (1 = todas, 0 = ninguna)
+
+# Tablero de main() sin -t: medio-01 del corpus (el presolver no lo
+# termina, así que la corrida llega al ciclo generacional)
+TABLERO_POR_DEFECTO = "100920000524010000000000070050308102000000000402700090060000000000030945000071006"
+
+# El propio medidor (snapshots, marcos) no cuenta en las fases. Se descarta
+# al sumar: filter_traces recorre cada traza en Python y es mucho más lento
+_PROPIOS = {tracemalloc.__file__, __file__}
+
+
+def rss_pico_kib():
+    """Pico de memoria residente del proceso en KiB (None si no se puede saber)."""
+    if resource is None:
+        return None
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return pico // 1024 if sys.platform == "darwin" else pico   # macOS lo da en bytes
+
+
+class _Marco:
+    __slots__ = ("nombre", "inicio", "memoria", "snapshot", "pico")
+
+    def __init__(self, nombre, inicio, memoria, snapshot):
+        self.nombre = nombre
+        self.inicio = inicio
+        self.memoria = memoria
+        self.snapshot = snapshot
+        self.pico = memoria
+
+
+class _FaseMemoria:
+    __slots__ = ("medidor", "nombre")
+
+    def __init__(self, medidor, nombre):
+        self.medidor = medidor
+        self.nombre = nombre
+
+    def __enter__(self):
+        self.medidor._entrar(self.nombre)
+        return self
+
+    def __exit__(self, *exc):
+        self.medidor._salir()
+        return False
+
+
+def _vacia():
+    return {"llamadas": 0, "bytes": 0, "neto": 0, "bloques_nuevos": 0, "nuevos": 0}
+
+
+def _crecimiento(antes, despues):
+    """Bloques y bytes sumando solo las líneas que crecieron entre dos snapshots."""
+    bloques = nuevos = 0
+    for dif in despues.compare_to(antes, AGRUPAR_POR):
+        if dif.traceback[0].filename in _PROPIOS:
+            continue
+        bloques += max(dif.count_diff, 0)
+        nuevos += max(dif.size_diff, 0)
+    return bloques, nuevos
+
+
+class MedidorMemoria(MedidorFases):
+    """
+    Tiempos, memoria y recolector por fase. Se usa como contexto: al entrar
+    enciende tracemalloc (si no lo estaba) y engancha el callback del gc;
+    al salir los apaga. Fuera del 'with' solo mide tiempos.
+    """
+
+    def __init__(self, callback=None, salida=None, formato="jsonl", etiquetas=None,
+                 profundidad=PROFUNDIDAD_TRAZA, cada_snapshot=CADA_SNAPSHOT):
+        super().__init__(callback, salida, formato, etiquetas)
+        self.profundidad = profundidad
+        self.cada_snapshot = cada_snapshot
+        self.generaciones_con_snapshot = 0
+        self.memoria = {}                  # Fase -> acumulado de toda la corrida
+        self.pico_por_generacion = {}      # Fase -> mayor 'bytes' en una sola generación
+        self.gc_colecciones = [0, 0, 0]
+        self.gc_pausa = 0.0
+        self.gc_pausa_maxima = 0.0
+        self.rss_inicial = None
+        self.rss_final = None
+        self.pico_trazado = 0
+        self._pila = []
+        self._memoria_gen = {}
+        self._gc_gen = [0, 0.0]            # Colecciones y segundos de pausa de la generación
+        self._gc_inicio = None
+        self._propio = False
+
+    # --- encendido ---
+    def __enter__(self):
+        self.rss_inicial = rss_pico_kib()
+        self._propio = not tracemalloc.is_tracing()
+        if self._propio:
+            tracemalloc.start(self.profundidad)
+        tracemalloc.reset_peak()
+        gc.callbacks.append(self._gc)
+        return self
+
+    def __exit__(self, *exc):
+        gc.callbacks.remove(self._gc)
+        self.pico_trazado = max(self.pico_trazado, tracemalloc.get_traced_memory()[1])
+        if self._propio:
+            tracemalloc.stop()
+        self.rss_final = rss_pico_kib()
+        return False
+
+    @property
+    def midiendo(self):
+        return tracemalloc.is_tracing()
+
+    @property
+    def toca_snapshot(self):
+        """La generación en curso compara snapshots (una de cada 'cada_snapshot')."""
+        return self.cada_snapshot > 0 and self.generaciones % self.cada_snapshot == 0
+
+    # --- fases ---
+    def fase(self, nombre):
+        return _FaseMemoria(self, nombre)
+
+    def _plegar_pico(self):
+        # reset_peak borra el pico: antes se guarda en todas las fases abiertas
+        pico = tracemalloc.get_traced_memory()[1]
+        self.pico_trazado = max(self.pico_trazado, pico)
+        for marco in self._pila:
+            marco.pico = max(marco.pico, pico)
+
+    def _entrar(self, nombre):
+        if self.midiendo:
+            # El snapshot va antes de reset_peak para no contar como pico de la fase
+            snapshot = tracemalloc.take_snapshot() if self.toca_snapshot else None
+            self._plegar_pico()
+            tracemalloc.reset_peak()
+            memoria = tracemalloc.get_traced_memory()[0]
+        else:
+            snapshot, memoria = None, 0
+        self._pila.append(_Marco(nombre, reloj(), memoria, snapshot))
+
+    def _salir(self):
+        marco = self._pila[-1]
+        segundos = reloj() - marco.inicio
+        bloques = nuevos = 0
+        if self.midiendo:
+            self._plegar_pico()
+            memoria = tracemalloc.get_traced_memory()[0]
+            if marco.snapshot is not None:
+                bloques, nuevos = _crecimiento(marco.snapshot, tracemalloc.take_snapshot())
+        else:
+            memoria = marco.memoria
+        self._pila.pop()
+        self.sumar(marco.nombre, segundos)
+
+        datos = self._memoria_gen.setdefault(marco.nombre, _vacia())
+        datos["llamadas"] += 1
+        datos["bytes"] = max(datos["bytes"], marco.pico - marco.memoria)
+        datos["neto"] += memoria - marco.memoria
+        datos["bloques_nuevos"] += bloques
+        datos["nuevos"] += nuevos
+
+    # --- recolector ---
+    def _gc(self, etapa, info):
+        if etapa == "start":
+            self._gc_inicio = reloj()
+            return
+        if self._gc_inicio is None:
+            return
+        pausa = reloj() - self._gc_inicio
+        self._gc_inicio = None
+        self.gc_colecciones[info["generation"]] += 1
+        self.gc_pausa += pausa
+        self.gc_pausa_maxima = max(self.gc_pausa_maxima, pausa)
+        self._gc_gen[0] += 1
+        self._gc_gen[1] += pausa
+
+    # --- generaciones ---
+    def fin_generacion(self, poblacion=None, **contexto):
+        con_snapshot = self.midiendo and self.toca_snapshot
+        self.generaciones_con_snapshot += con_snapshot
+        for nombre, datos in self._memoria_gen.items():
+            contexto[f"{nombre}_kib"] = round(datos["bytes"] / 1024, 1)
+            if con_snapshot:
+                contexto[f"{nombre}_bloques_nuevos"] = datos["bloques_nuevos"]
+                contexto[f"{nombre}_nuevos_kib"] = round(datos["nuevos"] / 1024, 1)
+            total = self.memoria.setdefault(nombre, _vacia())
+            total["llamadas"] += datos["llamadas"]
+            total["bytes"] = max(total["bytes"], datos["bytes"])
+            total["neto"] += datos["neto"]
+            total["bloques_nuevos"] += datos["bloques_nuevos"]
+            total["nuevos"] += datos["nuevos"]
+        contexto["gc_colecciones"], contexto["gc_pausa_ms"] = self._gc_gen[0], round(self._gc_gen[1] * 1e3, 3)
+        self._memoria_gen = {}
+        self._gc_gen = [0, 0.0]
+        super().fin_generacion(poblacion, **contexto)
+        # Una corrida cortada a mano deja en el archivo todas las generaciones cerradas
+        if self.salida is not None:
+            self.salida.flush()
+
+    def resumen_memoria(self):
+        """Resumen compacto y estable para guardar como JSON y comparar con diff."""
+        generaciones = max(1, self.generaciones)
+        muestreadas = max(1, self.generaciones_con_snapshot)
+        fases = {}
+        for nombre, datos in self.memoria.items():
+            fases[nombre] = {
+                "llamadas": datos["llamadas"],
+                "pico_kib": round(datos["bytes"] / 1024, 1),
+                "neto_kib": round(datos["neto"] / 1024, 1),
+                "bloques_nuevos_por_generacion": round(datos["bloques_nuevos"] / muestreadas, 1),
+                "nuevos_kib_por_generacion": round(datos["nuevos"] / 1024 / muestreadas, 1),
+                "ms_por_generacion": round(self.totales.get(nombre, 0.0) * 1e3 / generaciones, 3),
+            }
+        return {
+            "etiquetas": dict(self.etiquetas),
+            "generaciones": self.generaciones,
+            "generaciones_con_snapshot": self.generaciones_con_snapshot,
+            "rss_inicial_kib": self.rss_inicial,
+            "rss_pico_kib": self.rss_final,
+            "tracemalloc_pico_kib": round(self.pico_trazado / 1024, 1),
+            "fases": fases,
+            "gc": {"colecciones": dict(zip(("gen0", "gen1", "gen2"), self.gc_colecciones)),
+                   "pausa_total_ms": round(self.gc_pausa * 1e3, 3),
+                   "pausa_maxima_ms": round(self.gc_pausa_maxima * 1e3, 3)},
+        }
+
+
+def guardar_resumen(resumen, ruta):
+    with open(ruta, "w", encoding="utf-8") as archivo:
+        json.dump(resumen, archivo, ensure_ascii=False, indent=1, sort_keys=True)
+        archivo.write("\n")
+
+
+def main():
+    from resolucion import SOLUCIONADORES, parsear_tablero, resolver
+
+    parser = argparse.ArgumentParser(description="Corre un solucionador midiendo memoria, asignaciones y gc por fase")
+    parser.add_argument("solucionador", choices=SOLUCIONADORES)
+    parser.add_argument("-t", "--tablero", default=TABLERO_POR_DEFECTO, help="Tablero n²×n²: un carácter por celda ('0' o '.' = vacía, A = 10, B = 11...) o enteros separados; por defecto medio-01")
+    parser.add_argument("-o", "--salida", default="-", help="Archivo JSON del resumen ('-' = stdout)")
+    parser.add_argument("--filas", default=None, help="Archivo JSON lines con una fila por generación")
+    parser.add_argument("--intentos", type=int, default=1)
+    parser.add_argument("--semilla", type=int, default=None)
+    parser.add_argument("--generaciones", type=int, default=None, help="Cortar la corrida tras estas generaciones (sumando intentos)")
+    parser.add_argument("--cada-snapshot", type=int, default=CADA_SNAPSHOT, help="Generaciones entre mediciones de bloques nuevos (0 = ninguna)")
+    args = parser.parse_args()
+
+    # Con --generaciones la corrida se cancela con 'detener' al cerrar la última
+    detener = threading.Event()
+    def cortar(fila):
+        if args.generaciones is not None and medidor.generaciones >= args.generaciones:
+            detener.set()
+
+    filas = open(args.filas, "w", encoding="utf-8") if args.filas else None
+    etiquetas = {"solucionador": args.solucionador, "python": platform.python_version()}
+    medidor = MedidorMemoria(callback=cortar, salida=filas, etiquetas=etiquetas,
+                             cada_snapshot=args.cada_snapshot)
+    try:
+        tablero = parsear_tablero(args.tablero)
+        with contextlib.redirect_stdout(io.StringIO()), medidor:
+            resolver(args.solucionador, tablero, semilla=args.semilla, max_intentos=args.intentos,
+                     detener=detener, medidor=medidor)
+    finally:
+        if filas is not None:
+            filas.close()
+
+    resumen = medidor.resumen_memoria()
+    if args.salida == "-":
+        json.dump(resumen, sys.stdout, ensure_ascii=False, indent=1, sort_keys=True)
+        print()
+    else:
+        guardar_resumen(resumen, args.salida)
+
+    print(f"\nMemoria por fase ({resumen['generaciones']} generaciones, "
+          f"{resumen['generaciones_con_snapshot']} con snapshots, RSS pico {resumen['rss_pico_kib']} KiB):", file=sys.stderr)
+    for nombre, datos in sorted(resumen["fases"].items(), key=lambda x: -x[1]["pico_kib"]):
+        print(f"  {nombre:16s} pico {datos['pico_kib']:9.1f} KiB  "
+              f"{datos['bloques_nuevos_por_generacion']:9.1f} bloques nuevos/gen", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
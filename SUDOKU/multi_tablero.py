@@ -0,0 +1,278 @@
+import argparse
+import json
+import random
+import sys
+import time
+
+import numpy as np
+from azar import arreglo_movibles, flujos_desde_random, sortear_cruces, sortear_intercambios
+from cache_fitness import CacheAptitud
+from evaluacion import evaluar_poblacion
+from memetica import movibles_por_fila
+from operadores import cruzar_en_bloque, mutar_en_bloque
+from presolver import esta_completo, poblacion_aleatoria, preparar_tablero
+from resolucion import tablero_a_texto
+
+# -------------------------------------------------------------------
+# EVOLUCIÓN DE VARIOS TABLEROS EN UN SOLO TENSOR
+# -------------------------------------------------------------------
+# Con una cola de tableros, correr desde_cero por cada uno repite el loop
+# de Python de cada generación una vez por tablero. Aquí B tableros
+# evolucionan juntos: sus poblaciones son un arreglo (B, N, lado, lado) y
+# cada paso de la generación (élite, torneos, cruce, mutación y
+# evaluación) es una sola operación sobre los B a la vez. Cada tablero
+# lleva sus celdas fijas en forma de tabla de columnas movibles por fila
+# (B, lado, lado), como MOVIBLES en desde_cero, que usa la mutación.
+#
+# El algoritmo es el de desde_cero (elitismo, torneo, cruce uniforme por
+# filas y swaps dentro de las filas). En cuanto un tablero llega a 0
+# faltas sale del lote y su lugar lo toma el siguiente de la cola; si
+# agota MAX_GENERACIONES se reinicia su población (un intento más) y tras
+# MAX_INTENTOS se da por no resuelto. Todos los tableros de un lote deben
+# tener el mismo lado: si llega uno de otro lado, queda en espera (sin
+# leer más de la cola) hasta que el lote se vacía y entonces abre un lote
+# nuevo con su lado.
+
+LOTE = 16                   # Tableros evolucionando a la vez (B)
+TAMANO_POBLACION = 600      # Individuos por tablero (N), igual que desde_cero
+MAX_GENERACIONES = 150      # Generaciones por intento antes de reiniciar ese tablero
+MAX_INTENTOS = 20           # Intentos por tablero antes de darlo por no resuelto
+PROB_CRUCE = 0.9
+PROB_MUTACION = 0.1
+PORCENTAJE_ELITISMO = 0.1
+TAMANO_TORNEO = 3
+CAMBIOS_MUTACION = 3        # Swaps por mutante
+USAR_PRESOLVER = True       # Fijar por lógica las celdas deducibles antes de evolucionar
+TAMANO_CACHE = 0            # 0 = sin caché: con B * N hijos por generación casi nunca acierta
+
+# -------------------------------------------------------------------
+# MOTOR
+# -------------------------------------------------------------------
+class MotorMultiTablero:
+    """
+    Estado de los B tableros activos: genomas (B, N, lado, lado), aptitudes
+    (B, N), tablas de movibles y, por tablero, su id, intento, generación
+    y evaluaciones. resolver(tableros) consume la cola y genera un
+    resultado por tablero en el orden en que terminan.
+    """
+
+    def __init__(self, lote=LOTE, tamano_poblacion=TAMANO_POBLACION, semilla=None,
+                 max_generaciones=MAX_GENERACIONES, max_intentos=MAX_INTENTOS,
+                 capacidad_cache=TAMANO_CACHE):
+        if semilla is not None:
+            random.seed(semilla)
+        self.rng_seleccion, self.rng_operadores = flujos_desde_random(2)
+        self.lote = lote
+        self.n = tamano_poblacion
+        self.num_elite = max(1, int(tamano_poblacion * PORCENTAJE_ELITISMO))
+        self.num_hijos = tamano_poblacion - self.num_elite
+        self.max_generaciones = max_generaciones
+        self.max_intentos = max_intentos
+        # Las faltas solo dependen del genoma completo: una caché sirve para todos
+        self.cache = CacheAptitud(capacidad_cache) if capacidad_cache else None
+        self.lado = None
+        self.genomas = self.aptitudes = None
+        self.tableros = self.indices = self.largos = self.candidatos = None
+        self.activos = []     # Por tablero: dict con id, intento, generación, evaluaciones...
+
+    # --- altas y bajas ---
+    def _evaluar(self, genomas):
+        genomas = genomas.reshape(-1, self.lado, self.lado)
+        if self.cache is None:
+            return evaluar_poblacion(genomas)[2]
+        return self.cache.evaluar_poblacion(genomas)[2]
+
+    def _nueva_poblacion(self, b):
+        genomas = poblacion_aleatoria(self.rng_operadores, self.tableros[b].tolist(),
+                                      self.candidatos[b].tolist(), self.n)
+        self.genomas[b] = genomas
+        self.aptitudes[b] = self._evaluar(genomas)
+        self.activos[b]["evaluaciones"] += self.n
+
+    def _agregar(self, ident, tablero, candidatos, inicio):
+        """Suma un tablero (ya pre-resuelto y sin completar) al final del lote."""
+        lado = len(tablero)
+        if not self.activos:
+            self.lado = lado
+            self.genomas = np.zeros((0, self.n, lado, lado), dtype=np.uint8)
+            self.aptitudes = np.zeros((0, self.n), dtype=np.int64)
+            self.tableros = np.zeros((0, lado, lado), dtype=np.uint8)
+            self.indices = np.zeros((0, lado, lado), dtype=np.intp)
+            self.largos = np.zeros((0, lado), dtype=np.intp)
+            self.candidatos = np.zeros((0, lado, lado), dtype=np.int64)
+        elif lado != self.lado:
+            raise ValueError(f"Tablero {ident!r} de lado {lado} en un lote de lado {self.lado}")
+
+        indices, largos = arreglo_movibles(movibles_por_fila(tablero))
+        self.genomas = np.concatenate([self.genomas, np.zeros((1, self.n, lado, lado), np.uint8)])
+        self.aptitudes = np.concatenate([self.aptitudes, np.zeros((1, self.n), np.int64)])
+        self.tableros = np.concatenate([self.tableros, np.asarray(tablero, np.uint8)[None]])
+        self.indices = np.concatenate([self.indices, indices[None]])
+        self.largos = np.concatenate([self.largos, largos[None]])
+        self.candidatos = np.concatenate([self.candidatos, np.asarray(candidatos, np.int64)[None]])
+        self.activos.append({"id": ident, "intento": 1, "generacion": 0,
+                             "generaciones": 0, "evaluaciones": 0, "inicio": inicio})
+        self._nueva_poblacion(len(self.activos) - 1)
+
+    def _quitar(self, salen):
+        """Saca del lote los tableros con salen[b] = True."""
+        quedan = ~salen
+        for nombre in ("genomas", "aptitudes", "tableros", "indices", "largos", "candidatos"):
+            setattr(self, nombre, getattr(self, nombre)[quedan])
+        self.activos = [a for a, q in zip(self.activos, quedan.tolist()) if q]
+
+    # --- una generación de los B tableros ---
+    def generacion(self):
+        b_total, n, lado = len(self.activos), self.n, self.lado
+        filas_b = np.arange(b_total)[:, None]
+
+        # Élite de cada tablero (selección parcial por fila)
+        elite = np.argpartition(self.aptitudes, self.num_elite - 1, axis=1)[:, :self.num_elite]
+
+        # Todos los torneos de todos los tableros en un solo sorteo
+        hijos_par = self.num_hijos + self.num_hijos % 2
+        participantes = self.rng_seleccion.integers(0, n, size=(b_total, hijos_par, TAMANO_TORNEO))
+        ganador = np.argmin(self.aptitudes[filas_b[:, :, None], participantes], axis=2)
+        ganadores = np.take_along_axis(participantes, ganador[:, :, None], axis=2)[:, :, 0]
+
+        # Cruce y mutación sobre los B * hijos_par padres (las parejas no
+        # cruzan tableros porque hijos_par es par)
+        padres = self.genomas[filas_b, ganadores].reshape(-1, lado, lado)
+        cruza, mascaras = sortear_cruces(self.rng_operadores, len(padres) // 2, lado, PROB_CRUCE)
+        hijos, cambiados = cruzar_en_bloque(padres, cruza, mascaras)
+        mutantes = np.flatnonzero(self.rng_operadores.random(len(hijos)) < PROB_MUTACION)
+        swaps = sortear_intercambios(self.rng_operadores, len(mutantes) * CAMBIOS_MUTACION,
+                                     self.indices, self.largos,
+                                     np.repeat(mutantes // hijos_par, CAMBIOS_MUTACION))
+        mutar_en_bloque(hijos, mutantes, swaps)
+        cambiados[mutantes] = True
+
+        # Solo se evalúan los hijos distintos de su padre
+        aptitudes_hijos = self.aptitudes[filas_b, ganadores].reshape(-1)
+        pendientes = np.flatnonzero(cambiados)
+        if len(pendientes):
+            aptitudes_hijos[pendientes] = self._evaluar(hijos[pendientes])
+        evaluadas = np.bincount(pendientes // hijos_par, minlength=b_total).tolist()
+
+        # Nueva generación: élite + hijos (el sobrante de un número impar se descarta)
+        hijos = hijos.reshape(b_total, hijos_par, lado, lado)[:, :self.num_hijos]
+        aptitudes_hijos = aptitudes_hijos.reshape(b_total, hijos_par)[:, :self.num_hijos]
+        self.genomas = np.concatenate([self.genomas[filas_b, elite], hijos], axis=1)
+        self.aptitudes = np.concatenate([self.aptitudes[filas_b, elite], aptitudes_hijos], axis=1)
+        for activo, k in zip(self.activos, evaluadas):
+            activo["generacion"] += 1
+            activo["generaciones"] += 1
+            activo["evaluaciones"] += k
+
+    # --- cola ---
+    def _resultado(self, b, resuelto):
+        activo = self.activos[b]
+        solucion = None
+        if resuelto:
+            solucion = self.genomas[b, np.argmin(self.aptitudes[b])].tolist()
+        return {"id": activo["id"], "resuelto": resuelto,
+                "solucion": tablero_a_texto(solucion) if solucion else None,
+                "intentos": activo["intento"], "generaciones": activo["generaciones"],
+                "evaluaciones": activo["evaluaciones"],
+                "tiempo": round(time.perf_counter() - activo["inicio"], 4)}
+
+    def resolver(self, tableros):
+        """
+        Genera un resultado por cada (id, tablero) del iterable, en el orden
+        en que terminan: los resueltos salen del lote y entra el siguiente.
+        """
+        cola = iter(tableros)
+        agotada = False
+        espera = None    # Tablero de otro lado que aguarda a que se vacíe el lote
+        while True:
+            # Rellenar los lugares libres
+            while len(self.activos) < self.lote:
+                if espera is not None:
+                    if self.activos:
+                        break
+                    self._agregar(*espera)
+                    espera = None
+                    continue
+                if agotada:
+                    break
+                siguiente = next(cola, None)
+                if siguiente is None:
+                    agotada = True
+                    break
+                ident, tablero = siguiente
+                inicio = time.perf_counter()
+                try:
+                    if isinstance(tablero, Exception):
+                        raise tablero
+                    tablero, candidatos = preparar_tablero(tablero, USAR_PRESOLVER)
+                except ValueError as exc:
+                    # Línea inválida (lote.leer_tableros) o tablero sin solución: no corta la cola
+                    yield {"id": ident, "resuelto": False, "error": repr(exc)}
+                    continue
+                if esta_completo(tablero):
+                    yield {"id": ident, "resuelto": True, "solucion": tablero_a_texto(tablero),
+                           "intentos": 1, "generaciones": 0, "evaluaciones": 0,
+                           "tiempo": round(time.perf_counter() - inicio, 4)}
+                    continue
+                if self.activos and len(tablero) != self.lado:
+                    espera = (ident, tablero, candidatos, inicio)
+                    break
+                self._agregar(ident, tablero, candidatos, inicio)
+            if not self.activos:
+                return
+
+            mejores = self.aptitudes.min(axis=1)
+            resueltos = mejores == 0
+            for b in np.flatnonzero(resueltos).tolist():
+                yield self._resultado(b, True)
+            # Los que agotaron el intento: reiniciar o darlos por perdidos
+            agotados = np.zeros(len(self.activos), dtype=bool)
+            for b, activo in enumerate(self.activos):
+                if resueltos[b] or activo["generacion"] < self.max_generaciones:
+                    continue
+                if activo["intento"] >= self.max_intentos:
+                    agotados[b] = True
+                    yield self._resultado(b, False)
+                else:
+                    activo["intento"] += 1
+                    activo["generacion"] = 0
+                    self._nueva_poblacion(b)
+            if (resueltos | agotados).any():
+                self._quitar(resueltos | agotados)
+                continue
+            self.generacion()
+
+
+def main():
+    from lote import leer_tableros
+    parser = argparse.ArgumentParser(description="Resuelve una cola de tableros evolucionándolos en lotes")
+    parser.add_argument("entrada", help="Archivo de tableros (mismo formato que lote.py); '-' = stdin")
+    parser.add_argument("-o", "--salida", default="-", help="Archivo JSONL de resultados ('-' = stdout)")
+    parser.add_argument("-b", "--lote", type=int, default=LOTE, help="Tableros evolucionando a la vez")
+    parser.add_argument("-n", "--poblacion", type=int, default=TAMANO_POBLACION)
+    parser.add_argument("--intentos", type=int, default=MAX_INTENTOS)
+    parser.add_argument("--semilla", type=int, default=None)
+    args = parser.parse_args()
+
+    entrada = sys.stdin if args.entrada == "-" else open(args.entrada, encoding="utf-8")
+    salida = sys.stdout if args.salida == "-" else open(args.salida, "w", encoding="utf-8")
+    motor = MotorMultiTablero(args.lote, args.poblacion, args.semilla, max_intentos=args.intentos)
+    inicio = time.perf_counter()
+    total = resueltos = 0
+    try:
+        for res in motor.resolver(leer_tableros(entrada)):
+            salida.write(json.dumps(res, ensure_ascii=False) + "\n")
+            salida.flush()
+            total += 1
+            resueltos += res["resuelto"]
+    finally:
+        if entrada is not sys.stdin:
+            entrada.close()
+        if salida is not sys.stdout:
+            salida.close()
+    segundos = time.perf_counter() - inicio
+    print(f"{resueltos}/{total} resueltos en {segundos:.2f}s "
+          f"({total / segundos if segundos else 0:.2f} tableros/s)", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
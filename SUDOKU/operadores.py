@@ -0,0 +1,52 @@
+import numpy as np
+
+# -------------------------------------------------------------------
+# OPERADORES EN BLOQUE SOBRE LA POBLACIÓN (N, lado, lado)
+# -------------------------------------------------------------------
+# En vez de cruzar pareja por pareja y mutar individuo por individuo en
+# Python, los tres solucionadores pasan los genomas de toda la generación
+# como un arreglo y cada operador es un puñado de operaciones de numpy:
+#   - cruce uniforme por filas: una sola máscara (parejas, lado) decide qué
+#     filas intercambia cada pareja (padres consecutivos 0-1, 2-3, ...);
+#   - mutación: K swaps por mutante entre columnas movibles de una misma
+#     fila, sorteados con azar.sortear_intercambios (tabla de movibles).
+# Ninguno rompe los invariantes: las filas se mueven enteras o se permutan
+# dentro de sí mismas (siguen siendo permutaciones) y solo se tocan las
+# columnas movibles (las pistas no se mueven).
+
+
+def cruzar_en_bloque(padres, cruza, mascaras):
+    """
+    Hijos de las parejas (2p, 2p + 1) de 'padres' (N, lado, lado): si
+    cruza[p], intercambian las filas donde mascaras[p] es True; si no, salen
+    como copias. Con N impar el último pasa sin pareja. Devuelve
+    (hijos, cambiados): cambiados[i] indica si el hijo i viene de un cruce.
+    También sirve para genomas (N, lado) de un índice por fila (filas_admisibles.py).
+    """
+    pares = len(cruza)
+    intercambia = mascaras & cruza[:, None]
+    intercambia = intercambia.reshape(intercambia.shape + (1,) * (padres.ndim - 2))
+    hijos = padres.copy()
+    p1, p2 = padres[0:2 * pares:2], padres[1:2 * pares:2]
+    hijos[0:2 * pares:2] = np.where(intercambia, p2, p1)
+    hijos[1:2 * pares:2] = np.where(intercambia, p1, p2)
+    cambiados = np.zeros(len(padres), dtype=bool)
+    cambiados[:2 * pares] = np.repeat(cruza, 2)
+    return hijos, cambiados
+
+
+def mutar_en_bloque(genomas, mutantes, swaps):
+    """
+    Aplica en el lugar K swaps a cada genomas[mutantes[i]]. 'swaps' son los
+    arreglos (filas, c1, c2) de azar.sortear_intercambios con K * len(mutantes)
+    elementos: los K seguidos de cada mutante se aplican en orden. Un swap
+    con c1 == c2 no cambia nada.
+    """
+    if len(mutantes) == 0:
+        return
+    filas, c1, c2 = (np.reshape(x, (len(mutantes), -1)) for x in swaps)
+    for k in range(filas.shape[1]):
+        r, a, b = filas[:, k], c1[:, k], c2[:, k]
+        valores_a = genomas[mutantes, r, a]
+        genomas[mutantes, r, a] = genomas[mutantes, r, b]
+        genomas[mutantes, r, b] = valores_a
@@ -0,0 +1,165 @@
+import random
+import numpy as np
+from filas_admisibles import DemasiadasOpciones, TablaFilas, espacio_permutaciones
+from desde_cero import TABLERO_PROBLEM, PorCeldas, imprimir_tablero
+from presolver import esta_completo
+from instrumentacion import NULO
+from evolucion import SIN_CACHE, Codificacion, evolucionar, resultado
+
+# -------------------------------------------------------------------
+# SOLUCIONADOR SOBRE TABLAS DE FILAS ADMISIBLES
+# -------------------------------------------------------------------
+# El mismo ciclo que desde_cero (evolucion.py: elitismo, torneo, cruce
+# uniforme por filas), pero el genoma es un índice por fila en las tablas
+# de filas_admisibles.py: las filas ya respetan pistas y candidatos antes
+# de la primera generación, el cruce intercambia enteros y la mutación
+# vuelve a sortear la opción de una fila. La aptitud sale de las máscaras
+# precalculadas de cada opción, sin armar el tablero. Los tableros solo se
+# decodifican cuando el monitor de diversidad mide de verdad, para los
+# puntos de control y para la solución.
+#
+# El tablero por defecto es el de desde_cero, pero cada módulo carga y
+# presuelve el suyo (con su propio USAR_PRESOLVER). Si alguna fila tiene
+# más de LIMITE_OPCIONES opciones (16x16 con pocas pistas) no se arman
+# tablas y el intento corre con el genoma por celdas de desde_cero, sobre
+# el tablero de aquí.
+
+# -------------------------------------------------------------------
+# 1. PARÁMETROS (IGUALADOS A desde_cero)
+# -------------------------------------------------------------------
+TAMANO_POBLACION = 600
+MAX_GENERACIONES = 150
+PROB_CRUCE = 0.9
+PROB_MUTACION = 0.1
+PORCENTAJE_ELITISMO = 0.1
+TAMANO_TORNEO = 3
+CAMBIOS_MUTACION = 1     # Filas que se vuelven a sortear por mutante (cada una cambia varias celdas)
+USAR_PRESOLVER = True    # Fijar por lógica las celdas deducibles antes de armar las tablas
+USAR_MONITOR = True      # Resembrar / reiniciar antes de tiempo si la población colapsa (diversidad.py)
+ELITES_ENTRE_REINICIOS = 0  # Mejores genomas de un intento fallido que pasan al siguiente
+
+# Mejores genomas del último intento fallido (ELITES_ENTRE_REINICIOS)
+ELITE_PREVIA = []
+
+# Tableros puntuados desde el último reinicio
+EVALUACIONES = 0
+
+# -------------------------------------------------------------------
+# 2. GENOMA POR ÍNDICES DE FILA
+# -------------------------------------------------------------------
+class PorFilas(Codificacion):
+    """Genomas (N, LADO) de índices en las tablas; las tablas no usan caché."""
+
+    def __init__(self):
+        # Se arman al primer intento sobre el tablero (no al cargarlo)
+        self.tablas = None
+        self.sin_tablas = False   # Tablero demasiado abierto: genoma por celdas
+
+    def cargar(self, tablero, usar_presolver=True):
+        super().cargar(tablero, usar_presolver)
+        self.tablas = None
+        self.sin_tablas = False
+
+    def preparar_tablas(self):
+        """
+        Enumera y poda las filas admisibles del tablero cargado (solo la
+        primera vez). None si alguna fila pasa de LIMITE_OPCIONES.
+        """
+        if self.tablas is None and not self.sin_tablas:
+            try:
+                self.tablas = TablaFilas(self.tablero, self.candidatos)
+            except DemasiadasOpciones as error:
+                print(f" {error}; se sigue con el genoma por celdas (desde_cero)")
+                self.sin_tablas = True
+        return self.tablas
+
+    def aleatorios(self, rng, n):
+        return self.tablas.aleatorios(rng, n)
+
+    def evaluar(self, genomas):
+        """Errores totales de genomas (N, LADO) de índices, por tabla."""
+        self.evaluaciones += len(genomas)
+        if len(genomas) == 0:
+            return np.empty(0, dtype=np.int64)
+        return self.tablas.faltas(genomas)[2]
+
+    def mutar(self, rng, hijos, mutantes):
+        # Una opción nueva para CAMBIOS_MUTACION filas de cada mutante
+        self.tablas.redibujar(rng, hijos, mutantes, CAMBIOS_MUTACION)
+
+    def decodificar(self, genomas):
+        return self.tablas.decodificar(genomas)
+
+    def codificar(self, tableros):
+        return self.tablas.codificar(tableros)
+
+POR_FILAS = PorFilas()
+# Genoma por celdas para los tableros sin tablas (el mismo tablero, ya presuelto)
+POR_CELDAS = PorCeldas()
+
+# -------------------------------------------------------------------
+# 3. BLOQUE PRINCIPAL
+# -------------------------------------------------------------------
+def cargar_tablero(tablero):
+    """Cambia el tablero a resolver (LADO listas de LADO, 0 = vacío)."""
+    POR_FILAS.cargar(tablero, USAR_PRESOLVER)
+    POR_CELDAS.cargar(POR_FILAS.tablero, usar_presolver=False)
+    ELITE_PREVIA.clear()
+
+def asegurar_tablero():
+    """Presuelve el tablero por defecto la primera vez si nadie cargó otro."""
+    if POR_FILAS.tablero is None:
+        cargar_tablero(TABLERO_PROBLEM)
+
+def ejecutar_intento(intento, semilla=None, detener=None, medidor=None, punto_control=None):
+    """
+    Corre un intento completo (hasta MAX_GENERACIONES) y devuelve un dict con
+    el resultado. 'detener' es un Event opcional para cancelarlo desde fuera.
+    'medidor' (instrumentacion.MedidorFases) recibe el tiempo de cada fase y
+    'punto_control' (puntos_control.PuntoControl) guarda o reanuda el intento.
+    """
+    global EVALUACIONES
+    asegurar_tablero()
+    tablero = POR_FILAS.tablero
+    medidor = medidor or NULO
+    if semilla is not None:
+        random.seed(semilla)
+
+    print(f"\n{'='*40}")
+    print(f" >>> INICIANDO INTENTO #{intento} (Tablas de filas) <<<")
+    print(f"{'='*40}")
+
+    if esta_completo(tablero):
+        print("¡RESUELTO POR PROPAGACIÓN DE RESTRICCIONES (sin evolución)!")
+        imprimir_tablero(tablero)
+        return resultado(intento, True, 0, [fila[:] for fila in tablero], cache=SIN_CACHE)
+
+    with medidor.fase("inicializacion"):
+        tablas = POR_FILAS.preparar_tablas()
+    if tablas is None:
+        codificacion = POR_CELDAS
+    else:
+        codificacion = POR_FILAS
+        print(f" Filas admisibles: {tablas.tamanos.tolist()} "
+              f"(10^{tablas.espacio():.1f} genomas contra 10^{espacio_permutaciones(tablero):.1f})")
+
+    codificacion.evaluaciones = EVALUACIONES
+    res = evolucionar(intento, codificacion, tablero, TAMANO_POBLACION, MAX_GENERACIONES,
+                      PROB_CRUCE, PROB_MUTACION, PORCENTAJE_ELITISMO, TAMANO_TORNEO,
+                      usar_monitor=USAR_MONITOR, elite_previa=ELITE_PREVIA,
+                      elites_entre_reinicios=ELITES_ENTRE_REINICIOS, detener=detener,
+                      medidor=medidor, punto_control=punto_control)
+    EVALUACIONES = codificacion.evaluaciones
+    if res["resuelto"]:
+        imprimir_tablero(res["solucion"])
+    return res
+
+def main():
+    intento = 1
+    while True:
+        if ejecutar_intento(intento)["resuelto"]:
+            return
+        intento += 1
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+import numpy as np
+from geometria import caja_de, digitos, unidades
+
+# -------------------------------------------------------------------
+# PRE-RESOLUCIÓN POR PROPAGACIÓN DE RESTRICCIONES
+# -------------------------------------------------------------------
+# Antes de evolucionar, se fijan todas las celdas que se pueden deducir
+# por lógica y se calcula, para las demás, la máscara de candidatos
+# (bit d encendido = el dígito d no choca con ninguna pista de su fila,
+# columna o caja). Las celdas deducidas se tratan como pistas y las
+# filas iniciales solo usan dígitos compatibles con cada celda
+# (poblacion_aleatoria las arma para toda la población a la vez con numpy).
+# Todo depende del lado del tablero (9, 16, 25...), que se lee del propio
+# tablero; las tablas salen de geometria.py.
+
+REINTENTOS_FILA = 5       # Intentos de armar una fila compatible con los candidatos
+
+
+def calcular_candidatos(tablero):
+    """Máscara de candidatos de cada celda vacía (0 para las llenas)."""
+    lado = len(tablero)
+    cajas_de = caja_de(lado)
+    todos = digitos(lado)
+    filas = [0] * lado
+    columnas = [0] * lado
+    cajas = [0] * lado
+    for r in range(lado):
+        for c in range(lado):
+            v = tablero[r][c]
+            if v:
+                bit = 1 << v
+                filas[r] |= bit
+                columnas[c] |= bit
+                cajas[cajas_de[r][c]] |= bit
+
+    candidatos = [[0] * lado for _ in range(lado)]
+    for r in range(lado):
+        for c in range(lado):
+            if tablero[r][c] == 0:
+                usados = filas[r] | columnas[c] | cajas[cajas_de[r][c]]
+                candidatos[r][c] = todos & ~usados
+    return candidatos
+
+
+def _buscar_single(tablero, candidatos):
+    """Devuelve (r, c, dígito) de un single desnudo u oculto, o None."""
+    lado = len(tablero)
+    # 1. Singles desnudos: la celda tiene un solo candidato
+    for r in range(lado):
+        for c in range(lado):
+            if tablero[r][c] == 0:
+                mascara = candidatos[r][c]
+                if mascara == 0:
+                    raise ValueError(f"Tablero sin solución: la celda ({r}, {c}) no tiene candidatos")
+                if mascara & (mascara - 1) == 0:
+                    return r, c, mascara.bit_length() - 1
+
+    # 2. Singles ocultos: el dígito solo cabe en una celda de la unidad
+    for unidad in unidades(lado):
+        for d in range(1, lado + 1):
+            bit = 1 << d
+            lugares = [(r, c) for r, c in unidad if tablero[r][c] == 0 and candidatos[r][c] & bit]
+            if len(lugares) == 1:
+                r, c = lugares[0]
+                return r, c, d
+    return None
+
+
+def presolver(tablero):
+    """
+    Fija singles desnudos y ocultos hasta que no se deduzca nada más.
+    Devuelve (tablero_presuelto, candidatos) sin modificar el original.
+    """
+    tablero = [list(fila) for fila in tablero]
+    while True:
+        candidatos = calcular_candidatos(tablero)
+        single = _buscar_single(tablero, candidatos)
+        if single is None:
+            return tablero, candidatos
+        r, c, d = single
+        tablero[r][c] = d
+
+
+def preparar_tablero(tablero, usar_presolver=True):
+    """Punto único que usan los solucionadores al cargar un tablero."""
+    if usar_presolver:
+        return presolver(tablero)
+    tablero = [list(fila) for fila in tablero]
+    return tablero, calcular_candidatos(tablero)
+
+
+def esta_completo(tablero):
+    return all(v != 0 for fila in tablero for v in fila)
+
+
+def _tablas_fila(tablero, candidatos):
+    """
+    Por fila: columnas vacías de la más restringida (menos candidatos) a la
+    menos, cuántas son y la máscara de dígitos que faltan.
+    """
+    lado = len(tablero)
+    orden = np.zeros((lado, lado), dtype=np.intp)
+    largos = np.zeros(lado, dtype=np.intp)
+    faltan = np.zeros(lado, dtype=np.int64)
+    for r, fila in enumerate(tablero):
+        vacias = sorted((c for c in range(lado) if fila[c] == 0),
+                        key=lambda c: bin(candidatos[r][c]).count("1"))
+        orden[r, :len(vacias)] = vacias
+        largos[r] = len(vacias)
+        faltan[r] = sum(1 << d for d in range(1, lado + 1) if d not in fila)
+    return orden, largos, faltan
+
+
+def _elegir_bit(rng, opciones, lado):
+    """Un dígito al azar entre los bits encendidos de cada máscara (0 si no hay)."""
+    bits = (opciones[:, None] >> np.arange(1, lado + 1)) & 1
+    acumulado = np.cumsum(bits, axis=1)
+    k = (rng.random(len(opciones)) * acumulado[:, -1]).astype(np.int64)
+    elegido = np.argmax(acumulado > k[:, None], axis=1) + 1
+    return np.where(acumulado[:, -1] > 0, elegido, 0)
+
+
+def poblacion_aleatoria(rng, tablero, candidatos, n):
+    """
+    'n' genomas (n, lado, lado) sacados de 'rng' (Generator de numpy). Cada
+    fila es una permutación de sus faltantes que, si se puede, respeta los
+    candidatos de cada celda: las vacías se llenan de la más restringida a
+    la menos con un dígito libre y candidato al azar, en todas las filas de
+    todos los individuos a la vez. Las filas que se quedan sin opción se
+    rehacen hasta REINTENTOS_FILA veces y luego se barajan sin candidatos.
+    """
+    lado = len(tablero)
+    orden, largos, faltan = _tablas_fila(tablero, candidatos)
+    candidatos = np.asarray(candidatos, dtype=np.int64)
+    genomas = np.broadcast_to(np.asarray(tablero, dtype=np.uint8), (n, lado, lado)).copy()
+    pendientes = np.broadcast_to(largos > 0, (n, lado)).copy()
+
+    for _ in range(REINTENTOS_FILA):
+        ind, filas = np.nonzero(pendientes)
+        if len(ind) == 0:
+            break
+        libres = faltan[filas]
+        valores = np.zeros((len(ind), lado), dtype=np.uint8)
+        fallo = np.zeros(len(ind), dtype=bool)
+        for j in range(lado):
+            activa = j < largos[filas]
+            opciones = np.where(activa, libres & candidatos[filas, orden[filas, j]], 0)
+            d = _elegir_bit(rng, opciones, lado)
+            fallo |= activa & (d == 0)
+            valores[:, j] = d
+            libres = libres & ~np.where(d > 0, np.left_shift(1, d), 0)
+        listas = ~fallo
+        for j in range(lado):
+            m = listas & (j < largos[filas])
+            genomas[ind[m], filas[m], orden[filas[m], j]] = valores[m, j]
+        pendientes[ind[listas], filas[listas]] = False
+
+    # Sin permutación compatible a la vista: barajado simple de los faltantes
+    ind, filas = np.nonzero(pendientes)
+    if len(ind):
+        numeros = np.arange(1, lado + 1)
+        faltantes = np.where((faltan[filas, None] >> numeros) & 1, numeros, lado + 1)
+        claves = np.where(faltantes <= lado, rng.random(faltantes.shape), 2.0)
+        barajados = np.take_along_axis(faltantes, np.argsort(claves, axis=1), axis=1)
+        for j in range(lado):
+            m = j < largos[filas]
+            genomas[ind[m], filas[m], orden[filas[m], j]] = barajados[m, j]
+    return genomas
@@ -0,0 +1,218 @@
+import asyncio
+import contextlib
+import queue
+import sys
+import threading
+
+from diversidad import fraccion_unicos
+from instrumentacion import MedidorNulo, reloj
+from resolucion import resolver
+
+# -------------------------------------------------------------------
+# API DE BIBLIOTECA: PROGRESO POR GENERACIÓN, ASYNCIO Y CANCELACIÓN
+# -------------------------------------------------------------------
+# resolucion.resolver bloquea hasta terminar. Aquí la búsqueda corre en un
+# hilo trabajador y cada generación se publica como un dict:
+#   {"tipo": "generacion", "solucionador", "intento", "generacion", "mejor",
+#    "objetivos" (F, C, B; solo NSGAIII), "diversidad", "tiempo"}
+# y al final {"tipo": "resultado", ...lo que devuelve resolver...}.
+#
+#   iterar(...)          generador síncrono de esos eventos
+#   iterar_async(...)    lo mismo con 'async for', sin bloquear el loop
+#   resolver_async(...)  espera el resultado, con 'timeout' opcional
+#
+# Parar es cooperativo: se activa el Event 'detener' que los solucionadores
+# revisan al comienzo de cada generación, así que cerrar el generador,
+# cancelar la tarea o agotar el timeout corta la búsqueda en menos de una
+# generación sin matar procesos. Como los solucionadores guardan el
+# tablero en variables de módulo y comparten 'random', en cada proceso
+# corre una búsqueda a la vez: las demás esperan su turno en su hilo.
+
+PENDIENTES_MAXIMOS = 256   # Eventos sin consumir antes de que el trabajador espere (iterar)
+
+_CANDADO = threading.Lock()          # Una búsqueda a la vez por proceso
+_CANDADO_SALIDA = threading.Lock()
+
+# -------------------------------------------------------------------
+# 1. SALIDA SILENCIOSA POR HILO
+# -------------------------------------------------------------------
+# contextlib.redirect_stdout cambia sys.stdout para todo el proceso; un
+# servicio no puede perder así sus propios print mientras busca.
+class _SalidaPorHilo:
+    """sys.stdout que descarta lo que escriben los hilos silenciados."""
+
+    def __init__(self, original):
+        self.original = original
+        self.silenciados = set()
+
+    def write(self, texto):
+        if threading.get_ident() in self.silenciados:
+            return len(texto)
+        return self.original.write(texto)
+
+    def __getattr__(self, nombre):
+        return getattr(self.original, nombre)
+
+
+@contextlib.contextmanager
+def _silenciar_hilo():
+    with _CANDADO_SALIDA:
+        if not isinstance(sys.stdout, _SalidaPorHilo):
+            sys.stdout = _SalidaPorHilo(sys.stdout)
+        salida = sys.stdout
+        salida.silenciados.add(threading.get_ident())
+    try:
+        yield
+    finally:
+        with _CANDADO_SALIDA:
+            salida.silenciados.discard(threading.get_ident())
+            if not salida.silenciados and sys.stdout is salida:
+                sys.stdout = salida.original
+
+# -------------------------------------------------------------------
+# 2. MEDIDOR QUE PUBLICA EL PROGRESO
+# -------------------------------------------------------------------
+class MedidorProgreso(MedidorNulo):
+    """
+    No toma tiempos por fase (como NULO): convierte cada fin de generación
+    en un evento y se lo pasa a 'publicar'. Con diversidad=False no se
+    calcula la fracción de genomas distintos.
+    """
+
+    def __init__(self, publicar, solucionador, diversidad=True):
+        self.publicar = publicar
+        self.solucionador = solucionador
+        self.diversidad = diversidad
+        self.inicio = reloj()
+
+    def fin_generacion(self, poblacion=None, **contexto):
+        objetivos = contexto.get("objetivos")
+        self.publicar({
+            "tipo": "generacion",
+            "solucionador": self.solucionador,
+            "intento": contexto.get("intento"),
+            "generacion": contexto.get("generacion"),
+            "mejor": contexto.get("mejor"),
+            "objetivos": list(objetivos) if objetivos is not None else None,
+            "diversidad": (fraccion_unicos(poblacion)
+                           if self.diversidad and poblacion is not None else None),
+            "tiempo": reloj() - self.inicio,
+        })
+
+
+def _trabajar(publicar, nombre_modulo, tablero, opciones, detener, silencioso, diversidad):
+    """Cuerpo del hilo trabajador: corre resolver y publica el resultado (o el error)."""
+    try:
+        with _CANDADO, _silenciar_hilo() if silencioso else contextlib.nullcontext():
+            medidor = MedidorProgreso(publicar, nombre_modulo, diversidad)
+            resultado = resolver(nombre_modulo, tablero, detener=detener, medidor=medidor, **opciones)
+        publicar({"tipo": "resultado", **resultado})
+    except BaseException as error:
+        publicar({"tipo": "error", "error": error})
+
+# -------------------------------------------------------------------
+# 3. GENERADOR SÍNCRONO
+# -------------------------------------------------------------------
+def iterar(nombre_modulo, tablero=None, semilla=None, max_intentos=None, detener=None,
+           punto_control=None, reanudar=False, silencioso=True, diversidad=True):
+    """
+    Genera un evento por generación y termina con el resultado (ver arriba).
+    Cerrar el generador (break, close(), salir del 'with') o activar
+    'detener' para la búsqueda; en el segundo caso el resultado llega igual,
+    con cancelado=True. Los errores del solucionador se relanzan aquí.
+    """
+    detener = detener or threading.Event()
+    abandonado = threading.Event()
+    cola = queue.Queue(PENDIENTES_MAXIMOS)
+
+    def publicar(evento):
+        # Espera lugar en la cola salvo que ya nadie vaya a leerla
+        while not abandonado.is_set():
+            try:
+                cola.put(evento, timeout=0.1)
+                return
+            except queue.Full:
+                pass
+
+    opciones = {"semilla": semilla, "max_intentos": max_intentos,
+                "punto_control": punto_control, "reanudar": reanudar}
+    hilo = threading.Thread(target=_trabajar, name=f"progreso-{nombre_modulo}", daemon=True,
+                            args=(publicar, nombre_modulo, tablero, opciones, detener,
+                                  silencioso, diversidad))
+    hilo.start()
+    try:
+        while True:
+            evento = cola.get()
+            if evento["tipo"] == "error":
+                raise evento["error"]
+            yield evento
+            if evento["tipo"] == "resultado":
+                return
+    finally:
+        abandonado.set()
+        detener.set()
+        hilo.join()
+
+# -------------------------------------------------------------------
+# 4. ASYNCIO
+# -------------------------------------------------------------------
+async def iterar_async(nombre_modulo, tablero=None, semilla=None, max_intentos=None,
+                       punto_control=None, reanudar=False, silencioso=True, diversidad=True):
+    """
+    Versión 'async for' de iterar: los eventos llegan al loop con
+    call_soon_threadsafe y nunca se bloquea esperando al solucionador.
+    Cancelar la tarea o cerrar el generador detiene la búsqueda y espera
+    (sin bloquear) a que el hilo trabajador termine.
+    """
+    loop = asyncio.get_running_loop()
+    detener = threading.Event()
+    cola = asyncio.Queue()
+
+    def publicar(evento):
+        try:
+            loop.call_soon_threadsafe(cola.put_nowait, evento)
+        except RuntimeError:
+            pass   # El loop ya se cerró: nadie va a leer el evento
+
+    opciones = {"semilla": semilla, "max_intentos": max_intentos,
+                "punto_control": punto_control, "reanudar": reanudar}
+    hilo = threading.Thread(target=_trabajar, name=f"progreso-{nombre_modulo}", daemon=True,
+                            args=(publicar, nombre_modulo, tablero, opciones, detener,
+                                  silencioso, diversidad))
+    hilo.start()
+    try:
+        while True:
+            evento = await cola.get()
+            if evento["tipo"] == "error":
+                raise evento["error"]
+            yield evento
+            if evento["tipo"] == "resultado":
+                return
+    finally:
+        detener.set()
+        if hilo.is_alive():
+            await asyncio.shield(loop.run_in_executor(None, hilo.join))
+
+
+async def resolver_async(nombre_modulo, tablero=None, semilla=None, max_intentos=None,
+                         timeout=None, al_progreso=None, punto_control=None, reanudar=False,
+                         silencioso=True):
+    """
+    Como resolucion.resolver, pero para llamarlo con 'await' desde un loop.
+    'al_progreso(evento)' recibe cada generación. Pasados 'timeout' segundos
+    la búsqueda se detiene y se lanza TimeoutError; cancelar la tarea
+    también la detiene. Devuelve el mismo dict que resolver.
+    """
+    async def _esperar():
+        eventos = iterar_async(nombre_modulo, tablero, semilla=semilla, max_intentos=max_intentos,
+                               punto_control=punto_control, reanudar=reanudar,
+                               silencioso=silencioso, diversidad=al_progreso is not None)
+        async with contextlib.aclosing(eventos):
+            async for evento in eventos:
+                if evento["tipo"] == "resultado":
+                    del evento["tipo"]
+                    return evento
+                if al_progreso is not None:
+                    al_progreso(evento)
+
+    return await asyncio.wait_for(_esperar(), timeout)
@@ -0,0 +1,157 @@
+import contextlib
+import json
+import os
+import random
+
+import numpy as np
+
+# -------------------------------------------------------------------
+# PUNTOS DE CONTROL (CHECKPOINTS) DE UN INTENTO
+# -------------------------------------------------------------------
+# Cada CADA_GENERACIONES se guarda, al principio de la generación, todo lo
+# que hace falta para seguir exactamente igual: genomas, aptitudes, estado
+# de 'random', intento, generación, evaluaciones y lo propio de cada
+# solucionador (p. ej. generaciones_sin_mejora en NSGAIII y el estado de
+# sus Generators de numpy, que ninguno toma del numpy.random global).
+#
+# Los genomas van en un .npy mapeado en memoria (lado² bytes por individuo):
+# el archivo se crea una vez y luego solo se sobrescribe. Hay dos (0 y 1)
+# y se alternan; 'estado.json' se reemplaza de forma atómica al final y
+# dice cuál es el bueno, así que morir a mitad de un guardado deja intacto
+# el punto de control anterior.
+
+CADA_GENERACIONES = 25
+ARCHIVO_ESTADO = "estado.json"
+
+
+def estado_azar():
+    """Estado de 'random' en JSON."""
+    version, interno, gauss = random.getstate()
+    return {"random": [version, list(interno), gauss]}
+
+
+def restaurar_azar(estado):
+    version, interno, gauss = estado["random"]
+    random.setstate((version, tuple(interno), gauss))
+
+
+class PuntoControl:
+    """
+    Guarda y recupera el estado de un intento en 'directorio'.
+    'contexto' lo llena quien corre los intentos (resolucion.resolver) y se
+    guarda tal cual: solucionador, tablero y generaciones de intentos previos.
+    """
+
+    def __init__(self, directorio, cada=CADA_GENERACIONES):
+        self.directorio = directorio
+        self.cada = cada
+        self.contexto = {}
+        self._mapas = {}
+        self._ultimo = None       # Índice (0/1) del último guardado
+        self._pendiente = None    # Estado leído que espera ser reanudado
+        self._creado = False      # El directorio lo creó esta clase (limpiar puede quitarlo)
+
+    def _ruta(self, nombre):
+        return os.path.join(self.directorio, nombre)
+
+    def toca(self, generacion):
+        return self.cada > 0 and generacion > 0 and generacion % self.cada == 0
+
+    # ---------------------------------------------------------------
+    # GUARDAR
+    # ---------------------------------------------------------------
+    def _mapa(self, indice, forma):
+        mapa = self._mapas.get(indice)
+        if mapa is None or mapa.shape != forma:
+            mapa = np.lib.format.open_memmap(self._ruta(f"genomas_{indice}.npy"), mode="w+",
+                                             dtype=np.uint8, shape=forma)
+            self._mapas[indice] = mapa
+        return mapa
+
+    def guardar(self, intento, generacion, genomas, aptitudes, evaluaciones=0, extra=None):
+        """
+        Snapshot del comienzo de 'generacion'. 'genomas' es (N, lado, lado) (o algo
+        convertible) y 'aptitudes' (N, objetivos); 'extra' debe ser JSON.
+        """
+        if not os.path.isdir(self.directorio):
+            os.makedirs(self.directorio)
+            self._creado = True
+        genomas = np.asarray(genomas, dtype=np.uint8)
+        indice = 1 if self._ultimo == 0 else 0
+
+        mapa = self._mapa(indice, genomas.shape)
+        mapa[...] = genomas
+        mapa.flush()
+        np.save(self._ruta(f"aptitudes_{indice}.npy"), np.asarray(aptitudes, dtype=np.float64))
+
+        estado = {"buffer": indice, "intento": intento, "generacion": generacion,
+                  "evaluaciones": evaluaciones, "extra": extra or {},
+                  "contexto": self.contexto, "azar": estado_azar()}
+        temporal = self._ruta(ARCHIVO_ESTADO + ".tmp")
+        with open(temporal, "w", encoding="utf-8") as archivo:
+            json.dump(estado, archivo)
+            archivo.flush()
+            os.fsync(archivo.fileno())
+        os.replace(temporal, self._ruta(ARCHIVO_ESTADO))
+        self._ultimo = indice
+
+    # ---------------------------------------------------------------
+    # REANUDAR
+    # ---------------------------------------------------------------
+    def leer(self):
+        """El último estado guardado (sin los genomas) o None."""
+        try:
+            with open(self._ruta(ARCHIVO_ESTADO), encoding="utf-8") as archivo:
+                return json.load(archivo)
+        except FileNotFoundError:
+            return None
+
+    def preparar_reanudacion(self, contexto=None):
+        """
+        Deja pendiente el último estado si su contexto coincide con
+        'contexto' (solo las claves dadas). Devuelve el estado o None.
+        """
+        estado = self.leer()
+        if estado is None:
+            return None
+        if contexto and any(estado["contexto"].get(c) != v for c, v in contexto.items()):
+            return None
+        self._pendiente = estado
+        self._ultimo = estado["buffer"]
+        return estado
+
+    def reanudar(self, intento):
+        """
+        Si hay un estado pendiente para 'intento', restaura el azar y devuelve
+        {"generacion", "genomas", "aptitudes", "evaluaciones", "extra"}; si no, None.
+        Los solucionadores lo llaman después de crear sus propios generadores.
+        """
+        estado = self._pendiente
+        if estado is None or estado["intento"] != intento:
+            return None
+        self._pendiente = None
+
+        indice = estado["buffer"]
+        genomas = np.array(np.load(self._ruta(f"genomas_{indice}.npy"), mmap_mode="r"))
+        aptitudes = np.load(self._ruta(f"aptitudes_{indice}.npy"))
+        restaurar_azar(estado["azar"])
+        return {"generacion": estado["generacion"], "genomas": genomas, "aptitudes": aptitudes,
+                "evaluaciones": estado["evaluaciones"], "extra": estado["extra"]}
+
+    def limpiar(self):
+        """
+        Borra los archivos propios (la corrida terminó y no hay nada que
+        reanudar). El directorio solo se quita si lo creó esta clase y quedó
+        vacío: lo demás que haya ahí no se toca.
+        """
+        self._mapas.clear()
+        self._ultimo = None
+        self._pendiente = None
+        propios = [f"{nombre}_{i}.npy" for nombre in ("genomas", "aptitudes") for i in (0, 1)]
+        for nombre in propios + [ARCHIVO_ESTADO, ARCHIVO_ESTADO + ".tmp"]:
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(self._ruta(nombre))
+        if self._creado:
+            with contextlib.suppress(OSError):
+                os.rmdir(self.directorio)
+            self._creado = False
@@ -0,0 +1,193 @@
+import argparse
+import contextlib
+import importlib
+import io
+import json
+import math
+import random
+import sys
+import time
+
+# -------------------------------------------------------------------
+# RESOLVER UN TABLERO CUALQUIERA CON CUALQUIERA DE LOS SOLUCIONADORES
+# -------------------------------------------------------------------
+# Cada solucionador (desde_cero, con_deap, NSGAIII, por_filas) expone:
+#   cargar_tablero(tablero),
+#   ejecutar_intento(intento, semilla, detener, medidor, punto_control)
+#   y el contador EVALUACIONES.
+# Aquí se repite el bucle de reinicios de sus main() pero sin imprimir
+# nada fuera del propio intento y devolviendo las métricas del run.
+#
+# También es la línea de comandos única para correr cualquiera de los tres
+# (python resolucion.py <solucionador> ...). Este módulo solo importa la
+# biblioteca estándar: numpy, DEAP y el toolbox se cargan recién cuando se
+# elige un solucionador, así que un proceso corto por pedido no paga lo que
+# no usa. tiempos_arranque() mide, en intérpretes nuevos, cuánto tarda cada
+# solucionador en importarse y en quedar listo.
+
+SOLUCIONADORES = ("desde_cero", "con_deap", "NSGAIII", "por_filas")
+SIMBOLOS = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ"   # Un carácter por valor (hasta 35)
+
+
+def _es_lado(lado):
+    """Lado válido de un tablero: n² con n >= 2 (4, 9, 16, 25...)."""
+    return lado >= 4 and math.isqrt(lado) ** 2 == lado
+
+
+def parsear_tablero(texto):
+    """
+    Convierte un tablero n² x n² en una lista de listas. Acepta un carácter
+    por celda (dígitos y letras: A=10, B=11...; '0' o '.' para las vacías,
+    ignorando espacios y separadores como '|' o '-') o un número entero por
+    celda separado por espacios o comas.
+    """
+    fichas = texto.replace(",", " ").split()
+    if _es_lado(math.isqrt(len(fichas))) and math.isqrt(len(fichas)) ** 2 == len(fichas) \
+            and all(f.isdigit() for f in fichas):
+        celdas = [int(f) for f in fichas]
+    else:
+        celdas = [0 if ch in "0." else int(ch, 36) for ch in texto if ch.isalnum() or ch == "."]
+    lado = math.isqrt(len(celdas))
+    if lado * lado != len(celdas) or not _es_lado(lado):
+        raise ValueError(f"Se esperaban 81, 256, 625... celdas y hay {len(celdas)}")
+    if any(v > lado for v in celdas):
+        raise ValueError(f"Hay valores mayores que {lado} en un tablero {lado}x{lado}")
+    return [celdas[r * lado:(r + 1) * lado] for r in range(lado)]
+
+
+def tablero_a_texto(tablero):
+    """Inversa de parsear_tablero: un carácter por celda, '0' para las vacías."""
+    return "".join(SIMBOLOS[v] for fila in tablero for v in fila)
+
+
+def resolver(nombre_modulo, tablero=None, semilla=None, max_intentos=None, detener=None,
+             medidor=None, punto_control=None, reanudar=False):
+    """
+    Resuelve 'tablero' (o el que tenga cargado el módulo) reiniciando hasta
+    'max_intentos' veces. Devuelve un dict con la solución (o None), los
+    intentos, las generaciones totales, las evaluaciones y el tiempo;
+    'cancelado' indica que se paró con 'detener'.
+    'medidor' (ver instrumentacion.py) recibe los tiempos de cada fase.
+    Con 'punto_control' (ver puntos_control.py) se guarda el estado cada
+    pocas generaciones; con reanudar=True se sigue desde el último guardado
+    si era de este mismo solucionador y tablero.
+    """
+    if nombre_modulo not in SOLUCIONADORES:
+        raise ValueError(f"Solucionador desconocido: {nombre_modulo!r}")
+    modulo = importlib.import_module(nombre_modulo)
+
+    if tablero is not None:
+        modulo.cargar_tablero(tablero)
+    if semilla is not None:
+        random.seed(semilla)
+    modulo.EVALUACIONES = 0
+
+    inicio = time.time()
+    generaciones = 0
+    intento = 0
+    resultado = None
+    if punto_control is not None:
+        identidad = {"solucionador": nombre_modulo,
+                     "tablero": tablero_a_texto(tablero) if tablero is not None else None}
+        estado = punto_control.preparar_reanudacion(identidad) if reanudar else None
+        if estado is not None:
+            # Los intentos terminados no se repiten; el pendiente sigue donde quedó
+            intento = estado["intento"] - 1
+            generaciones = estado["contexto"]["generaciones_previas"]
+        punto_control.contexto = dict(identidad)
+
+    while max_intentos is None or intento < max_intentos:
+        intento += 1
+        if punto_control is not None:
+            punto_control.contexto["generaciones_previas"] = generaciones
+        resultado = modulo.ejecutar_intento(intento, detener=detener, medidor=medidor,
+                                            punto_control=punto_control)
+        generaciones += resultado["generacion"]
+        if resultado["resuelto"] or resultado["cancelado"]:
+            break
+
+    # Corrida terminada: ya no hay nada que reanudar
+    if punto_control is not None and not (resultado and resultado["cancelado"]):
+        punto_control.limpiar()
+
+    return {
+        "solucionador": nombre_modulo,
+        "resuelto": bool(resultado and resultado["resuelto"]),
+        "cancelado": bool(resultado and resultado["cancelado"]),
+        "solucion": resultado["solucion"] if resultado else None,
+        "intentos": intento,
+        "generaciones": generaciones,
+        "evaluaciones": modulo.EVALUACIONES,
+        "tiempo": time.time() - inicio,
+    }
+
+
+# -------------------------------------------------------------------
+# TIEMPO DE ARRANQUE
+# -------------------------------------------------------------------
+_MEDIR_ARRANQUE = """
+import importlib, json, sys, time
+inicio = time.perf_counter()
+modulo = importlib.import_module(sys.argv[1])
+importado = time.perf_counter()
+getattr(modulo, "preparar_deap", lambda: None)()
+listo = time.perf_counter()
+print(json.dumps({"importar_ms": (importado - inicio) * 1e3, "preparar_ms": (listo - importado) * 1e3}))
+"""
+
+
+def tiempos_arranque(nombres=SOLUCIONADORES, repeticiones=5):
+    """
+    Mediana, en ms y sobre 'repeticiones' intérpretes nuevos, de importar
+    cada solucionador, de armar su toolbox (preparar_deap, si tiene) y del
+    proceso completo (arranque de Python incluido).
+    """
+    import subprocess   # Solo aquí: no se paga en cada arranque de la CLI
+
+    tiempos = {}
+    for nombre in nombres:
+        filas = []
+        for _ in range(repeticiones):
+            inicio = time.perf_counter()
+            salida = subprocess.run([sys.executable, "-c", _MEDIR_ARRANQUE, nombre], check=True,
+                                    capture_output=True, text=True).stdout
+            fila = json.loads(salida)
+            fila["proceso_ms"] = (time.perf_counter() - inicio) * 1e3
+            filas.append(fila)
+        tiempos[nombre] = {clave: round(sorted(f[clave] for f in filas)[len(filas) // 2], 1)
+                           for clave in filas[0]}
+    return tiempos
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Resuelve un tablero con el solucionador elegido")
+    parser.add_argument("solucionador", nargs="?", choices=SOLUCIONADORES)
+    parser.add_argument("-t", "--tablero", default=None, help="Tablero n²×n²: un carácter por celda ('0' o '.' = vacía, A = 10, B = 11...) o enteros separados; por defecto el del módulo")
+    parser.add_argument("--intentos", type=int, default=None, help="Máximo de intentos (por defecto, hasta resolver)")
+    parser.add_argument("--semilla", type=int, default=None)
+    parser.add_argument("--json", action="store_true", help="Sin el progreso de cada intento; el resultado como JSON")
+    parser.add_argument("--arranque", action="store_true", help="Mide el tiempo de importar y preparar cada solucionador")
+    args = parser.parse_args()
+
+    if args.arranque:
+        for nombre, tiempos in tiempos_arranque([args.solucionador] if args.solucionador else SOLUCIONADORES).items():
+            print(f"{nombre:12s} importar {tiempos['importar_ms']:7.1f} ms  preparar {tiempos['preparar_ms']:6.1f} ms"
+                  f"  proceso {tiempos['proceso_ms']:7.1f} ms")
+        return
+    if args.solucionador is None:
+        parser.error("falta el solucionador")
+
+    tablero = parsear_tablero(args.tablero) if args.tablero else None
+    with contextlib.redirect_stdout(io.StringIO()) if args.json else contextlib.nullcontext():
+        resultado = resolver(args.solucionador, tablero, semilla=args.semilla, max_intentos=args.intentos)
+    if resultado["solucion"] is not None:
+        resultado["solucion"] = tablero_a_texto(resultado["solucion"])
+    if args.json:
+        print(json.dumps(resultado, ensure_ascii=False))
+    else:
+        estado = "resuelto" if resultado["resuelto"] else "sin resolver"
+        print(f"\n{args.solucionador}: {estado} en {resultado['intentos']} intentos, "
+              f"{resultado['generaciones']} generaciones, {resultado['tiempo']:.2f}s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+import numpy as np
+from azar import generador_desde_random
+
+# -------------------------------------------------------------------
+# SELECCIÓN SIN ORDENAR LA POBLACIÓN
+# -------------------------------------------------------------------
+# El elitismo solo necesita el 10% mejor y un torneo solo necesita
+# índices al azar y un mínimo. En vez de ordenar 600 individuos por
+# generación con una lambda, las aptitudes van en un arreglo:
+#   - la élite sale de np.argpartition (O(N)) y solo se ordenan esos k;
+#   - todos los torneos de la generación son un único sorteo (num, tamaño)
+#     de índices y un argmin por fila.
+# Todas las aptitudes se minimizan (0 = tablero resuelto).
+
+
+def indices_elite(aptitudes, k):
+    """Índices de las k menores aptitudes, de la mejor a la peor."""
+    aptitudes = np.asarray(aptitudes)
+    k = min(k, len(aptitudes))
+    if k <= 0:
+        return np.empty(0, dtype=np.intp)
+    if k < len(aptitudes):
+        indices = np.argpartition(aptitudes, k - 1)[:k]
+    else:
+        indices = np.arange(len(aptitudes))
+    return indices[np.argsort(aptitudes[indices], kind="stable")]
+
+
+def torneos(aptitudes, num, tamano, rng=None):
+    """
+    Ganadores de 'num' torneos de 'tamano' participantes (con reemplazo,
+    como tools.selTournament), sorteados todos a la vez.
+    """
+    rng = rng if rng is not None else generador_desde_random()
+    aptitudes = np.asarray(aptitudes)
+    participantes = rng.integers(0, len(aptitudes), size=(num, tamano))
+    ganador = np.argmin(aptitudes[participantes], axis=1)
+    return participantes[np.arange(num), ganador]
+
+# -------------------------------------------------------------------
+# ADAPTADORES CON LA FIRMA DE deap.tools (individuals, k, ...)
+# -------------------------------------------------------------------
+def aptitudes_deap(individuos):
+    """Primer objetivo de cada individuo como arreglo a minimizar (vale para weights=(±1,))."""
+    return np.fromiter((-ind.fitness.wvalues[0] for ind in individuos),
+                       dtype=np.float64, count=len(individuos))
+
+
+def sel_elite(individuals, k):
+    """Equivale a tools.selBest(individuals, k) pero con selección parcial."""
+    return [individuals[i] for i in indices_elite(aptitudes_deap(individuals), k)]
+
+
+def sel_torneo_vectorizado(individuals, k, tournsize, rng=None):
+    """Reemplazo directo de tools.selTournament."""
+    ganadores = torneos(aptitudes_deap(individuals), k, tournsize, rng)
+    return [individuals[i] for i in ganadores.tolist()]
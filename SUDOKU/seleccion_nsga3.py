@@ -0,0 +1,166 @@
+import numpy as np
+from azar import generador_desde_random
+from deap.tools.emo import associate_to_niche, find_extreme_points, find_intercepts
+
+# -------------------------------------------------------------------
+# SELECCIÓN NSGA-III PARA OBJETIVOS ENTEROS PEQUEÑOS
+# -------------------------------------------------------------------
+# Los objetivos del Sudoku (faltas en filas, columnas y cajas) son enteros
+# acotados, así que entre 1200 individuos (o 40000) hay pocos vectores de
+# aptitud distintos. En vez del ordenamiento no dominado genérico sobre
+# individuos, se agrupa por vector único (np.unique) y los frentes se pelan
+# contando dominadores entre esos pocos puntos. Los objetivos constantes
+# (las filas siempre dan 0) no cambian la dominancia y se ignoran al ordenar.
+#
+# El resto es el selNSGA3 de DEAP con sus mismas funciones internas y los
+# individuos en el mismo orden (frente, vector de aptitud, posición). Los
+# sorteos del nicheo salen de un Generator propio ('rng', un subflujo del
+# intento) y no del estado global de numpy.random, así que la selección
+# queda fijada por la semilla también en trabajadores en paralelo. La
+# normalización y la asociación a nichos se calculan una vez por vector
+# único y se reparten a sus individuos; el nicheo guarda los miembros
+# disponibles de cada nicho en vez de recorrer todo el último frente en
+# cada ronda.
+
+
+def rangos_de_frente(puntos):
+    """
+    Índice de frente de Pareto (0 = no dominado) de cada fila de 'puntos',
+    que deben ser distintas entre sí. Se minimiza en todas las columnas.
+    """
+    variables = puntos.max(axis=0) != puntos.min(axis=0)
+    puntos = puntos[:, variables]
+    rangos = np.zeros(len(puntos), dtype=np.int64)
+    if puntos.shape[1] == 0:
+        return rangos
+
+    # domina[i, j]: i domina a j (filas distintas => basta con <= en todo)
+    domina = (puntos[:, None, :] <= puntos[None, :, :]).all(axis=2)
+    np.fill_diagonal(domina, False)
+    dominadores = domina.sum(axis=0)
+
+    pendientes = np.ones(len(puntos), dtype=bool)
+    frente = 0
+    while pendientes.any():
+        actual = pendientes & (dominadores == 0)
+        rangos[actual] = frente
+        pendientes &= ~actual
+        dominadores -= domina[actual].sum(axis=0)
+        frente += 1
+    return rangos
+
+
+def nichear(individuos, k, nichos, distancias, conteo_nichos, rng):
+    """
+    Igual que deap.tools.emo.niching (con el Generator 'rng'), y cada
+    ronda cuesta lo que miden los nichos elegidos y no lo que mide el
+    frente completo. En un nicho vacío gana el más cercano a la referencia
+    y, entre distancias iguales, el de índice más bajo (sin sorteo).
+    """
+    # Índices (ascendentes) de los individuos disponibles de cada nicho
+    orden = np.argsort(nichos, kind="stable")
+    cortes = np.searchsorted(nichos[orden], np.arange(len(conteo_nichos) + 1))
+    miembros = [orden[cortes[j]:cortes[j + 1]] for j in range(len(conteo_nichos))]
+    disponibles = np.diff(cortes)
+
+    elegidos = []
+    while len(elegidos) < k:
+        n = k - len(elegidos)
+
+        # Nichos con individuos disponibles y, entre ellos, los menos poblados
+        con_miembros = disponibles > 0
+        minimo = np.min(conteo_nichos[con_miembros])
+        nichos_elegidos = np.flatnonzero(con_miembros & (conteo_nichos == minimo))
+        rng.shuffle(nichos_elegidos)
+        nichos_elegidos = nichos_elegidos[:n]
+
+        for nicho in nichos_elegidos:
+            # Nicho vacío: el más cercano a la referencia (argmin sobre los
+            # índices ascendentes: el primero en caso de empate); si no, uno al azar
+            if conteo_nichos[nicho] == 0:
+                indice = miembros[nicho][np.argmin(distancias[miembros[nicho]])]
+            else:
+                candidatos = miembros[nicho].copy()
+                rng.shuffle(candidatos)
+                indice = candidatos[0]
+
+            miembros[nicho] = miembros[nicho][miembros[nicho] != indice]
+            disponibles[nicho] -= 1
+            conteo_nichos[nicho] += 1
+            elegidos.append(individuos[indice])
+
+    return elegidos
+
+
+def agrupar_vectores(aptitudes):
+    """
+    np.unique(aptitudes, axis=0, return_inverse=True), pero si los valores
+    son enteros cada fila se codifica como un solo int64 (base mixta, que
+    respeta el orden lexicográfico) y se agrupa en 1D, bastante más rápido.
+    """
+    minimos = aptitudes.min(axis=0)
+    bases = aptitudes.max(axis=0) - minimos + 1
+    if not np.array_equal(aptitudes, np.round(aptitudes)) or np.prod(bases) >= 2 ** 62:
+        unicos, inversa = np.unique(aptitudes, axis=0, return_inverse=True)
+        return unicos, inversa.reshape(-1)
+
+    claves = np.zeros(len(aptitudes), dtype=np.int64)
+    for columna, base in zip((aptitudes - minimos).astype(np.int64).T, bases.astype(np.int64)):
+        claves = claves * base + columna
+    claves_unicas, primera, inversa = np.unique(claves, return_index=True, return_inverse=True)
+    return aptitudes[primera], inversa.reshape(-1)
+
+
+def sel_nsga3_enteros(individuals, k, ref_points, rng=None):
+    """
+    Reemplazo directo de tools.selNSGA3(individuals, k, ref_points). 'rng'
+    es el Generator del nicheo (si falta, uno sembrado desde 'random').
+    """
+    if k == 0:
+        return []
+    rng = rng if rng is not None else generador_desde_random()
+
+    # Como DEAP: todo se trata como minimización
+    aptitudes = np.array([ind.fitness.wvalues for ind in individuals])
+    aptitudes *= -1
+
+    # Vectores únicos en orden lexicográfico (el mismo que usa sortLogNondominated)
+    unicos, inversa = agrupar_vectores(aptitudes)
+    rangos = rangos_de_frente(unicos)
+
+    # Frentes necesarios para juntar k individuos
+    tam_frentes = np.bincount(rangos[inversa])
+    acumulado = np.cumsum(tam_frentes)
+    ultimo = min(int(np.searchsorted(acumulado, k)), len(acumulado) - 1)
+    previos = int(acumulado[ultimo - 1]) if ultimo > 0 else 0
+
+    # Individuos por (frente, vector, posición original)
+    rango_ind = rangos[inversa]
+    orden = np.lexsort((inversa, rango_ind))
+    orden = orden[rango_ind[orden] <= ultimo]
+
+    # Vectores únicos de esos frentes, en el mismo orden
+    orden_unicos = np.lexsort((np.arange(len(unicos)), rangos))
+    orden_unicos = orden_unicos[rangos[orden_unicos] <= ultimo]
+    puntos = unicos[orden_unicos]
+
+    best_point = puntos.min(axis=0)
+    worst_point = puntos.max(axis=0)
+    extreme_points = find_extreme_points(puntos, best_point)
+    intercepts = find_intercepts(extreme_points, best_point, worst_point, worst_point)
+    nichos_unicos, distancias_unicas = associate_to_niche(puntos, ref_points, best_point, intercepts)
+
+    posicion = np.empty(len(unicos), dtype=np.intp)
+    posicion[orden_unicos] = np.arange(len(orden_unicos))
+    de_cada = posicion[inversa[orden]]
+    nichos = nichos_unicos[de_cada]
+    distancias = distancias_unicas[de_cada]
+
+    # Conteo por nicho de todos los frentes salvo el último
+    conteo_nichos = np.bincount(nichos[:previos], minlength=len(ref_points)).astype(np.int64)
+
+    elegidos = [individuals[i] for i in orden[:previos].tolist()]
+    ultimo_frente = [individuals[i] for i in orden[previos:].tolist()]
+    elegidos.extend(nichear(ultimo_frente, k - previos, nichos[previos:],
+                            distancias[previos:], conteo_nichos, rng))
+    return elegidos